@@ -4,6 +4,7 @@ This is the main entry point for the AI backend system that orchestrates
 the multi-agent sports journalism workflow.
 """
 
+import json
 import uuid
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -14,15 +15,20 @@ from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 from sciber_agents.data_collector import DataCollectorAgent
 from sciber_agents.editor import EditorAgent
 from sciber_agents.researcher import ResearchAgent
 from sciber_agents.writer import WritingAgent
+from scriber_agents.pipeline import AgentPipeline
 from config.agent_config import AgentConfigurations
 from config.settings import get_settings
+from tools.http_transport import close_shared_transport
+from tools.rate_limiter import priority_scope
 from utils.logging import get_logger, setup_logging
+from utils.metrics import REGISTRY
 
 # Initialize logging
 setup_logging()
@@ -81,6 +87,11 @@ class AgentOrchestrator:
 
     async def generate_article(self, request: ArticleRequest) -> ArticleResponse:
         """Generate article using AI agents."""
+        with priority_scope(request.priority):
+            return await self._generate_article(request)
+
+    async def _generate_article(self, request: ArticleRequest) -> ArticleResponse:
+        """Run the agent workflow; API calls inherit the request's priority."""
         try:
             # Validate request
             if not request.game_id:
@@ -168,12 +179,30 @@ class AgentOrchestrator:
 
 # Global orchestrator instance
 orchestrator = None
+# Recap pipeline used for streamed articles; built on the first stream request
+recap_pipeline: AgentPipeline | None = None
+
+
+def get_recap_pipeline() -> AgentPipeline:
+    """Return the recap pipeline, building it on first use.
+
+    A missing API key makes the streaming endpoint answer 503 instead of
+    keeping the whole application from starting.
+    """
+    global recap_pipeline
+    if recap_pipeline is None:
+        try:
+            recap_pipeline = AgentPipeline()
+        except ValueError as e:
+            logger.error("Failed to initialize recap pipeline", error=str(e))
+            raise HTTPException(status_code=503, detail="Recap pipeline not configured") from e
+    return recap_pipeline
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan management."""
-    global orchestrator
+    global orchestrator, recap_pipeline
 
     # Startup
     logger.info(
@@ -195,7 +224,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     logger.info("Shutting down Sport Scribe AI Backend")
+    if recap_pipeline is not None:
+        await recap_pipeline.aclose()
+    await close_shared_transport()
     orchestrator = None
+    recap_pipeline = None
 
 
 # Create FastAPI application
@@ -263,6 +296,41 @@ async def generate_article(
     return await orchestrator.generate_article(request)
 
 
+def format_sse(event: dict[str, Any]) -> str:
+    """Render a pipeline stream event as a server-sent event."""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+@app.post("/generate-article/stream")
+async def stream_article(request: ArticleRequest) -> StreamingResponse:
+    """Stream a game recap as server-sent events.
+
+    Emits ``research`` when the research stages finish, ``token`` for each
+    article text delta and a final ``validation`` event with the verdict.
+    If a stage fails, including the writer mid-stream, the stream ends with an
+    ``error`` event instead.
+    """
+    pipeline = get_recap_pipeline()
+
+    async def events() -> AsyncGenerator[str, None]:
+        async for event in pipeline.stream_game_recap(
+            request.game_id, priority=request.priority
+        ):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """Pipeline metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
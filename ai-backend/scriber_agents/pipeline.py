@@ -5,21 +5,64 @@ This module coordinates the flow between different agents in the SportsScribe pi
 Data Collector → Research → Writer
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
+from contextlib import aclosing
 from datetime import datetime
-from typing import Any, Dict, Optional, List
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, List
 
 from .data_collector import DataCollectorAgent
 from .researcher import ResearchAgent
 from .writer import WriterAgent
 from openai import AsyncOpenAI
+from tools.http_transport import get_shared_transport
+from tools.rate_limiter import priority_scope
+from tools.response_cache import FINISHED_STATUSES, ResponseCache
+from tools.checkpoint_store import CheckpointStore
+from tools.fixture_archive import ArchivedFixture, FixtureArchive
+from tools.match_model import Fixture, LineupPlayer
+from utils.metrics import RECAPS_IN_FLIGHT
+from utils.stage_graph import Stage, StageError, StageGraph
 
 from dotenv import load_dotenv
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# The article is the recap's output, so a finished recap is regenerated on the next call.
+# The fixture index holds parsed records rather than JSON; it is rebuilt from game_data on resume.
+UNCHECKPOINTED_STAGES = frozenset({"article", "fixture_index"})
+
+
+def _fixture_status(game_data: Any) -> Optional[str]:
+    """Short status of the fixture in a fixture response (e.g. "FT", "1H")."""
+    response = game_data.get("response") if isinstance(game_data, dict) else None
+    if not response or not isinstance(response[0], dict):
+        return None
+    return ((response[0].get("fixture") or {}).get("status") or {}).get("short")
+
+
+def _player_entry(fixture: Fixture, player: LineupPlayer, **extra: Any) -> Dict[str, Any]:
+    """A lineup player rendered as a player dict, with their match events."""
+    return {
+        **player.to_dict(),
+        "match_events": [event.to_dict() for event in fixture.player_events(player.id)],
+        **extra,
+    }
+
+
+def _has_error(result: Any) -> bool:
+    """Whether a stage result reports an error, at the top level or in a nested team/player entry."""
+    if isinstance(result, dict):
+        return "error" in result or any(_has_error(value) for value in result.values())
+    if isinstance(result, list):
+        return any(_has_error(item) for item in result)
+    return False
+
 
 class AgentPipeline:
     """Streamlined pipeline orchestrating data flow between agents."""
@@ -32,6 +75,33 @@ class AgentPipeline:
         self.model = os.getenv("OPENAI_MODEL", "gpt-4")
         self.temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
         self.max_tokens = int(os.getenv("OPENAI_MAX_TOKENS", "2000"))
+        # "direct" fetches API-Football without a model round trip; "agent" opts into the LLM tool path
+        self.collector_fetch_mode = os.getenv("DATA_COLLECTOR_MODE", "direct")
+        # "rules" extracts match storylines from the fixture without a model call; "llm" asks the model
+        self.storyline_mode = os.getenv("STORYLINE_MODE", "rules")
+        # In "rules" mode, ask the model when the rules find no facts
+        self.storyline_llm_fallback = os.getenv("STORYLINE_LLM_FALLBACK", "true").lower() == "true"
+        # "separate" runs storylines, history and player performance as their own stages;
+        # "combined" sends the shared context once and gets all three back from one structured call
+        self.research_mode = os.getenv("RESEARCH_MODE", "separate")
+        # Maximum number of concurrent team/player enrichment fetches per recap
+        self.enrichment_concurrency = max(1, int(os.getenv("ENRICHMENT_CONCURRENCY", "4")))
+        # Maximum number of recaps generated at once by generate_game_recaps
+        self.recap_concurrency = max(1, int(os.getenv("RECAP_CONCURRENCY", "3")))
+        # Persistent API-Football response cache (set API_CACHE_ENABLED=false to disable)
+        self.cache_enabled = os.getenv("API_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_path = os.getenv("API_CACHE_PATH", "cache/api_football.sqlite3")
+        # Size of the in-memory tier holding parsed payloads in front of the SQLite cache
+        self.cache_memory_bytes = int(float(os.getenv("API_CACHE_MEMORY_MB", "64")) * 1024 * 1024)
+        # Stage checkpoints let a failed recap resume instead of starting over
+        self.checkpoints_enabled = os.getenv("PIPELINE_CHECKPOINTS_ENABLED", "true").lower() == "true"
+        self.checkpoint_path = os.getenv("PIPELINE_CHECKPOINT_PATH", "cache/checkpoints.sqlite3")
+        self.checkpoint_ttl = float(os.getenv("PIPELINE_CHECKPOINT_TTL_HOURS", "24")) * 3600
+        # Local archive of fixture results for head-to-head and form (set FIXTURE_ARCHIVE_ENABLED=false to disable)
+        self.archive_enabled = os.getenv("FIXTURE_ARCHIVE_ENABLED", "true").lower() == "true"
+        self.archive_path = os.getenv("FIXTURE_ARCHIVE_PATH", "cache/fixtures.sqlite3")
+        # Previous meetings and recent results per team given to the researcher
+        self.archive_history_limit = max(1, int(os.getenv("FIXTURE_ARCHIVE_HISTORY_LIMIT", "5")))
         
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
@@ -44,177 +114,104 @@ class AgentPipeline:
             "rapidapi_key": self.rapidapi_key,
             "model": self.model,
             "temperature": self.temperature,
-            "max_tokens": self.max_tokens
+            "max_tokens": self.max_tokens,
+            "fetch_mode": self.collector_fetch_mode,
+            "storyline_mode": self.storyline_mode,
+            "storyline_llm_fallback": self.storyline_llm_fallback,
+            "research_mode": self.research_mode
         }
         
         self.openai_client = AsyncOpenAI(api_key=self.openai_api_key)
         
+        # Pooled HTTP transport shared by all API-Football fetches for the pipeline's lifetime
+        self.transport = get_shared_transport()
+        
+        self.cache = (
+            ResponseCache(self.cache_path, memory_limit_bytes=self.cache_memory_bytes)
+            if self.cache_enabled else None
+        )
+        
+        self.checkpoints = (
+            CheckpointStore(self.checkpoint_path, ttl=self.checkpoint_ttl)
+            if self.checkpoints_enabled else None
+        )
+        
+        # Every fixture the collector fetches is archived, so history needs no extra API calls
+        self.archive = FixtureArchive(self.archive_path) if self.archive_enabled else None
+        # Checkpoints made under a different model configuration are not restored
+        self.config_fingerprint = hashlib.sha1(
+            json.dumps({key: config[key] for key in ("model", "temperature", "max_tokens", "fetch_mode", "storyline_mode", "research_mode")},
+                       sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        
         # Initialize all agents
-        self.collector = DataCollectorAgent(config)
+        self.collector = DataCollectorAgent(config, transport=self.transport, cache=self.cache, archive=self.archive)
         self.researcher = ResearchAgent(config)
         self.writer = WriterAgent(config)
         
+        # Recap stages run as a dependency graph rather than strictly in sequence
+        self.recap_graph = self._build_recap_graph()
+        # Everything but the writer, for streaming the article separately
+        self.research_graph = self.recap_graph.without("article")
+        
         logger.info("AgentPipeline initialized successfully")
 
-    async def generate_game_recap(self, game_id: str) -> Dict[str, Any]:
+    async def __aenter__(self) -> "AgentPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections and close the pipeline's SQLite stores."""
+        await self.transport.close()
+        for store in (self.cache, self.checkpoints, self.archive):
+            if store is not None:
+                store.close()
+        logger.info("AgentPipeline transport and stores closed")
+
+    async def generate_game_recap(
+        self,
+        game_id: str,
+        priority: Optional[str] = None,
+        *,
+        game_data: Optional[Dict[str, Any]] = None,
+        team_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """Generate a complete game recap article.
         
-        Pipeline: Data Collection → Research → Writer
+        Pipeline: Data Collection → Research → Writer, scheduled as a stage
+        graph (see ``_build_recap_graph``) so independent stages overlap.
+        
+        Args:
+            game_id: API-Football fixture id
+            priority: Request priority for API-Football calls (e.g. "high" for live
+                recaps, "low" for backfill); defaults to the caller's priority scope
+            game_data: Already-fetched fixture response; skips the fixture fetch
+            team_data: Already-fetched team responses (or exceptions) keyed by team id
         """
+        if priority is not None:
+            with priority_scope(priority):
+                return await self.generate_game_recap(game_id, game_data=game_data, team_data=team_data)
+
         pipeline_start_time = datetime.now()
         logger.info(f"[PIPELINE] Starting game recap generation for game: {game_id}")
+        RECAPS_IN_FLIGHT.inc()
         
         try:
-            # Step 1: Data Collection
-            logger.info(f"[PIPELINE] Step 1: Collecting game data for {game_id}")
-            raw_game_data = await self._collect_game_data(game_id)
-            if not raw_game_data:
-                raise ValueError(f"Failed to collect data for game {game_id}")
-            
-            # Check if data collection resulted in errors
-            if raw_game_data.get("errors") and len(raw_game_data.get("errors", [])) > 0:
-                logger.warning(f"[PIPELINE] Data collection had errors: {raw_game_data['errors']}")
-                if raw_game_data.get("results", 0) == 0:
-                    raise ValueError(f"No data available for game {game_id}: {raw_game_data['errors']}")
-            
-            # Log raw data information
-            logger.info(f"[PIPELINE-DATA] Raw game data collected:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(raw_game_data)}")
-            logger.info(f"[PIPELINE-DATA]   Keys: {list(raw_game_data.keys()) if isinstance(raw_game_data, dict) else 'Not a dict'}")
-            if isinstance(raw_game_data, dict):
-                logger.info(f"[PIPELINE-DATA]   Response count: {raw_game_data.get('response', [])}")
-                logger.info(f"[PIPELINE-DATA]   Errors: {raw_game_data.get('errors', [])}")
-                logger.info(f"[PIPELINE-DATA]   Results: {raw_game_data.get('results', 0)}")
-            
-            logger.info(f"[PIPELINE] Raw game data collected successfully")
-            
-            # Step 1.5: Extract team and player information
-            logger.info(f"[PIPELINE] Step 1.5: Extracting team and player information")
-            team_info = self.extract_team_info(raw_game_data)
-            player_info = self.extract_player_info(raw_game_data)
-            
-            # Log extracted information
-            logger.info(f"[PIPELINE-DATA] Team info extracted:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(team_info)}")
-            if isinstance(team_info, dict) and "error" not in team_info:
-                home_team = team_info.get("home_team", {}).get("name", "Unknown")
-                away_team = team_info.get("away_team", {}).get("name", "Unknown")
-                logger.info(f"[PIPELINE-DATA]   Teams: {home_team} vs {away_team}")
-                logger.info(f"[PIPELINE-DATA]   League: {team_info.get('league', {}).get('name', 'Unknown')}")
-            else:
-                logger.warning(f"[PIPELINE-DATA]   Team info error: {team_info.get('error', 'Unknown error')}")
-            
-            logger.info(f"[PIPELINE-DATA] Player info extracted:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(player_info)}")
-            if isinstance(player_info, dict) and "error" not in player_info:
-                total_players = len(player_info.get("all_players", {}))
-                key_players = len(player_info.get("key_players", []))
-                logger.info(f"[PIPELINE-DATA]   Total players: {total_players}")
-                logger.info(f"[PIPELINE-DATA]   Key players: {key_players}")
-            else:
-                logger.warning(f"[PIPELINE-DATA]   Player info error: {player_info.get('error', 'Unknown error')}")
-            
-            logger.info(f"[PIPELINE] Team and player information extracted successfully")
-            
-            # Step 1.6: Collect enhanced team and player data using data collector
-            logger.info(f"[PIPELINE] Step 1.6: Collecting enhanced team and player data")
-            enhanced_team_data = await self.collect_enhanced_team_data(team_info)
-            season = None
-            try:
-                response_list = raw_game_data.get("response", [])
-                if response_list and isinstance(response_list, list):
-                    season = response_list[0].get("league", {}).get("season")
-            except Exception as e:
-                logger.warning(f"[PIPELINE] Failed to extract season: {e}")
-            enhanced_player_data = await self.collect_enhanced_player_data(player_info, season)
-            
-            # Log enhanced data collection
-            logger.info(f"[PIPELINE-DATA] Enhanced team data collected:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(enhanced_team_data)}")
-            if isinstance(enhanced_team_data, dict) and "error" not in enhanced_team_data:
-                enhanced_data = enhanced_team_data.get("enhanced_data", {})
-                home_detailed = "home_team_detailed" in enhanced_data
-                away_detailed = "away_team_detailed" in enhanced_data
-                logger.info(f"[PIPELINE-DATA]   Home team detailed: {home_detailed}")
-                logger.info(f"[PIPELINE-DATA]   Away team detailed: {away_detailed}")
-            else:
-                logger.warning(f"[PIPELINE-DATA]   Enhanced team data error: {enhanced_team_data.get('error', 'Unknown error')}")
-            
-            logger.info(f"[PIPELINE-DATA] Enhanced player data collected:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(enhanced_player_data)}")
-            if isinstance(enhanced_player_data, dict) and "error" not in enhanced_player_data:
-                enhanced_key_players = len(enhanced_player_data.get("enhanced_key_players", []))
-                sample_players = len(enhanced_player_data.get("sample_players_detailed", []))
-                logger.info(f"[PIPELINE-DATA]   Enhanced key players: {enhanced_key_players}")
-                logger.info(f"[PIPELINE-DATA]   Sample players detailed: {sample_players}")
-            else:
-                logger.warning(f"[PIPELINE-DATA]   Enhanced player data error: {enhanced_player_data.get('error', 'Unknown error')}")
-            
-            logger.info(f"[PIPELINE] Enhanced team and player data collected successfully")
-            
-            # Step 2: Research and generate storylines
-            logger.info(f"[PIPELINE] Step 2: Conducting research and generating storylines")
-            
-            # Step 2.1: Analyze game data for storylines
-            logger.info(f"[PIPELINE] Step 2.1: Analyzing game data for storylines")
-            game_analysis = await self.researcher.get_storyline_from_game_data(raw_game_data)
-            logger.info(f"[PIPELINE-DATA] Game analysis storylines: {len(game_analysis) if isinstance(game_analysis, list) else 'Not a list'}")
-
-            # Step 2.2: Analyze historical context between teams
-            logger.info(f"[PIPELINE] Step 2.2: Analyzing historical context between teams")
-            historical_context = await self.researcher.get_history_from_team_data(enhanced_team_data)
-            logger.info(f"[PIPELINE-DATA] Historical context storylines: {len(historical_context) if isinstance(historical_context, list) else 'Not a list'}")
-
-            # Step 2.3: Analyze individual player performances
-            logger.info(f"[PIPELINE] Step 2.3: Analyzing individual player performances")
-            player_performance_analysis = await self.researcher.get_performance_from_player_game_data(enhanced_player_data, raw_game_data)
-            logger.info(f"[PIPELINE-DATA] Player performance storylines: {len(player_performance_analysis) if isinstance(player_performance_analysis, list) else 'Not a list'}")
-            
-            # Combine all research data into a comprehensive structure
-            # NOTE: Keep storylines separate from historical context to avoid confusion
-            comprehensive_research_data = {
-                "game_analysis": game_analysis,  # Current match events only
-                "historical_context": historical_context,  # Background information only
-                "player_performance": player_performance_analysis,  # Current match player events only
-            }
-            
-            # Log research data information
-            logger.info(f"[PIPELINE-DATA] Comprehensive research data:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(comprehensive_research_data)}")
-            logger.info(f"[PIPELINE-DATA]   Keys: {list(comprehensive_research_data.keys())}")
-            logger.info(f"[PIPELINE-DATA]   Game analysis storylines: {len(game_analysis)}")
-            logger.info(f"[PIPELINE-DATA]   Historical context: {len(historical_context)}")
-            logger.info(f"[PIPELINE-DATA]   Player performance: {len(player_performance_analysis)}")
-            
-            logger.info(f"[PIPELINE] Research completed, generated {len(game_analysis)} game storylines, {len(historical_context)} historical context items, {len(player_performance_analysis)} player performance items")
-            
-            # Step 3: Generate article content
-            logger.info(f"[PIPELINE] Step 3: Generating article content")
-            
-            # Prepare data for writer
-            game_info = raw_game_data
-            research_for_writer = comprehensive_research_data
-            
-            # Log the data being passed to writer for debugging
-            logger.info(f"[PIPELINE-DEBUG] Data passed to writer:")
-            logger.info(f"[PIPELINE-DEBUG]   game_info type: {type(game_info)}, keys: {list(game_info.keys()) if isinstance(game_info, dict) else 'Not a dict'}")
-            logger.info(f"[PIPELINE-DEBUG]   research type: {type(research_for_writer)}, keys: {list(research_for_writer.keys()) if isinstance(research_for_writer, dict) else 'Not a dict'}")
-            
-            # Generate article using the writer agent
-            article_content = await self.writer.generate_game_recap(
-                game_info, research_for_writer
+            run_key = f"recap:{game_id}"
+            restored = await self._load_checkpoints(run_key)
+            run = await self.recap_graph.run(
+                completed=restored,
+                on_complete=self._checkpointer(run_key, restored),
+                game_id=game_id, prefetched_game=game_data, prefetched_teams=team_data,
             )
+            await self._clear_checkpoints(run_key)
+            article_content = run.results["article"]
+            # Drop this fixture's intermediate payloads now rather than when the run is collected
+            run.results.clear()
             
-            # Log article content information
-            logger.info(f"[PIPELINE-DATA] Generated article:")
-            logger.info(f"[PIPELINE-DATA]   Type: {type(article_content)}")
-            logger.info(f"[PIPELINE-DATA]   Length: {len(article_content) if isinstance(article_content, str) else 'Not a string'}")
-            if isinstance(article_content, str):
-                logger.info(f"[PIPELINE-DATA]   Preview: {article_content[:200]}...")
-            
-            logger.info(f"[PIPELINE] Article content generated successfully")
-            
-            # Step 4: Return results
+            # Return results
             pipeline_duration = (datetime.now() - pipeline_start_time).total_seconds()
             logger.info(f"[PIPELINE] Game recap generation completed in {pipeline_duration:.2f} seconds")
             
@@ -223,6 +220,7 @@ class AgentPipeline:
                 "game_id": game_id,
                 "article_type": "game_recap",
                 "content": article_content,
+                "stage_timings": run.timings_dict(),
                 # "storylines": game_analysis,  # Only current match events for storylines
                 # "team_info": enhanced_team_data,
                 # "player_info": enhanced_player_data,
@@ -247,11 +245,15 @@ class AgentPipeline:
             
         except Exception as e:
             pipeline_duration = (datetime.now() - pipeline_start_time).total_seconds()
+            failed_run = e.run if isinstance(e, StageError) else None
+            if failed_run:
+                failed_run.results.clear()
+            error = e.error if isinstance(e, StageError) else e
             logger.error(f"[PIPELINE] Error generating game recap for {game_id} after {pipeline_duration:.2f} seconds: {str(e)}")
             return {
                 "success": False,
                 "game_id": game_id,
-                "error": str(e),
+                "error": str(error),
                 "research_data": {
                     "game_analysis": None,
                     "historical_context": None,
@@ -266,9 +268,452 @@ class AgentPipeline:
                     "data_sources": ["rapidapi_football"],
                     "model_used": self.model,
                     "error_occurred": True,
-                    "error_step": "pipeline_execution"
+                    "error_step": failed_run.failed_stage if failed_run else "pipeline_execution",
+                    "stage_timings": failed_run.timings_dict() if failed_run else {}
                 }
             }
+        finally:
+            RECAPS_IN_FLIGHT.dec()
+
+    async def stream_game_recap(self, game_id: str, priority: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Generate a game recap, streaming the article as the writer produces it.
+        
+        Runs every stage but the writer (restoring checkpoints as usual), then
+        streams the writer's output.
+        
+        Args:
+            game_id: API-Football fixture id
+            priority: Request priority for API-Football calls
+            
+        Yields:
+            ``{"event": ..., "data": ...}`` dicts: ``research`` once the research
+            stages are done (with their timings), ``token`` for each article text
+            delta, and a final ``validation`` event with the assembled article and
+            verdict. If a research stage fails, a single ``error`` event is yielded
+            instead; if the writer fails mid-stream, the stream ends with an ``error``
+            event for the ``article`` stage.
+        """
+        logger.info(f"[PIPELINE] Starting streamed game recap for game: {game_id}")
+        run_key = f"recap:{game_id}"
+        RECAPS_IN_FLIGHT.inc()
+        try:
+            try:
+                # Priority scopes must not span a yield, or they would leak into the consumer
+                with priority_scope(priority):
+                    restored = await self._load_checkpoints(run_key)
+                    run = await self.research_graph.run(
+                        completed=restored,
+                        on_complete=self._checkpointer(run_key, restored),
+                        game_id=game_id, prefetched_game=None, prefetched_teams=None,
+                    )
+            except StageError as e:
+                logger.error(f"[PIPELINE] Streamed recap for {game_id} failed at stage {e.stage}: {e.error}")
+                yield {"event": "error", "data": {"stage": e.stage, "error": str(e.error)}}
+                return
+            
+            yield {"event": "research", "data": {"stage_timings": run.timings_dict()}}
+            game_data = run.results["game_data"]
+            if "research" in run.results:
+                research = run.results["research"]
+            else:
+                research = self._research_for_writer(
+                    run.results["game_analysis"], run.results["historical_context"], run.results["player_performance"]
+                )
+            run.results.clear()
+            
+            try:
+                async with aclosing(self.writer.stream_game_recap(game_data, research)) as events:
+                    async for event in events:
+                        if event["event"] == "validation" and event["data"]["valid"]:
+                            await self._clear_checkpoints(run_key)
+                        yield event
+            except Exception as e:
+                # Model API errors, timeouts and guardrail trips still end the stream with an event
+                logger.error(f"[PIPELINE] Streamed recap for {game_id} failed while writing: {e}")
+                yield {"event": "error", "data": {"stage": "article", "error": str(e)}}
+        finally:
+            RECAPS_IN_FLIGHT.dec()
+
+    async def generate_game_recaps(
+        self,
+        game_ids: List[str],
+        concurrency: Optional[int] = None,
+        priority: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate recaps for many games, yielding each result as soon as it is done.
+        
+        At most ``concurrency`` recaps run at once, and the next game only starts
+        when one finishes, so memory stays flat however long the batch is. All
+        recaps share the pipeline's collector, so the response cache and in-flight
+        request coalescing apply across the batch (e.g. a team playing twice is
+        fetched once). Closing the iterator early cancels the recaps still running.
+        
+        Args:
+            game_ids: API-Football fixture ids; duplicates are generated once
+            concurrency: Recaps to run at once; defaults to RECAP_CONCURRENCY
+            priority: Request priority for API-Football calls, as for generate_game_recap
+            
+        Yields:
+            The ``generate_game_recap`` result of each game, in completion order
+        """
+        recaps = (
+            partial(self.generate_game_recap, game_id, priority=priority)
+            for game_id in dict.fromkeys(str(game_id) for game_id in game_ids)
+        )
+        async with aclosing(self._stream_recaps(recaps, concurrency)) as results:
+            async for result in results:
+                yield result
+
+    async def generate_matchday_recaps(
+        self,
+        league_id: int,
+        date: str,
+        season: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        priority: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate recaps for every finished fixture of a league on a date.
+        
+        Lists the league's fixtures for the date, keeps the finished ones, fetches
+        them in batched ``ids=`` requests and looks up each team once for the
+        whole matchday before running the recap stages for every fixture.
+        
+        Args:
+            league_id: API-Football league id (e.g. 39 for the Premier League)
+            date: Match date in YYYY-MM-DD format
+            season: League season; defaults to the date's year, as in ``base.get_fixtures``
+            concurrency: Recaps to run at once; defaults to RECAP_CONCURRENCY
+            priority: Request priority for API-Football calls
+            
+        Yields:
+            The ``generate_game_recap`` result of each fixture, in completion order
+        """
+        season = season or int(date.split("-")[0])
+        logger.info(f"[PIPELINE] Matchday mode: league {league_id} on {date} (season {season})")
+        
+        # Priority scopes must not span a yield, or they would leak into the consumer
+        with priority_scope(priority):
+            fixtures = await self.collector.client.get_fixtures(league_id, season, date)
+        finished_ids = [
+            str(item["fixture"]["id"]) for item in fixtures
+            if (item.get("fixture") or {}).get("status", {}).get("short") in FINISHED_STATUSES
+        ]
+        logger.info(f"[PIPELINE] Matchday has {len(fixtures)} fixtures, {len(finished_ids)} finished")
+        if not finished_ids:
+            return
+        
+        with priority_scope(priority):
+            games = await self.collector.collect_games_data(finished_ids)
+            team_ids = {
+                str(team["id"])
+                for data in games.values()
+                for item in data.get("response", [])
+                for team in (item.get("teams") or {}).values()
+                if isinstance(team, dict) and team.get("id")
+            }
+            logger.info(f"[PIPELINE] Fetching {len(team_ids)} teams once for the matchday")
+            team_data = await self._fan_out(
+                {team_id: partial(self.collector.collect_team_data, team_id) for team_id in team_ids}
+            )
+        
+        def recap(game_id: str) -> Awaitable[Dict[str, Any]]:
+            # Hand the fixture over so it is released once its recap is done
+            return self.generate_game_recap(
+                game_id, priority=priority, game_data=games.pop(game_id), team_data=team_data
+            )
+        
+        recaps = (partial(recap, game_id) for game_id in finished_ids)
+        async with aclosing(self._stream_recaps(recaps, concurrency)) as results:
+            async for result in results:
+                yield result
+
+    async def _stream_recaps(
+        self,
+        recaps: Iterator[Callable[[], Awaitable[Dict[str, Any]]]],
+        concurrency: Optional[int],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run recap factories with a concurrency cap, yielding results as they complete."""
+        limit = max(1, concurrency or self.recap_concurrency)
+        running: set[asyncio.Task[Dict[str, Any]]] = set()
+        
+        def start_next() -> None:
+            recap = next(recaps, None)
+            if recap is not None:
+                running.add(asyncio.create_task(recap()))
+        
+        logger.info(f"[PIPELINE] Starting batch recap generation (concurrency={limit})")
+        try:
+            for _ in range(limit):
+                start_next()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.discard(task)
+                    start_next()
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    def _stage_version(self, stage: Stage) -> str:
+        """Checkpoint version of a stage: its code version plus the model configuration."""
+        return f"{stage.version}:{self.config_fingerprint}"
+
+    async def _load_checkpoints(self, run_key: str) -> Dict[str, Any]:
+        """Load the still-valid stage checkpoints of a recap; never fails the recap."""
+        if self.checkpoints is None:
+            return {}
+        try:
+            versions = {name: self._stage_version(stage) for name, stage in self.recap_graph.stages.items()}
+            restored = await self.checkpoints.load(run_key, versions)
+        except Exception as e:
+            logger.warning(f"[PIPELINE] Could not load checkpoints for {run_key}: {e}")
+            return {}
+        if "game_data" in restored:
+            restored["fixture_index"] = self._stage_fixture_index(restored["game_data"])
+        if restored:
+            logger.info(f"[PIPELINE] Resuming {run_key} with checkpointed stages: {sorted(restored)}")
+        return restored
+
+    def _checkpointer(self, run_key: str, restored: Dict[str, Any]) -> Optional[Callable[[Stage, Any], Awaitable[None]]]:
+        """``on_complete`` callback checkpointing a recap's stages, for finished fixtures only.
+        
+        A live or scheduled fixture changes from one request to the next, so its
+        stages are never saved. ``game_data`` completes before any stage that
+        depends on it, and it is only ever checkpointed for a finished fixture.
+        """
+        if self.checkpoints is None:
+            return None
+        fixture_finished = "game_data" in restored
+        
+        async def save(stage: Stage, result: Any) -> None:
+            nonlocal fixture_finished
+            if stage.name == "game_data":
+                fixture_finished = _fixture_status(result) in FINISHED_STATUSES
+            if fixture_finished:
+                await self._save_checkpoint(run_key, stage, result)
+        
+        return save
+
+    async def _save_checkpoint(self, run_key: str, stage: Stage, result: Any) -> None:
+        """Checkpoint a finished stage, unless it is the final output or reported an error anywhere."""
+        if stage.name in UNCHECKPOINTED_STAGES or _has_error(result):
+            return
+        try:
+            await self.checkpoints.save(run_key, stage.name, self._stage_version(stage), result)
+        except Exception as e:
+            logger.warning(f"[PIPELINE] Could not checkpoint stage {stage.name} of {run_key}: {e}")
+
+    async def _clear_checkpoints(self, run_key: str) -> None:
+        """Drop a recap's checkpoints once it succeeded; never fails the recap."""
+        if self.checkpoints is None:
+            return
+        try:
+            await self.checkpoints.clear(run_key)
+        except Exception as e:
+            logger.warning(f"[PIPELINE] Could not clear checkpoints of {run_key}: {e}")
+
+    def _build_recap_graph(self) -> StageGraph:
+        """Build the game recap stage graph.
+        
+        Each stage starts as soon as its inputs are ready:
+        
+            game_data ─┬─ fixture_index ─┬─ enhanced_teams ─┬─ historical_context ───┐
+                       │                 │                  │                        │
+                       ├─ team_history ──┼──────────────────┘                        │
+                       │                 └─ enhanced_players ── player_performance ──┤
+                       └─ game_analysis ─────────────────────────────────────────────┴─ article
+        
+        In "combined" research mode the three research stages are a single
+        ``research`` stage that waits for both enrichment stages:
+        
+            game_data ─┬─ fixture_index ─┬─ enhanced_teams ───┐
+                       │                 └─ enhanced_players ─┤
+                       ├─ team_history ───────────────────────┤
+                       └──────────────────────────────────────┴─ research ── article
+        
+        ``team_history`` reads previous meetings and form from the local
+        fixture archive, so it makes no API calls.
+        """
+        graph = (
+            StageGraph()
+            .add("game_data", self._stage_game_data, depends_on=["game_id", "prefetched_game"])
+            .add("fixture_index", self._stage_fixture_index, depends_on=["game_data"])
+            .add("enhanced_teams", self._stage_enhanced_teams, depends_on=["fixture_index", "prefetched_teams"])
+            .add("enhanced_players", self._stage_enhanced_players, depends_on=["fixture_index"], version="2")
+            .add("team_history", self._stage_team_history, depends_on=["game_data"])
+        )
+        if self.research_mode == "combined":
+            return (
+                graph
+                .add("research", self._stage_research, depends_on=["game_data", "enhanced_teams", "enhanced_players", "team_history"])
+                .add("article", self._stage_research_article, depends_on=["game_data", "research"])
+            )
+        return (
+            graph
+            .add("game_analysis", self._stage_game_analysis, depends_on=["game_data"])
+            .add("historical_context", self._stage_historical_context, depends_on=["enhanced_teams", "team_history"])
+            .add("player_performance", self._stage_player_performance, depends_on=["enhanced_players", "game_data"])
+            .add("article", self._stage_article,
+                 depends_on=["game_data", "game_analysis", "historical_context", "player_performance"])
+        )
+
+    async def _stage_game_data(self, game_id: str, prefetched_game: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stage: collect (unless already fetched) and validate the raw fixture data."""
+        if prefetched_game is not None:
+            raw_game_data = prefetched_game
+        else:
+            logger.info(f"[PIPELINE] Collecting game data for {game_id}")
+            raw_game_data = await self._collect_game_data(game_id)
+        if not raw_game_data:
+            raise ValueError(f"Failed to collect data for game {game_id}")
+        
+        # Check if data collection resulted in errors
+        if raw_game_data.get("errors") and len(raw_game_data.get("errors", [])) > 0:
+            logger.warning(f"[PIPELINE] Data collection had errors: {raw_game_data['errors']}")
+            if raw_game_data.get("results", 0) == 0:
+                raise ValueError(f"No data available for game {game_id}: {raw_game_data['errors']}")
+        
+        logger.info(f"[PIPELINE-DATA] Raw game data collected: results={raw_game_data.get('results', 0)}, errors={raw_game_data.get('errors', [])}")
+        return raw_game_data
+
+    def _stage_fixture_index(self, game_data: Dict[str, Any]) -> Optional[Fixture]:
+        """Stage: parse the fixture once; the enrichment stages work on the parsed record.
+        
+        Returns None if the fixture cannot be parsed, so the enrichment stages
+        report an error instead of failing the recap.
+        """
+        try:
+            fixture = Fixture.from_response(game_data)
+        except Exception as e:
+            logger.warning(f"[PIPELINE-DATA] Could not index fixture: {e}")
+            return None
+        logger.info(f"[PIPELINE-DATA] Teams: {fixture.home.name or 'Unknown'} vs {fixture.away.name or 'Unknown'}, league: {fixture.league.name or 'Unknown'}")
+        logger.info(f"[PIPELINE-DATA] Players: {len(fixture.players)} total, {len(fixture.key_events())} key events")
+        return fixture
+
+    async def _stage_enhanced_teams(self, fixture_index: Optional[Fixture], prefetched_teams: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stage: enrich both teams with detailed team data."""
+        if fixture_index is None:
+            return {"error": "Fixture could not be indexed"}
+        enhanced_team_data = await self.collect_enhanced_team_data(fixture_index, prefetched_teams)
+        if isinstance(enhanced_team_data, dict) and "error" not in enhanced_team_data:
+            enhanced_data = enhanced_team_data.get("enhanced_data", {})
+            logger.info(f"[PIPELINE-DATA] Enhanced team data: home detailed={'home_team_detailed' in enhanced_data}, away detailed={'away_team_detailed' in enhanced_data}")
+        else:
+            logger.warning(f"[PIPELINE-DATA] Enhanced team data error: {enhanced_team_data.get('error', 'Unknown error')}")
+        return enhanced_team_data
+
+    async def _stage_enhanced_players(self, fixture_index: Optional[Fixture]) -> Dict[str, Any]:
+        """Stage: enrich key and sample players with season data."""
+        if fixture_index is None:
+            return {"error": "Fixture could not be indexed"}
+        enhanced_player_data = await self.collect_enhanced_player_data(fixture_index, fixture_index.league.season)
+        if isinstance(enhanced_player_data, dict) and "error" not in enhanced_player_data:
+            enhanced_key_players = len(enhanced_player_data.get("enhanced_key_players", []))
+            sample_players = len(enhanced_player_data.get("sample_players_detailed", []))
+            logger.info(f"[PIPELINE-DATA] Enhanced player data: {enhanced_key_players} key players, {sample_players} sample players")
+        else:
+            logger.warning(f"[PIPELINE-DATA] Enhanced player data error: {enhanced_player_data.get('error', 'Unknown error')}")
+        return enhanced_player_data
+
+    async def _stage_team_history(self, game_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Stage: previous meetings and both teams' form before this fixture, from the fixture archive."""
+        if self.archive is None:
+            return {}
+        try:
+            response_list = game_data.get("response") or []
+            fixture = ArchivedFixture.from_item(response_list[0]) if response_list else None
+            if fixture is None:
+                return {}
+            history = await self.archive.history(
+                fixture.home_id, fixture.away_id, self.archive_history_limit, before=fixture.kickoff_ts
+            )
+        except Exception as e:
+            logger.warning(f"[PIPELINE] Failed to read team history from the fixture archive: {e}")
+            return {}
+        logger.info(f"[PIPELINE-DATA] Team history: {len(history['head_to_head']['meetings'])} previous meetings, home form {history['home_form']['results'] or '-'}, away form {history['away_form']['results'] or '-'}")
+        return history
+
+    async def _stage_game_analysis(self, game_data: Dict[str, Any]) -> List[str]:
+        """Stage: storylines from the current match events (needs only the fixture)."""
+        game_analysis = await self.researcher.get_storyline_from_game_data(game_data)
+        logger.info(f"[PIPELINE-DATA] Game analysis storylines: {len(game_analysis) if isinstance(game_analysis, list) else 'Not a list'}")
+        return game_analysis
+
+    async def _stage_historical_context(self, enhanced_teams: Dict[str, Any], team_history: Dict[str, Any]) -> List[str]:
+        """Stage: historical context between the two teams."""
+        historical_context = await self.researcher.get_history_from_team_data(self._with_history(enhanced_teams, team_history))
+        logger.info(f"[PIPELINE-DATA] Historical context storylines: {len(historical_context) if isinstance(historical_context, list) else 'Not a list'}")
+        return historical_context
+
+    async def _stage_player_performance(self, enhanced_players: Dict[str, Any], game_data: Dict[str, Any]) -> List[str]:
+        """Stage: individual player performances in this match."""
+        player_performance = await self.researcher.get_performance_from_player_game_data(enhanced_players, game_data)
+        logger.info(f"[PIPELINE-DATA] Player performance storylines: {len(player_performance) if isinstance(player_performance, list) else 'Not a list'}")
+        return player_performance
+
+    async def _stage_article(
+        self,
+        game_data: Dict[str, Any],
+        game_analysis: List[str],
+        historical_context: List[str],
+        player_performance: List[str],
+    ) -> str:
+        """Stage: write the recap from the fixture and the combined research."""
+        research_for_writer = self._research_for_writer(game_analysis, historical_context, player_performance)
+        return await self._write_article(game_data, research_for_writer)
+
+    async def _stage_research(
+        self,
+        game_data: Dict[str, Any],
+        enhanced_teams: Dict[str, Any],
+        enhanced_players: Dict[str, Any],
+        team_history: Dict[str, Any],
+    ) -> Dict[str, List[str]]:
+        """Stage: storylines, history and player performance from one structured research call."""
+        research = await self.researcher.get_combined_research(
+            game_data, self._with_history(enhanced_teams, team_history), enhanced_players
+        )
+        logger.info(f"[PIPELINE] Research completed, generated {len(research['game_analysis'])} game storylines, {len(research['historical_context'])} historical context items, {len(research['player_performance'])} player performance items")
+        return research
+
+    @staticmethod
+    def _with_history(enhanced_teams: Dict[str, Any], team_history: Dict[str, Any]) -> Dict[str, Any]:
+        """Team data for the researcher, with the archived history attached when there is any."""
+        if not team_history or not isinstance(enhanced_teams, dict):
+            return enhanced_teams
+        return {**enhanced_teams, "archive_history": team_history}
+
+    async def _stage_research_article(self, game_data: Dict[str, Any], research: Dict[str, List[str]]) -> str:
+        """Stage: write the recap from the fixture and the structured research."""
+        return await self._write_article(game_data, research)
+
+    async def _write_article(self, game_data: Dict[str, Any], research_for_writer: Dict[str, Any]) -> str:
+        """Have the writer produce the recap and log the result."""
+        article_content = await self.writer.generate_game_recap(game_data, research_for_writer)
+        
+        logger.info(f"[PIPELINE-DATA] Generated article length: {len(article_content) if isinstance(article_content, str) else 'Not a string'}")
+        if isinstance(article_content, str):
+            logger.info(f"[PIPELINE-DATA]   Preview: {article_content[:200]}...")
+        return article_content
+
+    def _research_for_writer(
+        self,
+        game_analysis: List[str],
+        historical_context: List[str],
+        player_performance: List[str],
+    ) -> Dict[str, Any]:
+        """Combine the research stage outputs into the structure the writer expects."""
+        logger.info(f"[PIPELINE] Research completed, generated {len(game_analysis)} game storylines, {len(historical_context)} historical context items, {len(player_performance)} player performance items")
+        # NOTE: Keep storylines separate from historical context to avoid confusion
+        return {
+            "game_analysis": game_analysis,  # Current match events only
+            "historical_context": historical_context,  # Background information only
+            "player_performance": player_performance,  # Current match player events only
+        }
 
     async def _collect_game_data(self, game_id: str) -> Dict[str, Any]:
         """Collect game data using the data collector agent."""
@@ -290,244 +735,119 @@ class AgentPipeline:
                 "response": []
             }
 
-    def extract_team_info(self, raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract team information from raw game data.
+    def index_fixture(self, raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract team and player information from raw game data in one pass.
+        
+        The fixture is parsed once (one walk over its events and lineups) and
+        both views are built from it: players are split by team and collect
+        their match events in the same loop.
         
         Args:
             raw_game_data: Raw game data from API response
             
         Returns:
-            Dictionary containing extracted team information
+            ``{"team_info": ..., "player_info": ...}``, each an ``{"error": ...}``
+            dict if extraction failed
         """
         try:
-            logger.info("[PIPELINE] Extracting team information from raw game data")
+            logger.info("[PIPELINE] Indexing raw game data")
             
-            # Extract response data
-            response_list = raw_game_data.get("response", [])
-            if not response_list:
+            if not raw_game_data.get("response"):
                 logger.warning("[PIPELINE] No response data found in raw_game_data")
-                return {"error": "No response data available"}
-            
-            fixture_data = response_list[0]
-            teams = fixture_data.get("teams", {})
+                error = {"error": "No response data available"}
+                return {"team_info": error, "player_info": dict(error)}
             
-            # Extract home team info
-            home_team = teams.get("home", {})
-            home_team_info = {
-                "id": home_team.get("id"),
-                "name": home_team.get("name"),
-                "logo": home_team.get("logo"),
-                "winner": home_team.get("winner")
-            }
-            
-            # Extract away team info
-            away_team = teams.get("away", {})
-            away_team_info = {
-                "id": away_team.get("id"),
-                "name": away_team.get("name"),
-                "logo": away_team.get("logo"),
-                "winner": away_team.get("winner")
-            }
-            
-            # Extract league info
-            league = fixture_data.get("league", {})
-            league_info = {
-                "id": league.get("id"),
-                "name": league.get("name"),
-                "country": league.get("country"),
-                "logo": league.get("logo"),
-                "flag": league.get("flag"),
-                "season": league.get("season"),
-                "round": league.get("round")
+            fixture = Fixture.from_response(raw_game_data)
+        except Exception as e:
+            logger.error(f"[PIPELINE] Error indexing game data: {e}")
+            return {
+                "team_info": {"error": f"Failed to extract team info: {str(e)}"},
+                "player_info": {"error": f"Failed to extract player info: {str(e)}"}
             }
-            
-            # Extract lineup information if available
-            lineups = fixture_data.get("lineups", [])
-            home_lineup = None
-            away_lineup = None
-            
-            for lineup in lineups:
-                team_id = lineup.get("team", {}).get("id")
-                if team_id == home_team_info["id"]:
-                    home_lineup = {
-                        "formation": lineup.get("formation"),
-                        "coach": lineup.get("coach", {}).get("name"),
-                        "startXI": lineup.get("startXI", []),
-                        "substitutes": lineup.get("substitutes", [])
-                    }
-                elif team_id == away_team_info["id"]:
-                    away_lineup = {
-                        "formation": lineup.get("formation"),
-                        "coach": lineup.get("coach", {}).get("name"),
-                        "startXI": lineup.get("startXI", []),
-                        "substitutes": lineup.get("substitutes", [])
-                    }
-            
+        
+        try:
+            home_lineup = fixture.lineup_for(fixture.home.id)
+            away_lineup = fixture.lineup_for(fixture.away.id)
             team_info = {
-                "home_team": home_team_info,
-                "away_team": away_team_info,
-                "league": league_info,
-                "season": league_info.get("season"),
-                "home_lineup": home_lineup,
-                "away_lineup": away_lineup
+                "home_team": fixture.home.to_dict(),
+                "away_team": fixture.away.to_dict(),
+                "league": fixture.league.to_dict(),
+                "season": fixture.league.season,
+                "home_lineup": home_lineup.to_dict() if home_lineup else None,
+                "away_lineup": away_lineup.to_dict() if away_lineup else None
             }
-            
-            logger.info(f"[PIPELINE] Successfully extracted team info for {home_team_info['name']} vs {away_team_info['name']}")
-            return team_info
-            
+            logger.info(f"[PIPELINE] Successfully extracted team info for {fixture.home.name} vs {fixture.away.name}")
         except Exception as e:
             logger.error(f"[PIPELINE] Error extracting team info: {e}")
-            return {"error": f"Failed to extract team info: {str(e)}"}
-
-    def extract_player_info(self, raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract player information from raw game data.
+            team_info = {"error": f"Failed to extract team info: {str(e)}"}
         
-        Args:
-            raw_game_data: Raw game data from API response
-            
-        Returns:
-            Dictionary containing extracted player information
-        """
         try:
-            logger.info("[PIPELINE] Extracting player information from raw game data")
-            
-            # Extract response data
-            response_list = raw_game_data.get("response", [])
-            if not response_list:
-                logger.warning("[PIPELINE] No response data found in raw_game_data")
-                return {"error": "No response data available"}
-            
-            fixture_data = response_list[0]
-            
-            # Extract events (goals, cards, substitutions)
-            events = fixture_data.get("events", [])
-            player_events = {}
-            
-            for event in events:
-                player = event.get("player", {})
-                player_id = player.get("id")
-                player_name = player.get("name")
-                
-                if player_id and player_name:
-                    if player_id not in player_events:
-                        player_events[player_id] = {
-                            "id": player_id,
-                            "name": player_name,
-                            "team": event.get("team", {}).get("name"),
-                            "team_id": event.get("team", {}).get("id"),
-                            "events": []
-                        }
-                    
-                    player_events[player_id]["events"].append({
-                        "type": event.get("type"),
-                        "detail": event.get("detail"),
-                        "time": event.get("time", {}).get("elapsed"),
-                        "assist": event.get("assist", {}).get("name") if event.get("assist") else None
-                    })
-            
-            # Extract lineup information for all players
-            lineups = fixture_data.get("lineups", [])
-            all_players = {}
-            
-            for lineup in lineups:
-                team_name = lineup.get("team", {}).get("name")
-                team_id = lineup.get("team", {}).get("id")
-                
-                # Process starting XI
-                for player_data in lineup.get("startXI", []):
-                    player = player_data.get("player", {})
-                    player_id = player.get("id")
-                    if player_id:
-                        all_players[player_id] = {
-                            "id": player_id,
-                            "name": player.get("name"),
-                            "number": player.get("number"),
-                            "position": player.get("pos"),
-                            "team": team_name,
-                            "team_id": team_id,
-                            "status": "started",
-                            "formation_position": player.get("grid")
-                        }
-                
-                # Process substitutes
-                for player_data in lineup.get("substitutes", []):
-                    player = player_data.get("player", {})
-                    player_id = player.get("id")
-                    if player_id:
-                        all_players[player_id] = {
-                            "id": player_id,
-                            "name": player.get("name"),
-                            "number": player.get("number"),
-                            "position": player.get("pos"),
-                            "team": team_name,
-                            "team_id": team_id,
-                            "status": "substitute",
-                            "formation_position": None
-                        }
-            
-            # Merge event data with player data
-            for player_id, player_data in all_players.items():
-                if player_id in player_events:
-                    player_data["match_events"] = player_events[player_id]["events"]
-                else:
-                    player_data["match_events"] = []
-            
-            # Separate players by team
-            home_team_id = fixture_data.get("teams", {}).get("home", {}).get("id")
-            away_team_id = fixture_data.get("teams", {}).get("away", {}).get("id")
-            
-            home_players = {pid: pdata for pid, pdata in all_players.items() 
-                          if pdata.get("team_id") == home_team_id}
-            away_players = {pid: pdata for pid, pdata in all_players.items() 
-                          if pdata.get("team_id") == away_team_id}
+            all_players, home_players, away_players = {}, {}, {}
+            for player_id, player in fixture.players.items():
+                player_data = _player_entry(fixture, player)
+                all_players[player_id] = player_data
+                if player.team_id == fixture.home.id:
+                    home_players[player_id] = player_data
+                elif player.team_id == fixture.away.id:
+                    away_players[player_id] = player_data
             
             player_info = {
                 "home_players": home_players,
                 "away_players": away_players,
                 "all_players": all_players,
-                "key_players": self._identify_key_players(all_players, events)
+                # One entry per goal or card
+                "key_players": [
+                    {**all_players[event.player_id], "key_achievement": event.achievement()}
+                    for event in fixture.key_events()
+                ]
             }
-            
             logger.info(f"[PIPELINE] Successfully extracted player info for {len(all_players)} players")
-            return player_info
-            
         except Exception as e:
             logger.error(f"[PIPELINE] Error extracting player info: {e}")
-            return {"error": f"Failed to extract player info: {str(e)}"}
+            player_info = {"error": f"Failed to extract player info: {str(e)}"}
+        
+        return {"team_info": team_info, "player_info": player_info}
 
-    def _identify_key_players(self, all_players: Dict[str, Any], events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Identify key players based on match events.
+    def extract_team_info(self, raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract team information from raw game data (see ``index_fixture``)."""
+        return self.index_fixture(raw_game_data)["team_info"]
+
+    def extract_player_info(self, raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract player information from raw game data (see ``index_fixture``)."""
+        return self.index_fixture(raw_game_data)["player_info"]
+
+    async def _fan_out(self, fetchers: Dict[Any, Callable[[], Awaitable[Any]]]) -> Dict[Any, Any]:
+        """Run enrichment fetchers concurrently, at most ``enrichment_concurrency`` at a time.
         
         Args:
-            all_players: Dictionary of all players
-            events: List of match events
+            fetchers: Mapping of key to a zero-argument coroutine factory
             
         Returns:
-            List of key players with their achievements
+            Mapping of key to result; a failed fetch maps to its exception so one
+            failure never cancels or hides the others
         """
-        key_players = []
-        
-        for event in events:
-            if event.get("type") in ["Goal", "Card"]:
-                player = event.get("player", {})
-                player_id = player.get("id")
-                
-                if player_id and player_id in all_players:
-                    player_data = all_players[player_id].copy()
-                    player_data["key_achievement"] = {
-                        "type": event.get("type"),
-                        "detail": event.get("detail"),
-                        "time": event.get("time", {}).get("elapsed")
-                    }
-                    key_players.append(player_data)
-        
-        return key_players
-
-    async def collect_enhanced_team_data(self, team_info: Dict[str, Any]) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.enrichment_concurrency)
+
+        async def run(fetch: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await fetch()
+
+        keys = list(fetchers)
+        results = await asyncio.gather(*(run(fetchers[key]) for key in keys), return_exceptions=True)
+        return dict(zip(keys, results))
+
+    async def collect_enhanced_team_data(
+        self, fixture: Fixture, team_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Collect enhanced team data using data collector.
         
+        Home and away teams are fetched concurrently. The fixture's records are
+        rendered as dicts only in the returned stage output.
+        
         Args:
-            team_info: Basic team information extracted from game data
+            fixture: Parsed fixture (the fixture_index stage output)
+            team_data: Already-fetched team responses (or exceptions) keyed by team id;
+                teams found here are not fetched again
             
         Returns:
             Dictionary containing enhanced team data
@@ -535,38 +855,35 @@ class AgentPipeline:
         try:
             logger.info("[PIPELINE] Collecting enhanced team data")
             
+            home_lineup = fixture.lineup_for(fixture.home.id)
+            away_lineup = fixture.lineup_for(fixture.away.id)
             enhanced_team_data = {
-                "home_team": team_info.get("home_team", {}),
-                "away_team": team_info.get("away_team", {}),
-                "league": team_info.get("league", {}),
-                "home_lineup": team_info.get("home_lineup", {}),
-                "away_lineup": team_info.get("away_lineup", {}),
+                "home_team": fixture.home.to_dict(),
+                "away_team": fixture.away.to_dict(),
+                "league": fixture.league.to_dict(),
+                "home_lineup": home_lineup.to_dict() if home_lineup else None,
+                "away_lineup": away_lineup.to_dict() if away_lineup else None,
                 "enhanced_data": {}
             }
             
-            # Collect detailed data for home team
-            home_team_id = team_info.get("home_team", {}).get("id")
-            if home_team_id:
-                try:
-                    logger.info(f"[PIPELINE] Collecting detailed data for home team {home_team_id}")
-                    home_team_detailed = await self.collector.collect_team_data(str(home_team_id))
-                    enhanced_team_data["enhanced_data"]["home_team_detailed"] = home_team_detailed
-                    logger.info(f"[PIPELINE] Successfully collected home team detailed data")
-                except Exception as e:
-                    logger.warning(f"[PIPELINE] Failed to collect home team detailed data: {e}")
-                    enhanced_team_data["enhanced_data"]["home_team_detailed"] = {"error": str(e)}
-            
-            # Collect detailed data for away team
-            away_team_id = team_info.get("away_team", {}).get("id")
-            if away_team_id:
-                try:
-                    logger.info(f"[PIPELINE] Collecting detailed data for away team {away_team_id}")
-                    away_team_detailed = await self.collector.collect_team_data(str(away_team_id))
-                    enhanced_team_data["enhanced_data"]["away_team_detailed"] = away_team_detailed
-                    logger.info(f"[PIPELINE] Successfully collected away team detailed data")
-                except Exception as e:
-                    logger.warning(f"[PIPELINE] Failed to collect away team detailed data: {e}")
-                    enhanced_team_data["enhanced_data"]["away_team_detailed"] = {"error": str(e)}
+            prefetched = team_data or {}
+            results = {}
+            fetchers = {}
+            for side, team in (("home", fixture.home), ("away", fixture.away)):
+                if team.id and str(team.id) in prefetched:
+                    results[side] = prefetched[str(team.id)]
+                elif team.id:
+                    logger.info(f"[PIPELINE] Collecting detailed data for {side} team {team.id}")
+                    fetchers[side] = partial(self.collector.collect_team_data, str(team.id))
+            results.update(await self._fan_out(fetchers))
+            
+            for side, result in results.items():
+                if isinstance(result, BaseException):
+                    logger.warning(f"[PIPELINE] Failed to collect {side} team detailed data: {result}")
+                    enhanced_team_data["enhanced_data"][f"{side}_team_detailed"] = {"error": str(result)}
+                else:
+                    enhanced_team_data["enhanced_data"][f"{side}_team_detailed"] = result
+                    logger.info(f"[PIPELINE] Successfully collected {side} team detailed data")
             
             logger.info("[PIPELINE] Enhanced team data collection completed")
             return enhanced_team_data
@@ -575,98 +892,90 @@ class AgentPipeline:
             logger.error(f"[PIPELINE] Error collecting enhanced team data: {e}")
             return {"error": f"Failed to collect enhanced team data: {str(e)}"}
 
-    async def collect_enhanced_player_data(self, player_info: Dict[str, Any], season: str) -> Dict[str, Any]:
+    async def collect_enhanced_player_data(self, fixture: Fixture, season: Optional[int]) -> Dict[str, Any]:
         """Collect enhanced player data using data collector.
         
+        Key players (top 5) and a sample of two players per team are fetched as one
+        bounded concurrent fan-out. Each player is fetched at most once, even if they
+        have several key events or also appear in the sample. Players stay lineup
+        records until the output is rendered.
+        
         Args:
-            player_info: Basic player information extracted from game data
+            fixture: Parsed fixture (the fixture_index stage output)
+            season: Season of the fixture, used for player statistics
             
         Returns:
-            Dictionary containing enhanced player data
+            Dictionary with the enhanced key players and the detailed sample players
         """
         try:
             logger.info("[PIPELINE] Collecting enhanced player data")
             
-            enhanced_player_data = {
-                "home_players": player_info.get("home_players", {}),
-                "away_players": player_info.get("away_players", {}),
-                "all_players": player_info.get("all_players", {}),
-                "key_players": player_info.get("key_players", []),
-                "enhanced_data": {}
-            }
-            
-            # Collect detailed data for key players (limit to top 5 to avoid too many API calls)
-            key_players = player_info.get("key_players", [])
-            enhanced_key_players = []
-            
             if not season:
                 logger.warning("[PIPELINE] Season not found, cannot collect enhanced player data.")
                 return {"error": "Season not available in raw game data"}
 
-            for i, player in enumerate(key_players[:5]):  # Limit to top 5 key players
-                player_id = player.get("id")
-                if player_id:
-                    try:
-                        logger.info(f"[PIPELINE] Collecting detailed data for key player {player_id} ({player.get('name', 'Unknown')})")
-                        player_detailed = await self.collector.collect_player_data(str(player_id), str(season))
-                        
-                        enhanced_player = player.copy()
-                        enhanced_player["detailed_data"] = player_detailed
-                        enhanced_key_players.append(enhanced_player)
-                        
-                        logger.info(f"[PIPELINE] Successfully collected detailed data for player {player_id}")
-                    except Exception as e:
-                        logger.warning(f"[PIPELINE] Failed to collect detailed data for player {player_id}: {e}")
-                        enhanced_player = player.copy()
-                        enhanced_player["detailed_data"] = {"error": str(e)}
-                        enhanced_key_players.append(enhanced_player)
+            # One entry per Goal/Card event; group them per player, in match order
+            achievements: Dict[int, List[Dict[str, Any]]] = {}
+            for event in fixture.key_events():
+                achievements.setdefault(event.player_id, []).append(event.achievement())
+            key_players = [fixture.player(player_id) for player_id in list(achievements)[:5]]  # Limit to top 5 key players
+            
+            # Collect data for 2 players from each team (for context)
+            sample_candidates = []
+            for team in (fixture.home, fixture.away):
+                sample_candidates.extend([p for p in fixture.players.values() if p.team_id == team.id][:2])
+            
+            fetchers = {}
+            for player in key_players + sample_candidates:
+                if player.id not in fetchers:
+                    logger.info(f"[PIPELINE] Collecting detailed data for player {player.id} ({player.name or 'Unknown'})")
+                    fetchers[player.id] = partial(self.collector.collect_player_data, str(player.id), str(season))
+            results = await self._fan_out(fetchers)
             
-            enhanced_player_data["enhanced_key_players"] = enhanced_key_players
-            
-            # Collect detailed data for a few sample players from each team (for context)
-            home_players = list(player_info.get("home_players", {}).values())
-            away_players = list(player_info.get("away_players", {}).values())
+            enhanced_key_players = []
+            for player in key_players:
+                result = results[player.id]
+                if isinstance(result, BaseException):
+                    logger.warning(f"[PIPELINE] Failed to collect detailed data for player {player.id}: {result}")
+                    result = {"error": str(result)}
+                enhanced_key_players.append(_player_entry(
+                    fixture, player, key_achievements=achievements[player.id], detailed_data=result
+                ))
             
-            # Collect data for 2-3 players from each team
             sample_players = []
-            
-            # Sample from home team
-            for player in home_players[:2]:
-                player_id = player.get("id")
-                if player_id:
-                    try:
-                        logger.info(f"[PIPELINE] Collecting sample data for home player {player_id}")
-                        player_detailed = await self.collector.collect_player_data(str(player_id), str(season))
-                        
-                        sample_player = player.copy()
-                        sample_player["detailed_data"] = player_detailed
-                        sample_players.append(sample_player)
-                    except Exception as e:
-                        logger.warning(f"[PIPELINE] Failed to collect sample data for home player {player_id}: {e}")
-            
-            # Sample from away team
-            for player in away_players[:2]:
-                player_id = player.get("id")
-                if player_id:
-                    try:
-                        logger.info(f"[PIPELINE] Collecting sample data for away player {player_id}")
-                        player_detailed = await self.collector.collect_player_data(str(player_id), str(season))
-                        
-                        sample_player = player.copy()
-                        sample_player["detailed_data"] = player_detailed
-                        sample_players.append(sample_player)
-                    except Exception as e:
-                        logger.warning(f"[PIPELINE] Failed to collect sample data for away player {player_id}: {e}")
-            
-            enhanced_player_data["sample_players_detailed"] = sample_players
-            
-            logger.info(f"[PIPELINE] Enhanced player data collection completed. Key players: {len(enhanced_key_players)}, Sample players: {len(sample_players)}")
-            return enhanced_player_data
+            for player in sample_candidates:
+                result = results[player.id]
+                if isinstance(result, BaseException):
+                    logger.warning(f"[PIPELINE] Failed to collect sample data for player {player.id}: {result}")
+                    continue
+                sample_players.append(_player_entry(fixture, player, detailed_data=result))
+            
+            logger.info(f"[PIPELINE] Enhanced player data collection completed. Key players: {len(enhanced_key_players)}, Sample players: {len(sample_players)}, Fetches: {len(fetchers)}")
+            return {
+                "enhanced_key_players": enhanced_key_players,
+                "sample_players_detailed": sample_players
+            }
             
         except Exception as e:
             logger.error(f"[PIPELINE] Error collecting enhanced player data: {e}")
             return {"error": f"Failed to collect enhanced player data: {str(e)}"}
 
+    async def archive_season(self, league_id: int, season: int) -> int:
+        """
+        Bulk-import a league season into the fixture archive.
+
+        Args:
+            league_id: API-Football league id
+            season: Season year
+
+        Returns:
+            Number of fixtures archived
+        """
+        if self.archive is None:
+            raise RuntimeError("Fixture archive is disabled (FIXTURE_ARCHIVE_ENABLED=false)")
+        logger.info(f"[PIPELINE] Archiving fixtures of league {league_id}, season {season}")
+        return await self.archive.import_season(self.collector.client, league_id, season)
+
     async def get_pipeline_status(self) -> Dict[str, Any]:
         """Get the current status of the pipeline and its agents."""
         return {
@@ -679,8 +988,20 @@ class AgentPipeline:
             "configuration": {
                 "model": self.model,
                 "temperature": self.temperature,
-                "max_tokens": self.max_tokens
+                "max_tokens": self.max_tokens,
+                "collector_fetch_mode": self.collector_fetch_mode,
+                "storyline_mode": self.storyline_mode,
+                "research_mode": self.research_mode,
+                "enrichment_concurrency": self.enrichment_concurrency,
+                "recap_concurrency": self.recap_concurrency,
+                "checkpoint_path": self.checkpoint_path if self.checkpoints else None,
+                "cache_path": self.cache_path if self.cache_enabled else None,
+                "fixture_archive_path": self.archive_path if self.archive else None
             },
+            "collector_stats": await self.collector.get_stats(),
+            "rate_limit": self.transport.scheduler.stats() if self.transport.scheduler else None,
+            "checkpoints": await self.checkpoints.stats() if self.checkpoints else None,
+            "fixture_archive": self.archive.stats() if self.archive else None,
             "data_flow": "Data Collector → Research → Writer",
             "timestamp": datetime.now().isoformat()
         }
@@ -8,14 +8,55 @@ to enrich the content generation process.
 import logging
 from typing import Any, List, Dict
 from dotenv import load_dotenv
-import json
 
 from agents import Agent, Runner
+from pydantic import BaseModel
+
+from tools.match_facts import extract_match_facts
+from utils.match_digest import digest_fixture, digest_players, digest_teams, render, size_report
+from utils.metrics import record_token_usage
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+class Storylines(BaseModel):
+    """Structured output of a single research call."""
+
+    storylines: List[str]
+
+    def cleaned(self) -> List[str]:
+        """The storylines with surrounding whitespace and empty entries removed."""
+        return [storyline.strip() for storyline in self.storylines if storyline.strip()]
+
+
+class ResearchFindings(BaseModel):
+    """Structured output of the combined research call."""
+
+    game_analysis: List[str]
+    historical_context: List[str]
+    player_performance: List[str]
+
+
+class BackgroundFindings(BaseModel):
+    """Structured output of the combined research call when the game analysis comes from rules."""
+
+    historical_context: List[str]
+    player_performance: List[str]
+
+
+# What the combined research call asks for in each ResearchFindings field
+FINDINGS_FIELDS = {
+    "game_analysis": """3-5 factual statements about what happened in THIS match
+               (goals, cards, substitutions, final score, teams, venue, date), from the game data only""",
+    "historical_context": """3-5 background statements about the teams (founding dates, stadiums,
+               league and country information, previous meetings and recent form), from the team data only;
+               never current match events""",
+    "player_performance": """3-5 statements about what players did in THIS match, from the
+               match events only; season statistics are background, not current performance""",
+}
+
+
 class ResearchAgent:
     """Agent responsible for researching contextual information and analysis."""
 
@@ -52,29 +93,50 @@ class ResearchAgent:
             
             Always return clear, structured analysis that writers can immediately use, based solely on the provided data.""",
             name="ResearchAgent",
-            output_type=str,
+            output_type=Storylines,
             model=self.config.get("model", "gpt-4o-mini"),
         )
         
+        # Same instructions, but the combined research call returns a schema-validated object
+        self.combined_agent = self.agent.clone(name="CombinedResearchAgent", output_type=ResearchFindings)
+        self.background_agent = self.agent.clone(name="BackgroundResearchAgent", output_type=BackgroundFindings)
+        
         logger.info("Research Agent initialized successfully")
 
     async def get_storyline_from_game_data(self, game_data: dict) -> list[str]:
         """Get storylines from game data ONLY (current match events).
         
+        In "rules" storyline mode (the default) the facts are extracted from the
+        fixture without a model call; the model is only asked when the rules
+        find nothing and ``storyline_llm_fallback`` is enabled. "llm" mode
+        always asks the model.
+        
         Args:
             game_data: Game data from Data Collector (ONLY current match events)
             
         Returns:
             list[str]: List of storylines based ONLY on current match events
         """
+        if self.config.get("storyline_mode", "rules") == "rules":
+            facts = extract_match_facts(game_data)
+            if facts or not self.config.get("storyline_llm_fallback", True):
+                logger.info(f"Extracted {len(facts)} storylines from game data without a model call")
+                return facts
+            logger.info("No facts found in game data, falling back to the model")
+        return await self._get_storyline_from_model(game_data)
+
+    async def _get_storyline_from_model(self, game_data: dict) -> list[str]:
+        """Ask the model for storylines from game data."""
         logger.info("Generating storylines from game data (current match events only)")
         
         try:
+            game_digest = render(digest_fixture(game_data))
+            logger.info(f"Storyline prompt data: {size_report(game_data, game_digest)}")
             prompt = f"""
             You are analyzing game data for THIS SPECIFIC MATCH ONLY. Your task is to extract factual storylines that actually happened in this game.
 
             GAME DATA (CURRENT MATCH EVENTS ONLY):
-            {game_data}
+            {game_digest}
 
             CRITICAL MATCHING RULES:
             1. ONLY use information that explicitly appears in the game data above
@@ -90,9 +152,8 @@ class ResearchAgent:
             11. CRITICAL: Verify that each player mentioned actually participated in the specific event described
 
             REQUIRED FORMAT:
-            Output ONLY a JSON array of 3-5 factual statements about THIS match.
+            Return 3-5 factual statements about THIS match in the storylines list.
             Each statement must be directly supported by the game data.
-            Example format: ["Fact 1 about this match", "Fact 2 about this match", "Fact 3 about this match"]
 
             VALID TOPICS (only if data supports them):
             - Goals scored in this match (player, time, team)
@@ -112,8 +173,7 @@ class ResearchAgent:
             - Any player or team information not explicitly in the match events
 
             Instructions:
-            - Output only a JSON array of strings
-            - No explanations, no markdown, no extra text
+            - Each storyline is one plain sentence, with no markdown
             - Each statement must be a fact from THIS match only
             - If you cannot find clear facts, output fewer statements
             - Be extremely conservative - only include what is clearly stated in the data
@@ -121,14 +181,9 @@ class ResearchAgent:
             """
             
             result = await Runner.run(self.agent, prompt)
-            try:
-                storylines = json.loads(result.final_output)
-                if isinstance(storylines, list):
-                    if all(isinstance(s, dict) and len(s) == 1 for s in storylines):
-                        return [list(s.values())[0] for s in storylines]
-                    return [str(s).strip() for s in storylines if s]
-            except Exception:
-                return [line.strip() for line in result.final_output.splitlines() if line.strip()]
+            
+            record_token_usage(self.agent.name, result)
+            return result.final_output.cleaned()
             
         except Exception as e:
             logger.error(f"Error generating storylines from game data: {e}")
@@ -146,11 +201,13 @@ class ResearchAgent:
         logger.info("Analyzing historical context from team data (background information only)")
         
         try:
+            team_digest = render(digest_teams(team_data))
+            logger.info(f"History prompt data: {size_report(team_data, team_digest)}")
             prompt = f"""
             You are analyzing BACKGROUND and HISTORICAL information about teams. This is NOT about the current match.
 
             TEAM DATA (BACKGROUND/HISTORICAL INFORMATION ONLY):
-            {team_data}
+            {team_digest}
 
             STRICT RULES:
             1. This data is for BACKGROUND CONTEXT only, not current match events
@@ -161,9 +218,8 @@ class ResearchAgent:
             6. If information is not clearly present in the data, DO NOT include it
 
             REQUIRED FORMAT:
-            Output ONLY a JSON array of 3-5 background context statements.
+            Return 3-5 background context statements in the storylines list.
             Each statement must be directly supported by the team data.
-            Example format: ["Background fact 1", "Background fact 2", "Background fact 3"]
 
             VALID TOPICS (only if data supports them):
             - Team founding dates and history
@@ -171,6 +227,7 @@ class ResearchAgent:
             - League and competition information
             - Team codes and country information
             - Historical team achievements (if mentioned in data)
+            - Previous meetings between the teams (head_to_head) and each team's recent form before this match
             - Background information about teams
 
             INVALID TOPICS (do not include):
@@ -181,8 +238,7 @@ class ResearchAgent:
             - Any information not in the provided team data
 
             Instructions:
-            - Output only a JSON array of strings
-            - No explanations, no markdown, no extra text
+            - Each storyline is one plain sentence, with no markdown
             - Each statement must be background information only
             - If you cannot find clear background facts, output fewer statements
             - Be extremely conservative - only include what is clearly stated in the data
@@ -190,12 +246,9 @@ class ResearchAgent:
             """
             
             result = await Runner.run(self.agent, prompt)
-            try:
-                storylines = json.loads(result.final_output)
-                if isinstance(storylines, list):
-                    return [str(s).strip() for s in storylines if s]
-            except Exception:
-                return [line.strip() for line in result.final_output.splitlines() if line.strip()]
+            
+            record_token_usage(self.agent.name, result)
+            return result.final_output.cleaned()
             
         except Exception as e:
             logger.error(f"Error analyzing historical context: {e}")
@@ -214,14 +267,17 @@ class ResearchAgent:
         logger.info("Analyzing individual player performance from game data (current match events only)")
         
         try:
+            game_digest = render(digest_fixture(game_data))
+            player_digest = render(digest_players(player_data))
+            logger.info(f"Player performance prompt data: {size_report((game_data, player_data), game_digest + player_digest)}")
             prompt = f"""
             You are analyzing player performance from THIS SPECIFIC MATCH. Focus on what players actually did in this game.
 
             GAME CONTEXT (CURRENT MATCH EVENTS ONLY):
-            {game_data}
+            {game_digest}
 
             PLAYER DATA (CURRENT MATCH + HISTORICAL BACKGROUND):
-            {player_data}
+            {player_digest}
 
             CRITICAL MATCHING RULES:
             1. ONLY describe what players did in THIS match (goals, cards, substitutions, etc.)
@@ -237,9 +293,8 @@ class ResearchAgent:
             11. CRITICAL: Only mention players who have clear, verifiable actions in the match events
 
             REQUIRED FORMAT:
-            Output ONLY a JSON array of 3-5 factual statements about player performance in THIS match.
+            Return 3-5 factual statements about player performance in THIS match in the storylines list.
             Each statement must be directly supported by the game data.
-            Example format: ["Player X scored in this match", "Player Y received a card in this match"]
 
             VALID TOPICS (only if data supports them):
             - Goals scored by players in this match
@@ -258,8 +313,7 @@ class ResearchAgent:
             - Any player not explicitly mentioned in the match events
 
             Instructions:
-            - Output only a JSON array of strings
-            - No explanations, no markdown, no extra text
+            - Each storyline is one plain sentence, with no markdown
             - Each statement must be about THIS match only
             - If you cannot find clear player facts from this match, output fewer statements
             - Be extremely conservative - only include what is clearly stated in the match data
@@ -268,13 +322,98 @@ class ResearchAgent:
             """
             
             result = await Runner.run(self.agent, prompt)
-            try:
-                storylines = json.loads(result.final_output)
-                if isinstance(storylines, list):
-                    return [str(s).strip() for s in storylines if s]
-            except Exception:
-                return [line.strip() for line in result.final_output.splitlines() if line.strip()]
+            
+            record_token_usage(self.agent.name, result)
+            return result.final_output.cleaned()
             
         except Exception as e:
             logger.error(f"Error analyzing player performance: {e}")
             return ["Player performance analysis based on available data", "Individual contributions from the match data"]
+
+    async def get_combined_research(self, game_data: dict, team_data: dict, player_data: dict) -> Dict[str, List[str]]:
+        """Run storyline, history and player performance research in one model call.
+        
+        The fixture, team and player digests are sent once, and the model returns a
+        ``ResearchFindings`` object instead of three separate JSON arrays. In "rules"
+        storyline mode the game analysis is the rule-based match facts, and the model
+        is only asked for the other two lists (``BackgroundFindings``); it still
+        writes the game analysis when the rules find nothing and
+        ``storyline_llm_fallback`` is enabled.
+        
+        Args:
+            game_data: Game data from Data Collector (current match events)
+            team_data: Team information including enhanced data (background only)
+            player_data: Player information including enhanced data
+            
+        Returns:
+            Dict[str, List[str]]: ``game_analysis``, ``historical_context`` and
+            ``player_performance`` lists, as the writer expects them
+        """
+        logger.info("Running combined research (storylines, history and player performance in one call)")
+        
+        game_analysis = None
+        if self.config.get("storyline_mode", "rules") == "rules":
+            facts = extract_match_facts(game_data)
+            if facts or not self.config.get("storyline_llm_fallback", True):
+                logger.info(f"Extracted {len(facts)} storylines from game data without a model call")
+                game_analysis = facts
+        agent = self.combined_agent if game_analysis is None else self.background_agent
+        fields = [name for name in FINDINGS_FIELDS if name != "game_analysis" or game_analysis is None]
+        output_fields = "\n            ".join(
+            f"{number}. {name}: {FINDINGS_FIELDS[name]}" for number, name in enumerate(fields, 1)
+        )
+        
+        try:
+            game_digest = render(digest_fixture(game_data))
+            team_digest = render(digest_teams(team_data))
+            player_digest = render(digest_players(player_data))
+            logger.info(f"Combined research prompt data: {size_report((game_data, team_data, player_data), game_digest + team_digest + player_digest)}")
+            prompt = f"""
+            You are researching ONE SPECIFIC MATCH for a recap article. Produce {len(fields)} separate lists from the data below.
+
+            GAME DATA (CURRENT MATCH EVENTS ONLY):
+            {game_digest}
+
+            TEAM DATA (BACKGROUND/HISTORICAL INFORMATION ONLY):
+            {team_digest}
+
+            PLAYER DATA (CURRENT MATCH + HISTORICAL BACKGROUND):
+            {player_digest}
+
+            OUTPUT FIELDS:
+            {output_fields}
+
+            CRITICAL MATCHING RULES:
+            1. ONLY use information that explicitly appears in the data above
+            2. DO NOT make assumptions, inferences, or interpretations
+            3. Keep each list to its own kind of information; do not repeat items across lists
+            4. CRITICAL: When mentioning players, teams, or events, use EXACTLY the names and details from the data
+            5. CRITICAL: Do not mix up player names, team names, or event times
+            6. CRITICAL: If a player name is unclear or incomplete in the data, do not guess or complete it
+            7. CRITICAL: Only mention players who have clear, verifiable actions in the match events
+
+            Instructions:
+            - Each list item is one plain sentence
+            - If you cannot find clear facts for a list, output fewer statements (or none)
+            - Be extremely conservative - only include what is clearly stated in the data
+            """
+            
+            result = await Runner.run(agent, prompt)
+            
+            record_token_usage(agent.name, result)
+            findings = result.final_output
+            research = {
+                key: [str(item).strip() for item in items if str(item).strip()]
+                for key, items in findings.model_dump().items()
+            }
+        except Exception as e:
+            logger.error(f"Error running combined research: {e}")
+            research = {
+                "game_analysis": ["Match analysis based on available game data", "Key moments and player performances from the data"],
+                "historical_context": ["Historical context based on available team data", "Team performance analysis from provided data"],
+                "player_performance": ["Player performance analysis based on available data", "Individual contributions from the match data"],
+            }
+        
+        if game_analysis is not None:
+            research = {**research, "game_analysis": game_analysis}
+        return research
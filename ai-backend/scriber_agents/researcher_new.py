@@ -1,13 +1,131 @@
+import asyncio
 import logging
-from typing import Any, List, Dict
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict
 from dotenv import load_dotenv
-import json
 
-from agents import Agent, Runner
+from agents import Agent, RunResult, Runner
+from pydantic import BaseModel
+
+from tools import match_analysis
+from utils.match_digest import digest_fixture, digest_players, digest_teams, render
+from utils.metrics import record_token_usage
+
+from .researcher import Storylines
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Analysis name -> (ResearchAgent method, research inputs it takes, in order)
+ANALYSES = {
+    "storylines": ("get_storyline_from_game_data", ("game_data",)),
+    "turning_points": ("get_turning_points", ("game_data",)),
+    "player_performance": ("get_performance_from_player_game_data", ("player_data", "game_data")),
+    "historical_context": ("get_history_from_team_data", ("team_data",)),
+    "event_timeline": ("get_event_timeline", ("game_data",)),
+    "stat_summary": ("get_stat_summary", ("stat_data",)),
+    "best_and_worst_moments": ("get_best_and_worst_moments", ("game_data",)),
+    "missed_chances": ("get_missed_chances", ("game_data",)),
+    "formations": ("get_formations_from_lineup_data", ("lineup_data",)),
+}
+
+# Analyses run for each article type by run_research_plan
+RESEARCH_PLANS = {
+    "game_recap": ("storylines", "turning_points", "player_performance", "historical_context",
+                   "best_and_worst_moments", "missed_chances"),
+    "brief": ("storylines", "event_timeline", "formations"),
+    "tactical": ("formations", "stat_summary", "turning_points", "missed_chances"),
+    "full": tuple(ANALYSES),
+}
+
+
+class MatchMoments(BaseModel):
+    """Structured output of the best and worst moments analysis."""
+
+    best_moment: str
+    worst_moment: str
+
+
+class TokenBudgetExceededError(RuntimeError):
+    """Raised instead of a model call once a research plan's token budget is spent."""
+
+
+@dataclass
+class TokenBudget:
+    """Tokens a research plan may spend on model calls; checked before each call."""
+
+    limit: int | None
+    used: int = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limit is not None and self.used >= self.limit
+
+
+# Budget of the research plan the current task belongs to (None outside a plan)
+_plan_budget: ContextVar[TokenBudget | None] = ContextVar("research_plan_budget", default=None)
+
+
+@dataclass
+class ResearchPlanResult:
+    """Outcome of a research plan: finished analyses plus those that did not finish."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+    over_budget: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    tokens_used: int = 0
+    duration: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not (self.timed_out or self.over_budget or self.failed)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "results": self.results,
+            "timed_out": self.timed_out,
+            "over_budget": self.over_budget,
+            "failed": self.failed,
+            "tokens_used": self.tokens_used,
+            "duration": round(self.duration, 4),
+        }
+
+
+def _plan_analyses(analyses: str | Iterable[str], inputs: dict[str, dict | None]) -> list[str]:
+    """Resolve a plan name or analysis names, checking each has the inputs it takes."""
+    if isinstance(analyses, str):
+        if analyses not in RESEARCH_PLANS:
+            raise ValueError(f"Unknown research plan: {analyses}")
+        analyses = RESEARCH_PLANS[analyses]
+    names = list(dict.fromkeys(analyses))
+    unknown = [name for name in names if name not in ANALYSES]
+    if unknown:
+        raise ValueError(f"Unknown analyses: {unknown}")
+    for name in names:
+        missing = [key for key in ANALYSES[name][1] if inputs[key] is None]
+        if missing:
+            raise ValueError(f"Analysis {name} needs {', '.join(missing)}")
+    return names
+
+
+def _plan_result(tasks: dict[str, asyncio.Task]) -> ResearchPlanResult:
+    """Sort finished, timed-out, over-budget and failed analyses into a ResearchPlanResult."""
+    plan = ResearchPlanResult()
+    for name, task in tasks.items():
+        if task.cancelled():
+            plan.timed_out.append(name)
+        elif isinstance(task.exception(), TokenBudgetExceededError):
+            plan.over_budget.append(name)
+        elif task.exception() is not None:
+            plan.failed[name] = str(task.exception())
+        else:
+            plan.results[name] = task.result()
+    return plan
+
 
 class ResearchAgent:
     """Agent responsible for researching contextual information and analysis."""
@@ -44,88 +162,226 @@ class ResearchAgent:
 
             Always return clear, structured analysis that writers can immediately use, based solely on the provided data.""",
             name="ResearchAgent",
-            output_type=str,
+            output_type=Storylines,
             model=self.config.get("model", "gpt-4o-mini"),
         )
+        self.moments_agent = self.agent.clone(name="MomentsResearchAgent", output_type=MatchMoments)
 
         logger.info("Research Agent initialized successfully")
 
     async def get_storyline_from_game_data(self, game_data: dict) -> list[str]:
         logger.info("Generating storylines from game data (current match events only)")
         prompt = f"""Extract 3-5 factual storylines from this match only. Do not include anything not explicitly present in the data.
-        {game_data}"""
+        {render(digest_fixture(game_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_turning_points(self, game_data: dict) -> list[str]:
         logger.info("Identifying turning points from game data")
+        computed = self._computed(match_analysis.turning_points, game_data)
+        if computed:
+            return computed
         prompt = f"""Identify 2-3 key turning points in this match based on game-changing events (e.g., red cards, late goals).
         Use only what's present in this data:
-        {game_data}"""
+        {render(digest_fixture(game_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_performance_from_player_game_data(self, player_data: dict, game_data: dict) -> list[str]:
         logger.info("Analyzing individual player performance from game data (current match events only)")
         prompt = f"""Analyze what players actually did in this match using the following:
         Game Data:
-        {game_data}
+        {render(digest_fixture(game_data))}
         Player Data:
-        {player_data}"""
+        {render(digest_players(player_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_history_from_team_data(self, team_data: dict) -> list[str]:
         logger.info("Analyzing historical context from team data (background information only)")
         prompt = f"""Extract 3-5 background facts about the teams using only this data:
-        {team_data}"""
+        {render(digest_teams(team_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_event_timeline(self, game_data: dict) -> list[str]:
         logger.info("Generating minute-by-minute event timeline")
+        computed = self._computed(match_analysis.event_timeline, game_data)
+        if computed:
+            return computed
         prompt = f"""Create a chronological timeline of match events with timestamps.
         Use only the following game data:
-        {game_data}"""
+        {render(digest_fixture(game_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_stat_summary(self, stat_data: dict) -> list[str]:
         logger.info("Extracting statistical summary from match data")
+        computed = self._computed(match_analysis.stat_summary, stat_data)
+        if computed:
+            return computed
         prompt = f"""Summarize numeric match stats (possession, shots, cards, corners, etc.) using only this data:
         {stat_data}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_best_and_worst_moments(self, game_data: dict) -> Dict[str, str]:
         logger.info("Finding best and worst moments in match")
+        computed = self._computed(match_analysis.best_and_worst_moments, game_data)
+        if computed and any(computed.values()):
+            return {key: value or "Unavailable" for key, value in computed.items()}
         prompt = f"""From this match data, provide:
         - best_moment (e.g. a decisive goal)
         - worst_moment (e.g. a missed penalty)
-        Output JSON with 'best_moment' and 'worst_moment' keys.
-        {game_data}"""
+        {render(digest_fixture(game_data))}"""
+        self._check_budget()
         try:
-            result = await Runner.run(self.agent, prompt)
-            return json.loads(result.final_output)
+            result = await self._run(prompt, self.moments_agent)
+            return result.final_output.model_dump()
         except Exception as e:
             logger.error(f"Error generating best/worst moments: {e}")
             return {"best_moment": "Unavailable", "worst_moment": "Unavailable"}
 
     async def get_missed_chances(self, game_data: dict) -> list[str]:
         logger.info("Identifying missed chances from match data")
+        computed = self._computed(match_analysis.missed_chances, game_data)
+        if computed:
+            return computed
         prompt = f"""List all missed chances or penalties that had potential impact on the match based on the following data:
-        {game_data}"""
+        {render(digest_fixture(game_data))}"""
         return await self._run_agent_prompt(prompt)
 
     async def get_formations_from_lineup_data(self, lineup_data: dict) -> list[str]:
         logger.info("Extracting team formations from lineup data")
+        computed = self._computed(match_analysis.formations, lineup_data)
+        if computed:
+            return computed
         prompt = f"""Identify and return team formations (e.g., 4-3-3, 3-5-2) for both teams based on this lineup data:
         {lineup_data}"""
         return await self._run_agent_prompt(prompt)
 
+    def _computed(self, analysis: Callable[[Any], Any], data: Any) -> Any:
+        """Run a rule-based analysis from tools.match_analysis.
+
+        Returns None (so the caller asks the model) when the analysis fails; an
+        empty result also sends the caller to the model.
+        """
+        try:
+            result = analysis(data)
+        except Exception as e:
+            logger.warning(f"Computed {analysis.__name__} failed, falling back to the model: {e}")
+            return None
+        if result:
+            logger.info(f"Computed {analysis.__name__} without a model call")
+        return result
+
+    async def run_research_plan(
+        self,
+        analyses: str | Iterable[str],
+        *,
+        game_data: dict | None = None,
+        player_data: dict | None = None,
+        team_data: dict | None = None,
+        stat_data: dict | None = None,
+        lineup_data: dict | None = None,
+        concurrency: int | None = None,
+        token_budget: int | None = None,
+        timeout: float | None = None,
+    ) -> ResearchPlanResult:
+        """Run a set of analyses concurrently and return whatever finishes.
+
+        At most ``concurrency`` analyses run at once. Model calls share
+        ``token_budget``: once it is spent, analyses that still need the model are
+        reported as ``over_budget`` (calls already running may overshoot it).
+        Analyses still running after ``timeout`` seconds are cancelled and
+        reported as ``timed_out``; the finished ones are returned regardless.
+
+        Args:
+            analyses: A RESEARCH_PLANS name (e.g. "game_recap", "brief") or analysis names from ANALYSES
+            game_data: Fixture response; also used for stat_data and lineup_data when those are not given
+            player_data: Enhanced player data (player_performance)
+            team_data: Enhanced team data (historical_context)
+            stat_data: Fixture statistics (stat_summary)
+            lineup_data: Fixture lineups (formations)
+            concurrency: Analyses to run at once; defaults to config "research_concurrency" (4)
+            token_budget: Total tokens for model calls; defaults to config "research_token_budget" (unlimited)
+            timeout: Seconds for the whole plan; defaults to config "research_timeout" (60)
+
+        Returns:
+            ResearchPlanResult with results keyed by analysis name
+
+        Raises:
+            ValueError: For an unknown plan or analysis, or a missing input
+        """
+        inputs = {
+            "game_data": game_data,
+            "player_data": player_data,
+            "team_data": team_data,
+            "stat_data": stat_data if stat_data is not None else game_data,
+            "lineup_data": lineup_data if lineup_data is not None else game_data,
+        }
+        names = _plan_analyses(analyses, inputs)
+        concurrency = max(1, concurrency or self.config.get("research_concurrency", 4))
+        timeout = timeout if timeout is not None else self.config.get("research_timeout", 60)
+        budget = TokenBudget(token_budget if token_budget is not None else self.config.get("research_token_budget"))
+
+        logger.info(f"Running research plan {names} (concurrency={concurrency}, token_budget={budget.limit}, timeout={timeout})")
+        start = time.perf_counter()
+        tasks = await self._run_plan_tasks(names, inputs, concurrency, budget, timeout)
+        plan = _plan_result(tasks)
+        plan.tokens_used = budget.used
+        plan.duration = time.perf_counter() - start
+        logger.info(f"Research plan finished in {plan.duration:.2f}s: {len(plan.results)} done, timed out: {plan.timed_out}, over budget: {plan.over_budget}, failed: {list(plan.failed)}")
+        return plan
+
+    async def _run_plan_tasks(
+        self,
+        names: list[str],
+        inputs: dict[str, dict | None],
+        concurrency: int,
+        budget: TokenBudget,
+        timeout: float,
+    ) -> dict[str, asyncio.Task]:
+        """Start one task per analysis under the plan's budget and cancel those still running at the timeout."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(name: str) -> Any:
+            method, keys = ANALYSES[name]
+            async with semaphore:
+                return await getattr(self, method)(*(inputs[key] for key in keys))
+
+        # Tasks copy the context when created, so each one sees this plan's budget
+        token = _plan_budget.set(budget)
+        try:
+            tasks = {name: asyncio.create_task(run(name)) for name in names}
+        finally:
+            _plan_budget.reset(token)
+        try:
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=timeout)
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return tasks
+
+    def _check_budget(self) -> None:
+        budget = _plan_budget.get()
+        if budget is not None and budget.exhausted:
+            raise TokenBudgetExceededError(f"Research plan token budget of {budget.limit} spent ({budget.used} used)")
+
+    async def _run(self, prompt: str, agent: Agent | None = None) -> RunResult:
+        """Run an agent (the storylines agent by default) once, recording token usage and charging the plan's budget."""
+        agent = agent or self.agent
+        result = await Runner.run(agent, prompt)
+        record_token_usage(agent.name, result)
+        budget = _plan_budget.get()
+        total_tokens = getattr(getattr(getattr(result, "context_wrapper", None), "usage", None), "total_tokens", None)
+        if budget is not None and isinstance(total_tokens, int):
+            budget.used += total_tokens
+        return result
+
     async def _run_agent_prompt(self, prompt: str) -> list[str]:
+        self._check_budget()
         try:
-            result = await Runner.run(self.agent, prompt)
-            try:
-                parsed = json.loads(result.final_output)
-                if isinstance(parsed, list):
-                    return [str(line).strip() for line in parsed if line]
-            except Exception:
-                return [line.strip() for line in result.final_output.splitlines() if line.strip()]
+            result = await self._run(prompt)
+            return result.final_output.cleaned()
         except Exception as e:
             logger.error(f"Error running prompt: {e}")
             return ["Analysis based on available data"]
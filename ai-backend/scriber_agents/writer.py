@@ -1,12 +1,72 @@
 import logging
-from typing import Dict, Any
+import re
+from typing import AsyncIterator, Dict, Any
 from dotenv import load_dotenv
 
 from agents import Agent, Runner
+from openai.types.responses import ResponseTextDeltaEvent
+from pydantic import BaseModel, ConfigDict, model_validator
+
+from utils.match_digest import digest_fixture, render, size_report
+from utils.metrics import record_token_usage
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+ARTICLE_MIN_WORDS = 400
+ARTICLE_MAX_WORDS = 600
+
+# A section label on its own line, optionally decorated, e.g. "Headline:", "**Body**", "[Conclusion]"
+SECTION_LABEL = re.compile(r"^[\s#*\[]*(Headline|Introduction|Body|Conclusion)[\]*]*\s*(?::[\]*]*|$)\s*(.*)$", re.IGNORECASE)
+
+
+class Article(BaseModel):
+    """A game recap article, section by section; validated on construction."""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    headline: str
+    introduction: str
+    body: str
+    conclusion: str
+
+    @model_validator(mode="after")
+    def _check_structure(self) -> "Article":
+        empty = [name for name, text in self.model_dump().items() if not text]
+        if empty:
+            raise ValueError(f"Article missing required sections: {', '.join(empty)}")
+        if not ARTICLE_MIN_WORDS <= self.word_count <= ARTICLE_MAX_WORDS:
+            raise ValueError(f"Article length out of bounds: {self.word_count} words.")
+        return self
+
+    @property
+    def word_count(self) -> int:
+        return len(self.to_text().split())
+
+    def to_text(self) -> str:
+        """The article as plain text: headline, then one block per section."""
+        return "\n\n".join((self.headline, self.introduction, self.body, self.conclusion))
+
+    @classmethod
+    def from_text(cls, text: str) -> "Article":
+        """Build an article from plain text whose sections start with their labels (as streamed).
+        
+        Raises:
+            ValueError: If a section is missing or the article fails validation
+        """
+        sections: Dict[str, list] = {}
+        current = None
+        for line in text.splitlines():
+            match = SECTION_LABEL.match(line)
+            if match:
+                current = match.group(1).lower()
+                sections[current] = [match.group(2)]
+            elif current:
+                sections[current].append(line)
+        return cls(**{name: "\n".join(lines) for name, lines in sections.items()},
+                   **{name: "" for name in cls.model_fields if name not in sections})
+
+
 class WriterAgent:
     """
     AI agent that generates complete football articles using collected data and research insights.
@@ -30,36 +90,81 @@ class WriterAgent:
             
             Always return complete, well-formatted articles ready for publication.""",
             name="WriterAgent",
-            output_type=str,
+            output_type=Article,
             model=self.config.get("model", "gpt-4o"),
         )
+        # Streaming needs readable text deltas, so the streamed article is labelled plain text
+        self.stream_agent = self.agent.clone(output_type=str)
         
         logger.info("Writer Agent initialized successfully")
 
     async def generate_game_recap(self, game_info: Dict[str, Any], research: Dict[str, Any]) -> str:
-        """Generate a complete football game recap article."""
+        """Generate a complete football game recap article, as plain text."""
         logger.info("Generating game recap article")
         
         try:
-            prompt = self._build_prompt(game_info, research)
-            result = await Runner.run(self.agent, prompt)
-            article = result.final_output_as(str).strip()
-            self._validate_article(article)
-            return article
+            article = await self.generate_article(game_info, research)
+            return article.to_text()
             
         except Exception as e:
             logger.error(f"Error generating game recap: {e}")
             raise
 
-    def _build_prompt(self, game_info, research) -> str:
+    async def generate_article(self, game_info: Dict[str, Any], research: Dict[str, Any]) -> Article:
+        """Generate a game recap as a validated ``Article``.
+        
+        The model's output is parsed straight into ``Article``; an article with an
+        empty section or outside the word limits fails the run.
+        """
+        prompt = self._build_prompt(game_info, research)
+        result = await Runner.run(self.agent, prompt)
+        record_token_usage(self.agent.name, result)
+        return result.final_output
+
+    async def stream_game_recap(self, game_info: Dict[str, Any], research: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a game recap article as it is generated.
+        
+        Yields ``{"event": ..., "data": ...}`` dicts: a ``token`` event for every
+        text delta from the model, then a final ``validation`` event carrying the
+        assembled article and whether it parses into a valid ``Article``.
+        """
+        logger.info("Streaming game recap article")
+        
+        prompt = self._build_prompt(game_info, research, labelled=True)
+        result = Runner.run_streamed(self.stream_agent, prompt)
+        chunks = []
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                chunks.append(event.data.delta)
+                yield {"event": "token", "data": event.data.delta}
+        record_token_usage(self.stream_agent.name, result)
+        
+        article = "".join(chunks).strip()
+        try:
+            Article.from_text(article)
+            verdict = {"valid": True, "error": None}
+        except ValueError as e:
+            logger.warning(f"Streamed article failed validation: {e}")
+            verdict = {"valid": False, "error": str(e)}
+        yield {
+            "event": "validation",
+            "data": {**verdict, "word_count": len(article.split()), "article": article},
+        }
+
+    def _build_prompt(self, game_info, research, labelled: bool = False) -> str:
         logger.info(f"Building prompt for game recap")
-        logger.info(f"Game Info: {game_info}")
+        game_digest = render(digest_fixture(game_info))
+        logger.info(f"Game info prompt data: {size_report(game_info, game_digest)}")
         logger.info(f"Research Insights: {research}")
 
         # Extract different types of research data
         storylines = research.get("game_analysis", [])  # Current match events only
         historical_context = research.get("historical_context", [])  # Background information only
         player_performance = research.get("player_performance", [])  # Current match player events only
+        if labelled:
+            sections = 'Start each section on its own line with its label: "Headline:", "Introduction:", "Body:", "Conclusion:".'
+        else:
+            sections = "Return each section in its own field (headline, introduction, body, conclusion), without the section labels."
 
         prompt = f"""
             Write a professional football game recap article (400-600 words) with the following structure:
@@ -67,7 +172,7 @@ class WriterAgent:
             - Introduction (context, teams, stakes)
             - Body (game storyline, key moments, player performances, relevant statistics, quotes)
             - Conclusion (summary, implications)
-            Include [Headline, Introduction, Body, Conclusion] in the article to make it easier for the junior writer to understand the structure.
+            {sections}
 
             Template for game recap:
             {self.get_game_recap_template()}
@@ -75,7 +180,7 @@ class WriterAgent:
             CRITICAL: You must clearly distinguish between CURRENT MATCH DATA and HISTORICAL/BACKGROUND DATA.
 
             CURRENT MATCH DATA (Primary Focus - This is what actually happened in this specific game):
-            - Game Info: {game_info}
+            - Game Info: {game_digest}
             - Storylines (Current Match Events): {storylines}
             - Player Performance (Current Match Events): {player_performance}
             - This contains the actual events, scores, players, and moments from THIS SPECIFIC MATCH
@@ -142,13 +247,3 @@ class WriterAgent:
         - Address competitive implications (league standings, qualification scenarios, season trajectory)
         - Provide forward-looking perspective on what this result means for both teams
         """
-
-    def _validate_article(self, article: str):
-        word_count = len(article.split())
-        if word_count < 400 or word_count > 600:
-            raise ValueError(f"Article length out of bounds: {word_count} words.")
-        if not ("Headline" in article or article.split('\n')[0].strip()):
-            raise ValueError("Article missing headline.")
-        if not any(section in article for section in ["Introduction", "Body", "Conclusion"]):
-            raise ValueError("Article missing required sections.")
-        
\ No newline at end of file
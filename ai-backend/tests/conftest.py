@@ -0,0 +1,70 @@
+"""
+Shared fixtures and fixture-payload builders for the ai-backend tests.
+
+Modules override ``pipeline_env`` to change the pipeline's configuration,
+e.g. to set a concurrency limit or turn checkpoints back on. Every test gets
+its own response cache, checkpoint and fixture archive paths, so no test can
+write to the real stores under ``cache/``.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+
+HOME = (967, "Rapide Oued ZEM")
+AWAY = (968, "Wydad AC")
+
+
+def event(minute, kind, detail, player, team=AWAY, extra=None, assist=None, comments=None):
+    """An API-Football match event for the sample fixture's teams."""
+    return {
+        "time": {"elapsed": minute, "extra": extra},
+        "team": {"id": team[0], "name": team[1]},
+        "player": {"id": None, "name": player},
+        "assist": {"id": None, "name": assist},
+        "type": kind,
+        "detail": detail,
+        "comments": comments,
+    }
+
+
+def game_with_events(events, goals=None, **overrides):
+    """The sample fixture with its events, and optionally its (home, away) goals, replaced."""
+    game_data = create_sample_game_data()
+    fixture = game_data["response"][0]
+    fixture["events"] = events
+    if goals is not None:
+        fixture["goals"] = {"home": goals[0], "away": goals[1]}
+    fixture.update(overrides)
+    return game_data
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(monkeypatch, tmp_path):
+    """Keep pipelines built by any test from writing into the real cache, checkpoints or archive."""
+    monkeypatch.setenv("API_CACHE_PATH", str(tmp_path / "api_football.sqlite3"))
+    monkeypatch.setenv("PIPELINE_CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite3"))
+    monkeypatch.setenv("FIXTURE_ARCHIVE_PATH", str(tmp_path / "fixtures.sqlite3"))
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch):
+    """Environment for an AgentPipeline with test keys and no response cache, checkpoints or archive."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("RAPIDAPI_KEY", "test_rapidapi_key")
+    monkeypatch.setenv("API_CACHE_ENABLED", "false")
+    monkeypatch.setenv("PIPELINE_CHECKPOINTS_ENABLED", "false")
+    monkeypatch.setenv("FIXTURE_ARCHIVE_ENABLED", "false")
+    return monkeypatch
+
+
+@pytest.fixture
+def pipeline(pipeline_env):
+    from scriber_agents.pipeline import AgentPipeline
+
+    return AgentPipeline()
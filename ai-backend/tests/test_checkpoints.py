@@ -0,0 +1,190 @@
+"""
+Tests for stage checkpointing and resuming failed recaps.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scriber_agents.pipeline import AgentPipeline
+from tests.test_data_collection import create_sample_game_data
+from tools.checkpoint_store import CheckpointStore
+from utils.stage_graph import StageGraph
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCheckpointStore:
+    @pytest.mark.asyncio
+    async def test_only_matching_versions_are_restored(self):
+        store = CheckpointStore()
+        await store.save("recap:1", "game_data", "1:abc", {"response": [1]})
+        await store.save("recap:1", "game_analysis", "1:abc", ["storyline"])
+
+        restored = await store.load("recap:1", {"game_data": "1:abc", "game_analysis": "2:abc"})
+
+        assert restored == {"game_data": {"response": [1]}}
+        assert await store.load("recap:2", {"game_data": "1:abc"}) == {}
+        assert (await store.stats())["stale"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_checkpoints_are_ignored(self):
+        clock = FakeClock()
+        store = CheckpointStore(ttl=60, clock=clock)
+        await store.save("recap:1", "game_data", "1", {"x": 1})
+
+        clock.now += 61
+
+        assert await store.load("recap:1", {"game_data": "1"}) == {}
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "checkpoints.sqlite3")
+        writer = CheckpointStore(path)
+        await writer.save("recap:1", "team_info", "1", {"home_team": {"id": 1}})
+        await writer.clear("recap:2")
+        writer.close()
+
+        assert await CheckpointStore(path).load("recap:1", {"team_info": "1"}) == {
+            "team_info": {"home_team": {"id": 1}}
+        }
+
+
+class TestStageGraphRestore:
+    @pytest.mark.asyncio
+    async def test_rerun_stages_invalidate_their_dependents(self):
+        calls = []
+
+        def stage(name, value):
+            def run(**kwargs):
+                calls.append(name)
+                return value
+            return run
+
+        graph = (
+            StageGraph()
+            .add("a", stage("a", 1))
+            .add("b", stage("b", 2), depends_on=["a"])
+            .add("c", stage("c", 3), depends_on=["b"])
+            .add("d", stage("d", 4), depends_on=["a"])
+        )
+        saved = {}
+
+        async def save(stage, result):
+            saved[stage.name] = result
+
+        # "b" is missing, so its dependent "c" must re-run even though it was saved
+        run = await graph.run(completed={"a": 1, "c": 30, "d": 4}, on_complete=save)
+
+        assert sorted(calls) == ["b", "c"]
+        assert run.results == {"a": 1, "b": 2, "c": 3, "d": 4}
+        assert saved == {"b": 2, "c": 3}
+        assert run.timings["a"].status == "restored"
+
+
+@pytest.fixture
+def pipeline_env(pipeline_env):
+    pipeline_env.setenv("PIPELINE_CHECKPOINTS_ENABLED", "true")
+    return pipeline_env
+
+
+class TestRecapResume:
+    @pytest.mark.asyncio
+    async def test_retry_after_writer_failure_only_reruns_writer(self, pipeline):
+        calls = []
+
+        def record(name, value):
+            async def run(*args):
+                calls.append(name)
+                return value
+            return run
+
+        pipeline._collect_game_data = record("collect", create_sample_game_data())
+        pipeline.collect_enhanced_team_data = record("teams", {"enhanced_data": {}})
+        pipeline.collect_enhanced_player_data = record("players", {"enhanced_key_players": []})
+        pipeline.researcher.get_storyline_from_game_data = record("storylines", ["s"])
+        pipeline.researcher.get_history_from_team_data = record("history", ["h"])
+        pipeline.researcher.get_performance_from_player_game_data = record("performance", ["p"])
+        attempts = []
+
+        async def write(game_info, research):
+            attempts.append(research)
+            if len(attempts) == 1:
+                raise ValueError("Article length out of bounds: 320 words.")
+            return "article"
+
+        pipeline.writer.generate_game_recap = write
+
+        first = await pipeline.generate_game_recap("1")
+        calls_after_first = list(calls)
+        second = await pipeline.generate_game_recap("1")
+
+        assert first["success"] is False
+        assert first["metadata"]["error_step"] == "article"
+        assert second["success"] is True
+        assert calls == calls_after_first  # nothing but the writer ran again
+        assert attempts[1] == {"game_analysis": ["s"], "historical_context": ["h"], "player_performance": ["p"]}
+        assert second["stage_timings"]["game_analysis"]["status"] == "restored"
+        assert second["stage_timings"]["article"]["status"] == "ok"
+        # A recap that succeeded leaves nothing behind to restore
+        assert (await pipeline.checkpoints.stats())["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unfinished_fixtures_are_not_checkpointed(self, pipeline):
+        live = create_sample_game_data()
+        live["response"][0]["fixture"]["status"] = {"long": "Second Half", "short": "2H", "elapsed": 70}
+
+        async def collect(game_id):
+            return live
+
+        pipeline._collect_game_data = collect
+        pipeline.collect_enhanced_team_data = AsyncMock(return_value={"enhanced_data": {}})
+        pipeline.collect_enhanced_player_data = AsyncMock(return_value={})
+        pipeline.researcher.get_storyline_from_game_data = AsyncMock(return_value=["s"])
+        pipeline.researcher.get_history_from_team_data = AsyncMock(return_value=["h"])
+        pipeline.researcher.get_performance_from_player_game_data = AsyncMock(return_value=["p"])
+        pipeline.writer.generate_game_recap = AsyncMock(side_effect=ValueError("writer down"))
+
+        result = await pipeline.generate_game_recap("1")
+
+        assert result["metadata"]["error_step"] == "article"
+        assert (await pipeline.checkpoints.stats())["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_failures_are_not_checkpointed(self, pipeline):
+        pipeline._collect_game_data = AsyncMock(return_value=create_sample_game_data())
+        pipeline.collect_enhanced_team_data = AsyncMock(
+            return_value={"enhanced_data": {"home_team_detailed": {"error": "timeout"}}}
+        )
+        pipeline.collect_enhanced_player_data = AsyncMock(return_value={})
+        pipeline.researcher.get_storyline_from_game_data = AsyncMock(return_value=["s"])
+        pipeline.researcher.get_history_from_team_data = AsyncMock(return_value=["h"])
+        pipeline.researcher.get_performance_from_player_game_data = AsyncMock(return_value=["p"])
+        pipeline.writer.generate_game_recap = AsyncMock(side_effect=ValueError("writer down"))
+
+        await pipeline.generate_game_recap("1")
+        restored = await pipeline._load_checkpoints("recap:1")
+
+        assert "game_data" in restored
+        assert "enhanced_teams" not in restored
+        # The fixture index is rebuilt from game_data rather than checkpointed
+        assert restored["fixture_index"].id == 239625
+
+    @pytest.mark.asyncio
+    async def test_config_change_invalidates_checkpoints(self, pipeline, monkeypatch):
+        await pipeline.checkpoints.save("recap:1", "game_data", pipeline._stage_version(pipeline.recap_graph.stages["game_data"]), {"x": 1})
+        monkeypatch.setenv("OPENAI_MODEL", "another-model")
+        other = AgentPipeline()
+
+        assert await other._load_checkpoints("recap:1") == {}
+        assert (await pipeline._load_checkpoints("recap:1"))["game_data"] == {"x": 1}
@@ -0,0 +1,97 @@
+"""
+Tests for the combined (single structured call) research mode.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from scriber_agents.pipeline import AgentPipeline
+from scriber_agents.researcher import BackgroundFindings, ResearchAgent, ResearchFindings
+
+FINDINGS = ResearchFindings(
+    game_analysis=["Wydad AC won 2-1."],
+    historical_context=["Wydad AC play in the Botola Pro."],
+    player_performance=["Y. Jabrane scored a late penalty.", " "],
+)
+
+
+class TestCombinedResearch:
+    @pytest.mark.asyncio
+    async def test_one_call_with_one_copy_of_the_fixture(self):
+        researcher = ResearchAgent({"storyline_mode": "llm"})
+        game_data = create_sample_game_data()
+
+        with patch("scriber_agents.researcher.Runner.run",
+                   new=AsyncMock(return_value=Mock(final_output=FINDINGS))) as run:
+            research = await researcher.get_combined_research(game_data, {}, {})
+
+        run.assert_awaited_once()
+        agent, prompt = run.await_args.args
+        assert agent.output_type is ResearchFindings
+        assert prompt.count("90+3' Goal (Penalty) Y. Jabrane [Wydad AC]") == 1
+        assert research == {
+            "game_analysis": ["Wydad AC won 2-1."],
+            "historical_context": ["Wydad AC play in the Botola Pro."],
+            "player_performance": ["Y. Jabrane scored a late penalty."],
+        }
+
+    @pytest.mark.asyncio
+    async def test_rules_mode_does_not_ask_for_game_analysis(self):
+        background = BackgroundFindings(historical_context=["Wydad AC play in the Botola Pro."], player_performance=[])
+        with patch("scriber_agents.researcher.Runner.run",
+                   new=AsyncMock(return_value=Mock(final_output=background))) as run:
+            research = await ResearchAgent({}).get_combined_research(create_sample_game_data(), {}, {})
+
+        agent, prompt = run.await_args.args
+        assert agent.output_type is BackgroundFindings
+        assert "game_analysis" not in prompt
+        assert research["game_analysis"][0] == "Wydad AC won 2-1 away at Rapide Oued ZEM (half-time: 0-1)."
+        assert research["historical_context"] == ["Wydad AC play in the Botola Pro."]
+
+    @pytest.mark.asyncio
+    async def test_rules_mode_asks_for_game_analysis_without_facts(self):
+        with patch("scriber_agents.researcher.Runner.run",
+                   new=AsyncMock(return_value=Mock(final_output=FINDINGS))) as run:
+            research = await ResearchAgent({}).get_combined_research({"response": []}, {}, {})
+
+        assert run.await_args.args[0].output_type is ResearchFindings
+        assert research["game_analysis"] == ["Wydad AC won 2-1."]
+
+    @pytest.mark.asyncio
+    async def test_model_failure_falls_back(self):
+        with patch("scriber_agents.researcher.Runner.run", new=AsyncMock(side_effect=RuntimeError("boom"))):
+            research = await ResearchAgent({"storyline_mode": "llm"}).get_combined_research({}, {}, {})
+
+        assert set(research) == {"game_analysis", "historical_context", "player_performance"}
+        assert all(research.values())
+
+
+class TestCombinedResearchPipeline:
+    @pytest.mark.asyncio
+    async def test_writer_receives_research_unchanged(self, pipeline_env):
+        pipeline_env.setenv("RESEARCH_MODE", "combined")
+        pipeline = AgentPipeline()
+        research = {"game_analysis": ["g"], "historical_context": ["h"], "player_performance": ["p"]}
+
+        pipeline._collect_game_data = AsyncMock(return_value=create_sample_game_data())
+        pipeline.collect_enhanced_team_data = AsyncMock(return_value={"enhanced_data": {}})
+        pipeline.collect_enhanced_player_data = AsyncMock(return_value={})
+        pipeline.researcher.get_combined_research = AsyncMock(return_value=research)
+        pipeline.researcher.get_storyline_from_game_data = AsyncMock()
+        pipeline.writer.generate_game_recap = AsyncMock(return_value="article")
+
+        result = await pipeline.generate_game_recap("1")
+
+        assert result["success"] is True
+        assert set(result["stage_timings"]) == {
+            "game_data", "fixture_index", "enhanced_teams", "enhanced_players", "team_history", "research", "article",
+        }
+        pipeline.researcher.get_combined_research.assert_awaited_once()
+        pipeline.researcher.get_storyline_from_game_data.assert_not_awaited()
+        assert pipeline.writer.generate_game_recap.await_args.args[1] == research
@@ -331,3 +331,202 @@ class TestDataCollectorAgentWithGuardrail:
         assert len(dc.agent.output_guardrails) == 1
 
 
+
+class TestDirectFetchMode:
+    """Tests for the direct-fetch path that bypasses the LLM agent"""
+
+    def test_direct_mode_is_default(self):
+        """The collector should fetch directly unless the agent path is requested"""
+        assert DataCollectorAgent({}).fetch_mode == "direct"
+        assert DataCollectorAgent({"fetch_mode": "agent"}).fetch_mode == "agent"
+
+    def test_unknown_fetch_mode_rejected(self):
+        with pytest.raises(ValueError):
+            DataCollectorAgent({"fetch_mode": "telepathy"})
+
+    @pytest.mark.asyncio
+    async def test_direct_fetch_skips_runner(self):
+        """Direct mode returns the parsed API response without a model turn"""
+        dc = DataCollectorAgent({})
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   return_value=mock_results) as mock_request, \
+                patch("scriber_agents.data_collector.Runner.run", new_callable=AsyncMock) as mock_run:
+            data = await dc.collect_team_data("33")
+
+        mock_request.assert_awaited_once_with("teams", {"id": "33"})
+        mock_run.assert_not_called()
+        assert data["response"][0]["team"]["name"] == "Manchester United"
+        assert data["results"] == 1
+
+    @pytest.mark.asyncio
+    async def test_direct_fetch_normalizes_error_dict(self):
+        """API-Football error dicts are flattened into the errors list"""
+        dc = DataCollectorAgent({})
+        payload = {"get": "players", "parameters": {"id": "1", "season": "2023"},
+                   "errors": {"rateLimit": "Too many requests"}, "results": 0, "response": []}
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   return_value=payload):
+            data = await dc.collect_player_data("1", "2023")
+
+        assert data["errors"] == ["rateLimit: Too many requests"]
+        assert data["paging"] == {"current": 1, "total": 1}
+
+    @pytest.mark.asyncio
+    async def test_agent_mode_uses_runner(self):
+        """The opt-in agent path still parses the model output"""
+        dc = DataCollectorAgent({"fetch_mode": "agent"})
+        result = Mock()
+        result.final_output = "Here you go: " + json.dumps(mock_results)
+        with patch("scriber_agents.data_collector.Runner.run", new_callable=AsyncMock,
+                   return_value=result) as mock_run:
+            data = await dc.collect_team_data("33")
+
+        mock_run.assert_awaited_once()
+        assert data["response"][0]["team"]["id"] == 33
+
+
+class TestRequestCoalescing:
+    """Concurrent identical collector requests share one fetch"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_team_requests_coalesce(self):
+        import asyncio
+
+        dc = DataCollectorAgent({})
+
+        async def slow_response(*args):
+            await asyncio.sleep(0.01)
+            return mock_results
+
+        with patch("tools.sports_apis.APIFootballClient.request",
+                   side_effect=slow_response) as mock_request:
+            results = await asyncio.gather(*(dc.collect_team_data("33") for _ in range(3)),
+                                           dc.collect_player_data("33", "2023"))
+
+        assert mock_request.call_count == 2
+        assert results[0] is results[1] is results[2]
+        stats = (await dc.get_stats())["singleflight"]
+        assert stats["coalesced"] == 2
+        assert stats["executions"] == 2
+
+
+def _fixture_item(fixture_id):
+    return {"fixture": {"id": fixture_id, "status": {"short": "FT"}},
+            "teams": {"home": {"id": 1}, "away": {"id": 2}}, "events": [], "lineups": []}
+
+
+class TestBatchFixtureFetch:
+    """Multi-fixture collection through the ids= parameter"""
+
+    @pytest.mark.asyncio
+    async def test_ids_are_chunked_and_split_per_fixture(self):
+        dc = DataCollectorAgent({})
+        requested = []
+
+        async def batch_response(endpoint, params):
+            ids = params["ids"].split("-")
+            requested.append(ids)
+            # The API silently omits unknown ids
+            items = [_fixture_item(int(i)) for i in ids if i != "999"]
+            return {"get": "fixtures", "parameters": params, "errors": [],
+                    "results": len(items), "response": items}
+
+        game_ids = [str(i) for i in range(1, 25)] + ["999", "3"]
+        with patch("tools.sports_apis.APIFootballClient.request", side_effect=batch_response):
+            results = await dc.collect_games_data(game_ids)
+
+        assert [len(chunk) for chunk in requested] == [20, 5]
+        assert len(results) == 25
+        assert results["7"]["parameters"] == {"id": "7"}
+        assert results["7"]["response"][0]["fixture"]["id"] == 7
+        assert results["7"]["errors"] == []
+        assert results["999"]["results"] == 0
+        assert results["999"]["errors"] == ["Fixture 999 not found"]
+
+    @pytest.mark.asyncio
+    async def test_cached_fixtures_are_not_refetched(self):
+        from tools.response_cache import ResponseCache
+
+        cache = ResponseCache()
+        dc = DataCollectorAgent({}, cache=cache)
+        payload = {"get": "fixtures", "errors": [], "results": 1, "response": [_fixture_item(1)]}
+        await cache.set(("fixture", "1", None), "fixture", payload)
+
+        async def batch_response(endpoint, params):
+            if endpoint == "fixtures" and "ids" in params:
+                return {"errors": [], "response": [_fixture_item(2)]}
+            return {"errors": [], "response": []}
+
+        with patch("tools.sports_apis.APIFootballClient.request",
+                   side_effect=batch_response) as mock_request:
+            results = await dc.collect_games_data(["1", "2"])
+            again = await dc.collect_game_data("2")
+
+        mock_request.assert_called_once_with("fixtures", {"ids": "2"})
+        assert results["1"]["response"][0]["fixture"]["id"] == 1
+        assert again["response"][0]["fixture"]["id"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_reports_per_fixture_errors(self):
+        dc = DataCollectorAgent({})
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   side_effect=ValueError("API-Football request failed with status 500")):
+            results = await dc.collect_games_data(["1", "2"])
+
+        assert set(results) == {"1", "2"}
+        assert all(r["results"] == 0 and r["errors"] for r in results.values())
+
+    @pytest.mark.asyncio
+    async def test_batched_and_single_fixtures_have_one_shape(self):
+        from utils.metrics import COLLECTOR_FETCH_DURATION
+
+        dc = DataCollectorAgent({})
+        batches_before = COLLECTOR_FETCH_DURATION.count(resource="fixture_batch", status="ok")
+
+        async def respond(endpoint, params):
+            # Neither the batch nor the single fixture carries statistics
+            items = [{"fixture": {"id": 1}, "teams": {"home": {"id": 1}, "away": {"id": 2}}}]
+            return {"errors": [], "response": items if endpoint == "fixtures" else []}
+
+        with patch("tools.sports_apis.APIFootballClient.request", side_effect=respond):
+            batched = (await dc.collect_games_data(["1"]))["1"]["response"][0]
+            single = (await DataCollectorAgent({}).collect_game_data("1"))["response"][0]
+
+        assert batched == single
+        assert batched["statistics"] == batched["events"] == []
+        assert COLLECTOR_FETCH_DURATION.count(resource="fixture_batch", status="ok") == batches_before + 1
+
+    @pytest.mark.asyncio
+    async def test_unread_batch_is_not_left_behind(self):
+        import asyncio
+        import gc
+
+        dc = DataCollectorAgent({})
+        release = asyncio.Event()
+
+        async def respond(endpoint, params):
+            if "ids" in params:
+                raise ValueError("API-Football request failed with status 500")
+            if endpoint == "fixtures":
+                await release.wait()
+            return {"errors": [], "response": [_fixture_item(1)] if endpoint == "fixtures" else []}
+
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+        try:
+            with patch("tools.sports_apis.APIFootballClient.request", side_effect=respond):
+                single = asyncio.create_task(dc.collect_game_data("1"))
+                await asyncio.sleep(0)
+                # Fixture 1 is coalesced onto the single fetch, so nothing reads the batch
+                batched = asyncio.create_task(dc.collect_games_data(["1"]))
+                await asyncio.sleep(0.01)
+                release.set()
+                await single
+                results = await batched
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert results["1"]["response"][0]["fixture"]["id"] == 1
+        assert unhandled == []
@@ -0,0 +1,226 @@
+"""
+Tests for the local fixture archive and its use by the collector and the pipeline.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from scriber_agents.data_collector import DataCollectorAgent
+from scriber_agents.pipeline import AgentPipeline
+from tools.fixture_archive import ArchivedFixture, FixtureArchive
+from utils.match_digest import digest_teams
+
+DAY = 86400
+START = 1_500_000_000
+NAMES = {967: "Rapide Oued ZEM", 968: "Wydad AC", 969: "Raja CA"}
+
+
+def item(fixture_id, day, home, away, home_goals, away_goals, status="FT"):
+    return {
+        "fixture": {"id": fixture_id, "date": f"2017-07-{13 + day:02d}T18:00:00+00:00",
+                    "timestamp": START + day * DAY, "status": {"short": status}},
+        "league": {"id": 200, "name": "Botola Pro", "season": 2017, "round": f"Regular Season - {day}"},
+        "teams": {"home": {"id": home, "name": NAMES[home]}, "away": {"id": away, "name": NAMES[away]}},
+        "goals": {"home": home_goals, "away": away_goals},
+    }
+
+
+SEASON = [
+    item(1, 1, 968, 967, 2, 0),
+    item(2, 2, 967, 969, 1, 1),
+    item(3, 3, 967, 968, 3, 1),
+    item(4, 4, 969, 967, 0, 2),
+    item(5, 5, 967, 968, None, None, status="NS"),
+]
+
+
+@pytest_asyncio.fixture
+async def archive():
+    archive = FixtureArchive()
+    await archive.add({"response": SEASON})
+    yield archive
+    archive.close()
+
+
+class TestFixtureArchive:
+    @pytest.mark.asyncio
+    async def test_add_skips_items_without_teams_or_date(self):
+        archive = FixtureArchive()
+        stored = await archive.add([{"fixture": {"id": 9}}, {"response": [SEASON[0], {"fixture": {"id": 10}}]}])
+
+        assert stored == 1
+        assert archive.stats() == {"fixtures": 1, "teams": 2}
+
+    @pytest.mark.asyncio
+    async def test_head_to_head_covers_both_venues_newest_first(self, archive):
+        meetings = await archive.head_to_head(968, 967)
+
+        # The unplayed fixture 5 is not a result yet
+        assert [meeting.fixture_id for meeting in meetings] == [3, 1]
+        assert meetings[0].scoreline == "2017-07-16 Rapide Oued ZEM 3-1 Wydad AC (Botola Pro)"
+        assert [meeting.fixture_id for meeting in await archive.head_to_head(967, 968, limit=1)] == [3]
+        assert [meeting.fixture_id for meeting in await archive.head_to_head(967, 968, before=START + 3 * DAY)] == [1]
+
+    @pytest.mark.asyncio
+    async def test_re_adding_a_fixture_updates_its_result(self, archive):
+        await archive.add(item(5, 5, 967, 968, 1, 0))
+
+        assert [meeting.fixture_id for meeting in await archive.head_to_head(967, 968)] == [5, 3, 1]
+        assert archive.stats()["fixtures"] == 5
+
+    @pytest.mark.asyncio
+    async def test_form(self, archive):
+        form = await archive.form(967)
+
+        assert form.results == "WWDL"
+        assert form.points == 7
+        assert form.to_dict() == {
+            "team_id": 967,
+            "team": "Rapide Oued ZEM",
+            "results": "WWDL",
+            "points": 7,
+            "played": 4,
+            "goals_for": 6,
+            "goals_against": 4,
+            "fixtures": [
+                "2017-07-17 Raja CA 0-2 Rapide Oued ZEM (Botola Pro)",
+                "2017-07-16 Rapide Oued ZEM 3-1 Wydad AC (Botola Pro)",
+                "2017-07-15 Rapide Oued ZEM 1-1 Raja CA (Botola Pro)",
+                "2017-07-14 Wydad AC 2-0 Rapide Oued ZEM (Botola Pro)",
+            ],
+        }
+        assert (await archive.form(967, limit=2)).results == "WW"
+        assert (await archive.form(967, before=START + 3 * DAY)).results == "DL"
+        assert (await archive.form(1)).to_dict()["played"] == 0
+
+    @pytest.mark.asyncio
+    async def test_history(self, archive):
+        history = await archive.history(967, 968, limit=3)
+
+        assert history["head_to_head"] == {
+            "meetings": [
+                "2017-07-16 Rapide Oued ZEM 3-1 Wydad AC (Botola Pro)",
+                "2017-07-14 Wydad AC 2-0 Rapide Oued ZEM (Botola Pro)",
+            ],
+            "home_wins": 1,
+            "away_wins": 1,
+            "draws": 0,
+        }
+        assert history["home_form"]["results"] == "WWD"
+        assert history["away_form"]["results"] == "LW"
+
+    @pytest.mark.asyncio
+    async def test_import_season_streams_in_batches(self):
+        class FakeClient:
+            def __init__(self):
+                self.calls = []
+
+            async def iter_fixtures(self, league_id, season):
+                self.calls.append((league_id, season))
+                for fixture in SEASON:
+                    yield fixture
+
+        archive = FixtureArchive()
+        client = FakeClient()
+
+        with patch.object(archive, "add", wraps=archive.add) as add:
+            stored = await archive.import_season(client, 200, 2017, batch_size=2)
+
+        assert stored == 5
+        assert client.calls == [(200, 2017)]
+        assert [len(call.args[0]) for call in add.await_args_list] == [2, 2, 1]
+        assert archive.stats()["fixtures"] == 5
+
+    def test_queries_use_the_indexes(self):
+        archive = FixtureArchive()
+        plan = lambda where: " ".join(
+            row[-1] for row in archive._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM fixtures WHERE {where} ORDER BY kickoff_ts DESC LIMIT 5", (1, 2)
+            )
+        )
+
+        assert "fixtures_by_pair" in plan("pair_low = ? AND pair_high = ?")
+        assert "fixtures_by_home" in plan("home_id = ? AND kickoff_ts < ?")
+        assert "fixtures_by_away" in plan("away_id = ? AND kickoff_ts < ?")
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "fixtures.sqlite3")
+        first = FixtureArchive(path)
+        await first.add({"response": SEASON})
+        first.close()
+
+        assert len(await FixtureArchive(path).head_to_head(967, 968)) == 2
+
+    def test_from_item(self):
+        fixture = ArchivedFixture.from_item(create_sample_game_data()["response"][0])
+
+        assert (fixture.home_id, fixture.away_id, fixture.kickoff_ts) == (967, 968, 1580997600)
+        assert fixture.result_for(968) == "W"
+        assert ArchivedFixture.from_item({"fixture": {"id": 1}}) is None
+
+
+class TestArchiveDigest:
+    @pytest.mark.asyncio
+    async def test_history_is_digested(self, archive):
+        team_data = {
+            "home_team": {"name": "Rapide Oued ZEM"},
+            "away_team": {"name": "Wydad AC"},
+            "archive_history": await archive.history(967, 968),
+        }
+
+        digest = digest_teams(team_data)
+
+        assert digest["head_to_head"]["Rapide Oued ZEM wins"] == 1
+        assert digest["head_to_head"]["draws"] == 0
+        assert digest["home_team"]["recent_form"]["results"] == "WWDL (newest first), 7 pts from 4"
+        assert digest["away_team"]["recent_form"]["goals"] == "3-3"
+
+    def test_no_history_adds_nothing(self):
+        assert set(digest_teams({"home_team": {"name": "A"}, "away_team": {"name": "B"}})) == {"home_team", "away_team"}
+
+
+class TestArchiveIntegration:
+    @pytest.mark.asyncio
+    async def test_collector_archives_fetched_fixtures(self):
+        archive = FixtureArchive()
+        dc = DataCollectorAgent({}, archive=archive)
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   return_value=create_sample_game_data()):
+            await dc.collect_game_data("239625")
+
+        meetings = await archive.head_to_head(967, 968)
+        assert [meeting.fixture_id for meeting in meetings] == [239625]
+
+    @pytest.mark.asyncio
+    async def test_researcher_gets_history_before_kickoff(self, pipeline_env):
+        pipeline_env.setenv("FIXTURE_ARCHIVE_ENABLED", "true")
+        pipeline = AgentPipeline()
+        # One earlier meeting and one after the recapped fixture, which must be ignored
+        await pipeline.archive.add([SEASON[0], {**item(7, 1, 967, 968, 4, 4), "fixture": {
+            "id": 7, "date": "2021-01-01T18:00:00+00:00", "timestamp": 1609524000, "status": {"short": "FT"}}}])
+
+        pipeline._collect_game_data = AsyncMock(return_value=create_sample_game_data())
+        pipeline.collect_enhanced_team_data = AsyncMock(return_value={"enhanced_data": {}})
+        pipeline.collect_enhanced_player_data = AsyncMock(return_value={})
+        pipeline.researcher.get_storyline_from_game_data = AsyncMock(return_value=["g"])
+        pipeline.researcher.get_history_from_team_data = AsyncMock(return_value=["h"])
+        pipeline.researcher.get_performance_from_player_game_data = AsyncMock(return_value=["p"])
+        pipeline.writer.generate_game_recap = AsyncMock(return_value="article")
+
+        result = await pipeline.generate_game_recap("239625")
+
+        assert result["success"] is True
+        team_data = pipeline.researcher.get_history_from_team_data.await_args.args[0]
+        assert team_data["archive_history"]["head_to_head"]["meetings"] == [
+            "2017-07-14 Wydad AC 2-0 Rapide Oued ZEM (Botola Pro)",
+        ]
+        assert team_data["archive_history"]["away_form"]["results"] == "W"
+        assert (await pipeline.get_pipeline_status())["fixture_archive"] == {"fixtures": 2, "teams": 2}
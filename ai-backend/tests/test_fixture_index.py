@@ -0,0 +1,296 @@
+"""
+Equivalence tests for the single-pass fixture indexer.
+
+``AgentPipeline.index_fixture`` replaced separate walks of the fixture by
+``extract_team_info``, ``extract_player_info`` and ``_identify_key_players``.
+Those original implementations are kept here verbatim (minus logging) as the
+reference the indexer must reproduce.
+"""
+
+import copy
+import os
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+
+
+# --- Reference implementation (pre-indexer) ---
+
+def legacy_extract_team_info(raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        response_list = raw_game_data.get("response", [])
+        if not response_list:
+            return {"error": "No response data available"}
+
+        fixture_data = response_list[0]
+        teams = fixture_data.get("teams", {})
+
+        home_team = teams.get("home", {})
+        home_team_info = {
+            "id": home_team.get("id"),
+            "name": home_team.get("name"),
+            "logo": home_team.get("logo"),
+            "winner": home_team.get("winner")
+        }
+
+        away_team = teams.get("away", {})
+        away_team_info = {
+            "id": away_team.get("id"),
+            "name": away_team.get("name"),
+            "logo": away_team.get("logo"),
+            "winner": away_team.get("winner")
+        }
+
+        league = fixture_data.get("league", {})
+        league_info = {
+            "id": league.get("id"),
+            "name": league.get("name"),
+            "country": league.get("country"),
+            "logo": league.get("logo"),
+            "flag": league.get("flag"),
+            "season": league.get("season"),
+            "round": league.get("round")
+        }
+
+        lineups = fixture_data.get("lineups", [])
+        home_lineup = None
+        away_lineup = None
+
+        for lineup in lineups:
+            team_id = lineup.get("team", {}).get("id")
+            if team_id == home_team_info["id"]:
+                home_lineup = {
+                    "formation": lineup.get("formation"),
+                    "coach": lineup.get("coach", {}).get("name"),
+                    "startXI": lineup.get("startXI", []),
+                    "substitutes": lineup.get("substitutes", [])
+                }
+            elif team_id == away_team_info["id"]:
+                away_lineup = {
+                    "formation": lineup.get("formation"),
+                    "coach": lineup.get("coach", {}).get("name"),
+                    "startXI": lineup.get("startXI", []),
+                    "substitutes": lineup.get("substitutes", [])
+                }
+
+        team_info = {
+            "home_team": home_team_info,
+            "away_team": away_team_info,
+            "league": league_info,
+            "season": league_info.get("season"),
+            "home_lineup": home_lineup,
+            "away_lineup": away_lineup
+        }
+
+        return team_info
+
+    except Exception as e:
+        return {"error": f"Failed to extract team info: {str(e)}"}
+
+
+def legacy_extract_player_info(raw_game_data: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        response_list = raw_game_data.get("response", [])
+        if not response_list:
+            return {"error": "No response data available"}
+
+        fixture_data = response_list[0]
+
+        events = fixture_data.get("events", [])
+        player_events = {}
+
+        for event in events:
+            player = event.get("player", {})
+            player_id = player.get("id")
+            player_name = player.get("name")
+
+            if player_id and player_name:
+                if player_id not in player_events:
+                    player_events[player_id] = {
+                        "id": player_id,
+                        "name": player_name,
+                        "team": event.get("team", {}).get("name"),
+                        "team_id": event.get("team", {}).get("id"),
+                        "events": []
+                    }
+
+                player_events[player_id]["events"].append({
+                    "type": event.get("type"),
+                    "detail": event.get("detail"),
+                    "time": event.get("time", {}).get("elapsed"),
+                    "assist": event.get("assist", {}).get("name") if event.get("assist") else None
+                })
+
+        lineups = fixture_data.get("lineups", [])
+        all_players = {}
+
+        for lineup in lineups:
+            team_name = lineup.get("team", {}).get("name")
+            team_id = lineup.get("team", {}).get("id")
+
+            for player_data in lineup.get("startXI", []):
+                player = player_data.get("player", {})
+                player_id = player.get("id")
+                if player_id:
+                    all_players[player_id] = {
+                        "id": player_id,
+                        "name": player.get("name"),
+                        "number": player.get("number"),
+                        "position": player.get("pos"),
+                        "team": team_name,
+                        "team_id": team_id,
+                        "status": "started",
+                        "formation_position": player.get("grid")
+                    }
+
+            for player_data in lineup.get("substitutes", []):
+                player = player_data.get("player", {})
+                player_id = player.get("id")
+                if player_id:
+                    all_players[player_id] = {
+                        "id": player_id,
+                        "name": player.get("name"),
+                        "number": player.get("number"),
+                        "position": player.get("pos"),
+                        "team": team_name,
+                        "team_id": team_id,
+                        "status": "substitute",
+                        "formation_position": None
+                    }
+
+        for player_id, player_data in all_players.items():
+            if player_id in player_events:
+                player_data["match_events"] = player_events[player_id]["events"]
+            else:
+                player_data["match_events"] = []
+
+        home_team_id = fixture_data.get("teams", {}).get("home", {}).get("id")
+        away_team_id = fixture_data.get("teams", {}).get("away", {}).get("id")
+
+        home_players = {pid: pdata for pid, pdata in all_players.items() 
+                      if pdata.get("team_id") == home_team_id}
+        away_players = {pid: pdata for pid, pdata in all_players.items() 
+                      if pdata.get("team_id") == away_team_id}
+
+        player_info = {
+            "home_players": home_players,
+            "away_players": away_players,
+            "all_players": all_players,
+            "key_players": legacy_identify_key_players(all_players, events)
+        }
+
+        return player_info
+
+    except Exception as e:
+        return {"error": f"Failed to extract player info: {str(e)}"}
+
+
+def legacy_identify_key_players(all_players: Dict[str, Any], events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    key_players = []
+
+    for event in events:
+        if event.get("type") in ["Goal", "Card"]:
+            player = event.get("player", {})
+            player_id = player.get("id")
+
+            if player_id and player_id in all_players:
+                player_data = all_players[player_id].copy()
+                player_data["key_achievement"] = {
+                    "type": event.get("type"),
+                    "detail": event.get("detail"),
+                    "time": event.get("time", {}).get("elapsed")
+                }
+                key_players.append(player_data)
+
+    return key_players
+
+
+# --- Fixtures ---
+
+def with_cards_and_brace():
+    """Sample fixture plus a brace, an assisted goal, cards and a substitution."""
+    data = create_sample_game_data()
+    events = data["response"][0]["events"]
+    brace = copy.deepcopy(events[0])
+    brace["time"] = {"elapsed": 75, "extra": None}
+    brace["assist"] = {"id": 2703, "name": "A. Tagnaouti"}
+    card = copy.deepcopy(events[1])
+    card.update(type="Card", detail="Yellow Card", comments="Foul")
+    subst = copy.deepcopy(events[1])
+    subst.update(type="subst", detail="Substitution 1",
+                 player={"id": 36704, "name": "B. El Bahraoui"}, assist={"id": 36756, "name": "M. Rouhi"})
+    outsider = copy.deepcopy(events[0])
+    outsider["player"] = {"id": 999, "name": "Not In Lineup"}
+    events.extend([brace, card, subst, outsider])
+    return data
+
+
+def without_lineups():
+    data = create_sample_game_data()
+    data["response"][0]["lineups"] = []
+    return data
+
+
+def without_player_names():
+    data = create_sample_game_data()
+    data["response"][0]["events"][0]["player"] = {"id": 36549, "name": None}
+    return data
+
+
+def player_listed_twice():
+    """A player in both lineups: the later entry wins but keeps its first position."""
+    data = create_sample_game_data()
+    lineups = data["response"][0]["lineups"]
+    lineups[1]["substitutes"].append(copy.deepcopy(lineups[0]["startXI"][0]))
+    return data
+
+
+FIXTURES = {
+    "sample": create_sample_game_data,
+    "cards_and_brace": with_cards_and_brace,
+    "without_lineups": without_lineups,
+    "without_player_names": without_player_names,
+    "player_listed_twice": player_listed_twice,
+    "empty_response": lambda: {"response": []},
+}
+
+
+class TestFixtureIndexEquivalence:
+    @pytest.mark.parametrize("name", FIXTURES)
+    def test_matches_reference_outputs(self, pipeline, name):
+        raw = FIXTURES[name]()
+
+        index = pipeline.index_fixture(raw)
+
+        assert index["team_info"] == legacy_extract_team_info(copy.deepcopy(raw))
+        assert index["player_info"] == legacy_extract_player_info(copy.deepcopy(raw))
+
+    @pytest.mark.parametrize("name", FIXTURES)
+    def test_preserves_ordering(self, pipeline, name):
+        raw = FIXTURES[name]()
+        player_info = pipeline.index_fixture(raw)["player_info"]
+        expected = legacy_extract_player_info(copy.deepcopy(raw))
+
+        for key in ("all_players", "home_players", "away_players"):
+            assert list(player_info.get(key, {})) == list(expected.get(key, {}))
+        assert [list(p) for p in player_info.get("key_players", [])] == [
+            list(p) for p in expected.get("key_players", [])
+        ]
+
+    def test_team_splits_share_player_records(self, pipeline):
+        player_info = pipeline.index_fixture(create_sample_game_data())["player_info"]
+
+        assert player_info["home_players"][36704] is player_info["all_players"][36704]
+        assert player_info["away_players"][36544] is player_info["all_players"][36544]
+
+    def test_extract_helpers_delegate_to_index(self, pipeline):
+        raw = with_cards_and_brace()
+        index = pipeline.index_fixture(raw)
+
+        assert pipeline.extract_team_info(raw) == index["team_info"]
+        assert pipeline.extract_player_info(raw) == index["player_info"]
@@ -0,0 +1,119 @@
+"""
+Tests for the pooled RapidAPI HTTP transport.
+
+A local aiohttp test server stands in for API-Football so the tests exercise
+real sockets (keep-alive, gzip, timeouts) without network access.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.http_transport import RapidAPITransport
+from utils.metrics import EXTERNAL_CALL_DURATION, EXTERNAL_CALLS
+
+
+@pytest_asyncio.fixture
+async def api_server():
+    """Start a fake API-Football server that records request metadata."""
+    seen = {"peers": set(), "headers": []}
+
+    async def teams(request):
+        seen["peers"].add(request.transport.get_extra_info("peername"))
+        seen["headers"].append(dict(request.headers))
+        payload = json.dumps({"get": "teams", "parameters": dict(request.query),
+                              "errors": [], "results": 0, "response": []}).encode()
+        return web.Response(body=gzip.compress(payload), content_type="application/json",
+                            headers={"Content-Encoding": "gzip"})
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/v3/teams", teams)
+    app.router.add_get("/v3/slow", slow)
+    server = TestServer(app)
+    await server.start_server()
+    server.seen = seen
+    yield server
+    await server.close()
+
+
+class TestRapidAPITransport:
+    """Test cases for RapidAPITransport."""
+
+    @pytest.mark.asyncio
+    async def test_get_decodes_gzip_and_sends_headers(self, api_server):
+        async with RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3"))) as transport:
+            response = await transport.get("teams", {"id": 33})
+
+        assert response.ok
+        assert response.json()["parameters"] == {"id": "33"}
+        headers = api_server.seen["headers"][0]
+        assert headers["x-rapidapi-key"] == "test_key"
+        assert "gzip" in headers["Accept-Encoding"]
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, api_server):
+        async with RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3"))) as transport:
+            for team_id in range(5):
+                await transport.get("teams", {"id": team_id})
+
+        assert len(api_server.seen["peers"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit_caps_connections(self, api_server):
+        transport = RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3")),
+                                      limit_per_host=2)
+        async with transport:
+            await asyncio.gather(*(transport.get("teams", {"id": i}) for i in range(10)))
+
+        assert len(api_server.seen["peers"]) <= 2
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, api_server):
+        transport = RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3")),
+                                      total_timeout=0.1)
+        async with transport:
+            with pytest.raises(asyncio.TimeoutError):
+                await transport.get("slow")
+
+    @pytest.mark.asyncio
+    async def test_close_then_reuse_reopens_session(self, api_server):
+        transport = RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3")))
+        await transport.get("teams", {"id": 1})
+        await transport.close()
+        assert transport.closed
+
+        response = await transport.get("teams", {"id": 2})
+        assert response.ok
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_api_key(self, monkeypatch):
+        monkeypatch.delenv("RAPIDAPI_KEY", raising=False)
+        transport = RapidAPITransport()
+        with pytest.raises(ValueError):
+            await transport.get("teams", {"id": 33})
+
+    @pytest.mark.asyncio
+    async def test_requests_are_counted_by_endpoint_and_status(self, api_server):
+        calls_before = EXTERNAL_CALLS.value(endpoint="teams", status="200")
+        timed_before = EXTERNAL_CALL_DURATION.count(endpoint="teams")
+
+        async with RapidAPITransport(api_key="test_key", base_url=str(api_server.make_url("/v3"))) as transport:
+            await transport.get("teams", {"id": 33})
+            await transport.get("teams", {"id": 34})
+
+        assert EXTERNAL_CALLS.value(endpoint="teams", status="200") == calls_before + 2
+        assert EXTERNAL_CALL_DURATION.count(endpoint="teams") == timed_before + 2
@@ -0,0 +1,224 @@
+"""
+Tests for the computed match analyses and the researcher_new research plans.
+"""
+
+import asyncio
+import os
+import time
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scriber_agents.researcher import Storylines
+from tests.conftest import HOME, event, game_with_events
+from tests.test_data_collection import create_sample_game_data
+from tools.match_analysis import (
+    best_and_worst_moments,
+    event_timeline,
+    formations,
+    missed_chances,
+    stat_summary,
+    turning_points,
+)
+
+STATISTICS = [
+    {"team": {"id": 967, "name": "Rapide Oued ZEM"}, "statistics": [
+        {"type": "Shots on Goal", "value": 3}, {"type": "Ball Possession", "value": "42%"},
+        {"type": "Corner Kicks", "value": 4}, {"type": "Expected Goals", "value": None},
+    ]},
+    {"team": {"id": 968, "name": "Wydad AC"}, "statistics": [
+        {"type": "Shots on Goal", "value": 9}, {"type": "Ball Possession", "value": "58%"},
+        {"type": "Corner Kicks", "value": 4}, {"type": "Expected Goals", "value": "1.7"},
+    ]},
+]
+
+
+class TestTurningPoints:
+    def test_sample_fixture(self):
+        assert turning_points(create_sample_game_data()) == [
+            "B. El Bahraoui scored the equaliser for Rapide Oued ZEM (60'), making it 1-1.",
+            "Y. Jabrane scored a late winner for Wydad AC from the penalty spot (90+3'), making it 1-2.",
+        ]
+
+    def test_comeback_after_red_card(self):
+        game_data = game_with_events([
+            event(75, "Goal", "Normal Goal", "C. Forward", team=HOME),
+            event(10, "Goal", "Normal Goal", "A. Striker"),
+            event(30, "Card", "Red Card", "B. Defender"),
+            event(50, "Goal", "Normal Goal", "D. Winger", team=HOME),
+            event(52, "Goal", "Normal Goal", "E. Forward", team=HOME),
+        ], goals=(3, 1))
+
+        assert turning_points(game_data) == [
+            "B. Defender was sent off (30') with the score at 0-1, leaving Wydad AC with 10 players.",
+            "D. Winger scored the equaliser for Rapide Oued ZEM (50'), making it 1-1.",
+            "E. Forward scored the winning goal for Rapide Oued ZEM (52'), making it 2-1.",
+            "Rapide Oued ZEM came from behind to win 3-1, having trailed 0-1.",
+        ]
+
+    def test_own_goal_is_credited_to_match_the_final_score(self):
+        # Filed under the player's own team: the replay must credit the opponents
+        game_data = game_with_events([event(85, "Goal", "Own Goal", "F. Unlucky", team=HOME)], goals=(0, 1))
+
+        assert turning_points(game_data) == [
+            "An own goal by F. Unlucky gave Wydad AC the only goal (85'), making it 0-1.",
+        ]
+        assert best_and_worst_moments(game_data)["worst_moment"] == \
+            "An own goal by F. Unlucky gave Wydad AC a goal (85'), making it 0-1."
+
+
+class TestOtherAnalyses:
+    def test_event_timeline_is_sorted(self):
+        game_data = create_sample_game_data()
+        game_data["response"][0]["events"].reverse()
+
+        assert event_timeline(game_data) == [
+            "19' Goal (Normal Goal) Z. El-Moutaraji [Wydad AC]",
+            "60' Goal (Normal Goal) B. El Bahraoui [Rapide Oued ZEM]",
+            "90+3' Goal (Penalty) Y. Jabrane [Wydad AC]",
+        ]
+
+    def test_missed_chances_and_moments(self):
+        game_data = game_with_events([
+            event(20, "Goal", "Normal Goal", "A. Striker"),
+            event(44, "Var", "Goal cancelled", "C. Forward", team=HOME),
+            event(70, "Goal", "Missed Penalty", "D. Winger", team=HOME),
+        ], goals=(0, 1))
+
+        assert missed_chances(game_data) == [
+            "C. Forward (Rapide Oued ZEM) had a goal ruled out by VAR (44').",
+            "D. Winger (Rapide Oued ZEM) missed a penalty (70').",
+        ]
+        assert best_and_worst_moments(game_data) == {
+            "best_moment": "A. Striker scored the only goal for Wydad AC (20'), making it 0-1.",
+            "worst_moment": "C. Forward (Rapide Oued ZEM) had a goal ruled out by VAR (44').",
+        }
+
+    def test_stat_summary(self):
+        expected = [
+            "Shots on Goal: Rapide Oued ZEM 3 - 9 Wydad AC (Wydad AC +6)",
+            "Ball Possession: Rapide Oued ZEM 42% - 58% Wydad AC (Wydad AC +16%)",
+            "Corner Kicks: Rapide Oued ZEM 4 - 4 Wydad AC (level)",
+        ]
+        game_data = create_sample_game_data()
+        game_data["response"][0]["statistics"] = STATISTICS
+
+        assert stat_summary({"response": STATISTICS}) == expected
+        assert stat_summary(game_data) == expected
+        assert stat_summary({"error": "boom"}) == []
+
+    def test_formations(self):
+        game_data = create_sample_game_data()
+        expected = [
+            "Rapide Oued ZEM lined up in a 4-3-3 under M. Chebil.",
+            "Wydad AC lined up in a 4-2-3-1 under S. Desabre.",
+        ]
+
+        assert formations(game_data) == expected
+        assert formations({"response": game_data["response"][0]["lineups"]}) == expected
+        assert formations({"response": []}) == []
+
+    def test_empty_payloads(self):
+        for analysis in (turning_points, event_timeline, missed_chances):
+            assert analysis({"response": []}) == []
+            assert analysis({"error": "boom"}) == []
+        assert best_and_worst_moments(None) == {"best_moment": None, "worst_moment": None}
+
+
+class TestResearcherNew:
+    @pytest.mark.asyncio
+    async def test_analyses_skip_the_model(self):
+        from scriber_agents.researcher_new import ResearchAgent
+
+        researcher = ResearchAgent({})
+        game_data = create_sample_game_data()
+        with patch("scriber_agents.researcher_new.Runner.run", new=AsyncMock()) as run:
+            assert len(await researcher.get_turning_points(game_data)) == 2
+            assert len(await researcher.get_event_timeline(game_data)) == 3
+            assert len(await researcher.get_stat_summary({"response": STATISTICS})) == 3
+            assert len(await researcher.get_formations_from_lineup_data(game_data)) == 2
+            moments = await researcher.get_best_and_worst_moments(game_data)
+
+        run.assert_not_awaited()
+        assert moments["worst_moment"] == "Unavailable"
+
+    @pytest.mark.asyncio
+    async def test_model_when_nothing_is_computed(self):
+        from scriber_agents.researcher_new import ResearchAgent
+
+        result = Mock(final_output=Storylines(storylines=["From the model"]))
+        with patch("scriber_agents.researcher_new.Runner.run", new=AsyncMock(return_value=result)) as run:
+            missed = await ResearchAgent({}).get_missed_chances(create_sample_game_data())
+            timeline = await ResearchAgent({}).get_event_timeline(game_with_events([]))
+
+        assert run.await_count == 2
+        assert missed == timeline == ["From the model"]
+
+
+# No events or lineups, so every analysis has to ask the model
+MODEL_ONLY_GAME = game_with_events([], lineups=[])
+
+
+class TestResearchPlan:
+    @pytest.mark.asyncio
+    async def test_analyses_run_concurrently(self):
+        from scriber_agents.researcher_new import ResearchAgent
+
+        researcher = ResearchAgent({})
+        running, peak = 0, 0
+
+        async def slow_model(agent, prompt):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return Mock(final_output=Storylines(storylines=["x"]), context_wrapper=Mock(usage=Mock(total_tokens=10, input_tokens=None)))
+
+        with patch("scriber_agents.researcher_new.Runner.run", new=slow_model):
+            start = time.perf_counter()
+            plan = await researcher.run_research_plan("brief", game_data=MODEL_ONLY_GAME, concurrency=2)
+            elapsed = time.perf_counter() - start
+
+        assert plan.complete
+        assert list(plan.results) == ["storylines", "event_timeline", "formations"]
+        assert peak == 2
+        assert plan.tokens_used == 30
+        # Three 0.05s calls, two at a time
+        assert elapsed < 0.14
+
+    @pytest.mark.asyncio
+    async def test_partial_results_on_timeout_and_budget(self):
+        from scriber_agents.researcher_new import ResearchAgent
+
+        async def model(agent, prompt):
+            if "timeline" in prompt:
+                await asyncio.sleep(1)
+            return Mock(final_output=Storylines(storylines=["x"]), context_wrapper=Mock(usage=Mock(total_tokens=100, input_tokens=None)))
+
+        with patch("scriber_agents.researcher_new.Runner.run", new=model):
+            timed = await ResearchAgent({}).run_research_plan(
+                ["turning_points", "event_timeline"], game_data=MODEL_ONLY_GAME, timeout=0.05)
+            budgeted = await ResearchAgent({}).run_research_plan(
+                ["storylines", "missed_chances"], game_data=MODEL_ONLY_GAME, concurrency=1, token_budget=50)
+
+        assert timed.results == {"turning_points": ["x"]}
+        assert timed.timed_out == ["event_timeline"]
+        assert budgeted.results == {"storylines": ["x"]}
+        assert budgeted.over_budget == ["missed_chances"]
+        assert not budgeted.complete
+
+    @pytest.mark.asyncio
+    async def test_invalid_plans(self):
+        from scriber_agents.researcher_new import ResearchAgent
+
+        researcher = ResearchAgent({})
+        with pytest.raises(ValueError):
+            await researcher.run_research_plan("epic", game_data={})
+        with pytest.raises(ValueError):
+            await researcher.run_research_plan(["vibes"], game_data={})
+        with pytest.raises(ValueError):
+            await researcher.run_research_plan(["historical_context"], game_data={})
@@ -0,0 +1,153 @@
+"""
+Tests for the compact match digests used in research and writer prompts.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from utils.match_digest import digest_fixture, digest_players, digest_teams, render, size_report
+
+
+def team_response(team_id, name, venue):
+    return {
+        "errors": [],
+        "response": [{
+            "team": {"id": team_id, "name": name, "code": name[:3].upper(), "country": "Morocco",
+                     "founded": 1937, "national": False, "logo": f"https://media.api-sports.io/football/teams/{team_id}.png"},
+            "venue": {"id": 1, "name": venue, "address": None, "city": "Casablanca", "capacity": 45000,
+                      "surface": "grass", "image": "https://media.api-sports.io/football/venues/1.png"},
+        }],
+    }
+
+
+class TestFixtureDigest:
+    def test_keeps_prompt_fields_only(self):
+        digest = digest_fixture(create_sample_game_data())
+
+        assert digest["fixture"] == {
+            "id": 239625,
+            "date": "2020-02-06 14:00",
+            "venue": "Stade Municipal, Oued Zem",
+            "referee": "R. Jayed",
+            "status": "Match Finished",
+        }
+        assert digest["teams"] == {"home": "Rapide Oued ZEM", "away": "Wydad AC", "winner": "Wydad AC"}
+        assert digest["score"] == {"halftime": "0-1", "fulltime": "1-2"}
+        assert digest["events"] == [
+            "19' Goal (Normal Goal) Z. El-Moutaraji [Wydad AC]",
+            "60' Goal (Normal Goal) B. El Bahraoui [Rapide Oued ZEM]",
+            "90+3' Goal (Penalty) Y. Jabrane [Wydad AC]",
+        ]
+        assert digest["lineups"][1] == {
+            "team": "Wydad AC",
+            "formation": "4-2-3-1",
+            "coach": "S. Desabre",
+            "startXI": ["26 A. Tagnaouti (G)", "7 Z. El-Moutaraji (F)", "5 Y. Jabrane (M)"],
+            "substitutes": ["13 B. Najmeddine (D)", "14 H. El Bahja (M)"],
+        }
+
+    def test_rendering_is_compact_and_deterministic(self):
+        game_data = create_sample_game_data()
+        text = render(digest_fixture(game_data))
+
+        assert text == render(digest_fixture(create_sample_game_data()))
+        assert "https://" not in text
+        assert "null" not in text
+        assert json.loads(text)["league"]["round"] == "Regular Season - 14"
+
+        report = size_report(game_data, text)
+        assert report["digest_chars"] == len(text)
+        assert report["raw_chars"] == len(str(game_data))
+        assert report["saved_pct"] > 50
+
+    def test_statistics_and_assists(self):
+        game_data = create_sample_game_data()
+        fixture = game_data["response"][0]
+        fixture["events"][0]["assist"] = {"id": 1, "name": "A. Assister"}
+        fixture["statistics"] = [
+            {"team": {"id": 968, "name": "Wydad AC"},
+             "statistics": [{"type": "Shots on Goal", "value": 6}, {"type": "Blocked Shots", "value": None}]},
+        ]
+
+        digest = digest_fixture(game_data)
+
+        assert digest["events"][0].endswith("; assist: A. Assister")
+        assert digest["statistics"] == {"Wydad AC": {"Shots on Goal": 6}}
+
+    def test_error_and_empty_payloads(self):
+        assert digest_fixture({"error": "boom"}) == {"error": "boom"}
+        assert digest_fixture({"response": []}) == {}
+        assert digest_fixture(None) == {}
+
+
+class TestTeamAndPlayerDigests:
+    def test_team_digest(self):
+        team_data = {
+            "home_team": {"id": 967, "name": "Rapide Oued ZEM", "logo": "https://x/967.png", "winner": False},
+            "away_team": {"id": 968, "name": "Wydad AC", "logo": "https://x/968.png", "winner": True},
+            "league": {"id": 200, "name": "Botola Pro", "country": "Morocco", "season": 2019, "logo": "https://x"},
+            "home_lineup": {"formation": "4-3-3", "coach": "M. Chebil", "startXI": [{"player": {}}]},
+            "away_lineup": {"formation": "4-2-3-1", "coach": "S. Desabre", "startXI": [{"player": {}}]},
+            "enhanced_data": {
+                "home_team_detailed": {"error": "timeout"},
+                "away_team_detailed": team_response(968, "Wydad AC", "Stade Mohamed V"),
+            },
+        }
+
+        digest = digest_teams(team_data)
+
+        assert digest["home_team"] == {"name": "Rapide Oued ZEM", "formation": "4-3-3", "coach": "M. Chebil"}
+        assert digest["away_team"]["venue"] == {
+            "name": "Stade Mohamed V", "city": "Casablanca", "capacity": 45000, "surface": "grass",
+        }
+        assert digest["away_team"]["founded"] == 1937
+        assert "https://" not in render(digest)
+
+    def test_player_digest(self):
+        player_data = {
+            "all_players": {36544: {"id": 36544, "name": "Y. Jabrane"}},
+            "enhanced_key_players": [{
+                "id": 36544, "name": "Y. Jabrane", "team": "Wydad AC", "team_id": 968,
+                "position": "M", "status": "started", "formation_position": "3:1",
+                "match_events": [{"type": "Goal", "detail": "Penalty", "time": 90, "assist": None}],
+                "detailed_data": {"response": [{
+                    "player": {"id": 36544, "name": "Y. Jabrane", "age": 28, "nationality": "Morocco",
+                               "photo": "https://x/36544.png"},
+                    "statistics": [
+                        {"team": {"id": 1}, "league": {"name": "Cup"}, "games": {"appearences": 2}},
+                        {"team": {"id": 968}, "league": {"name": "Botola Pro"},
+                         "games": {"appearences": 14, "minutes": 1180, "rating": "7.1"},
+                         "goals": {"total": 3, "assists": 2}, "cards": {"yellow": 4, "red": 0}},
+                    ],
+                }]},
+            }],
+            "sample_players_detailed": [],
+        }
+
+        digest = digest_players(player_data)
+
+        assert digest == {"key_players": [{
+            "name": "Y. Jabrane",
+            "team": "Wydad AC",
+            "position": "M",
+            "status": "started",
+            "match_events": ["90' Goal (Penalty)"],
+            "season": {
+                "age": 28, "nationality": "Morocco", "league": "Botola Pro", "appearances": 14,
+                "minutes": 1180, "rating": "7.1", "goals": 3, "assists": 2, "yellow_cards": 4, "red_cards": 0,
+            },
+        }]}
+
+
+class TestPrompts:
+    def test_writer_prompt_uses_digest(self):
+        from scriber_agents.writer import WriterAgent
+
+        prompt = WriterAgent()._build_prompt(create_sample_game_data(), {"game_analysis": ["s"]})
+
+        assert "90+3' Goal (Penalty) Y. Jabrane [Wydad AC]" in prompt
+        assert "media.api-sports.io" not in prompt
@@ -0,0 +1,150 @@
+"""
+Tests for rule-based match fact extraction and its use in the researcher.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.conftest import HOME, event, game_with_events
+from tests.test_data_collection import create_sample_game_data
+from tools.match_facts import extract_match_facts
+
+
+class TestExtractMatchFacts:
+    def test_sample_fixture(self):
+        assert extract_match_facts(create_sample_game_data()) == [
+            "Wydad AC won 2-1 away at Rapide Oued ZEM (half-time: 0-1).",
+            "Z. El-Moutaraji scored for Wydad AC (19').",
+            "B. El Bahraoui scored for Rapide Oued ZEM (60').",
+            "Y. Jabrane scored a penalty for Wydad AC (90+3').",
+            "The match was played at Stade Municipal, Oued Zem on 6 February 2020 "
+            "(Botola Pro, Regular Season - 14), with R. Jayed as referee.",
+        ]
+
+    def test_multiple_goals_and_own_goal(self):
+        game_data = game_with_events([
+            event(10, "Goal", "Normal Goal", "A. Striker", assist="B. Winger"),
+            event(30, "Goal", "Own Goal", "C. Defender", team=HOME),
+            event(55, "Goal", "Penalty", "A. Striker"),
+            event(80, "Goal", "Normal Goal", "A. Striker", extra=None),
+            event(85, "Goal", "Normal Goal", "D. Forward", assist="B. Winger"),
+        ])
+
+        facts = extract_match_facts(game_data)
+
+        assert facts[1:4] == [
+            "A. Striker scored a hat-trick, including a penalty, for Wydad AC (10', 55', 80').",
+            "C. Defender scored an own goal (30').",
+            "D. Forward scored for Wydad AC (85'), assisted by B. Winger.",
+        ]
+
+    def test_sending_offs_missed_penalties_and_bookings(self):
+        game_data = game_with_events([
+            event(12, "Card", "Yellow Card", "E. Midfielder"),
+            event(40, "Card", "Red Card", "F. Back", team=HOME),
+            event(70, "Card", "Second Yellow card", "E. Midfielder"),
+            event(88, "Goal", "Missed Penalty", "G. Taker"),
+            event(60, "subst", "Substitution 1", "H. Sub"),
+            event(75, "subst", "Substitution 2", "I. Sub"),
+        ])
+
+        facts = extract_match_facts(game_data)
+
+        assert facts[1:] == [
+            "F. Back (Rapide Oued ZEM) was sent off (40').",
+            "E. Midfielder (Wydad AC) was sent off after a second yellow card (70').",
+            "G. Taker (Wydad AC) missed a penalty (88').",
+            facts[4],
+            "Booked: E. Midfielder (Wydad AC, 12').",
+            "Wydad AC made 2 substitutions.",
+        ]
+        assert facts[4].startswith("The match was played at")
+
+    def test_draw_after_extra_time_and_penalties(self):
+        game_data = game_with_events([], goals=(1, 1), score={
+            "halftime": {"home": 0, "away": 0},
+            "fulltime": {"home": 1, "away": 1},
+            "extratime": {"home": 0, "away": 0},
+            "penalty": {"home": 4, "away": 3},
+        })
+
+        assert extract_match_facts(game_data)[0] == (
+            "Rapide Oued ZEM and Wydad AC drew 1-1 after extra time, "
+            "with Rapide Oued ZEM winning 4-3 on penalties (half-time: 0-0)."
+        )
+
+    def test_shootout_kicks_are_not_match_events(self):
+        shootout = {"extra": 1, "comments": "Penalty Shootout"}
+        game_data = game_with_events([
+            event(10, "Goal", "Normal Goal", "P5", team=HOME),
+            event(75, "Goal", "Normal Goal", "P6"),
+            event(120, "Goal", "Penalty", "P5", team=HOME, **shootout),
+            event(120, "Goal", "Missed Penalty", "P6", **shootout),
+        ], goals=(1, 1), score={
+            "halftime": {"home": 1, "away": 0},
+            "fulltime": {"home": 1, "away": 1},
+            "extratime": {"home": 0, "away": 0},
+            "penalty": {"home": 4, "away": 3},
+        })
+
+        facts = extract_match_facts(game_data)
+
+        assert facts[1:3] == [
+            "P5 scored for Rapide Oued ZEM (10').",
+            "P6 scored for Wydad AC (75').",
+        ]
+        assert not any("penalty" in fact for fact in facts[1:])
+
+    def test_unfinished_match(self):
+        game_data = create_sample_game_data()
+        game_data["response"][0]["fixture"]["status"]["short"] = "2H"
+
+        assert extract_match_facts(game_data)[0] == "The score was Rapide Oued ZEM 1-2 Wydad AC (status: 2H)."
+
+    def test_awarded_and_walkover_results_are_final(self):
+        game_data = create_sample_game_data()
+        game_data["response"][0]["fixture"]["status"]["short"] = "AWD"
+        game_data["response"][0]["goals"] = {"home": 0, "away": 3}
+
+        assert extract_match_facts(game_data)[0] == "Wydad AC won 3-0 away at Rapide Oued ZEM (awarded)."
+
+        game_data["response"][0]["fixture"]["status"]["short"] = "WO"
+        assert extract_match_facts(game_data)[0] == "Wydad AC won 3-0 away at Rapide Oued ZEM (walkover)."
+
+    def test_error_and_empty_payloads(self):
+        assert extract_match_facts({"error": "boom"}) == []
+        assert extract_match_facts({"response": []}) == []
+        assert extract_match_facts(None) == []
+
+
+class TestResearcherStorylines:
+    @pytest.mark.asyncio
+    async def test_rules_mode_skips_the_model(self):
+        from scriber_agents.researcher import ResearchAgent
+
+        with patch("scriber_agents.researcher.Runner.run", new=AsyncMock()) as run:
+            storylines = await ResearchAgent({}).get_storyline_from_game_data(create_sample_game_data())
+
+        run.assert_not_awaited()
+        assert storylines[0] == "Wydad AC won 2-1 away at Rapide Oued ZEM (half-time: 0-1)."
+
+    @pytest.mark.asyncio
+    async def test_llm_mode_and_fallback(self):
+        from scriber_agents.researcher import ResearchAgent, Storylines
+
+        result = Mock(final_output=Storylines(storylines=["From the model", " "]))
+        with patch("scriber_agents.researcher.Runner.run", new=AsyncMock(return_value=result)) as run:
+            llm = await ResearchAgent({"storyline_mode": "llm"}).get_storyline_from_game_data(
+                create_sample_game_data())
+            fallback = await ResearchAgent({}).get_storyline_from_game_data({"response": []})
+            no_fallback = await ResearchAgent({"storyline_llm_fallback": False}).get_storyline_from_game_data(
+                {"response": []})
+
+        assert run.await_count == 2
+        assert llm == fallback == ["From the model"]
+        assert no_fallback == []
@@ -0,0 +1,103 @@
+"""
+Tests for the typed fixture model built from API-Football payloads.
+"""
+
+import dataclasses
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from tools.match_model import Fixture, LineupPlayer, PlayerSeasonStats
+
+
+class TestFixtureModel:
+    def test_builds_records_from_response(self):
+        fixture = Fixture.from_response(create_sample_game_data())
+
+        assert fixture.id == 239625
+        assert fixture.status == "FT"
+        assert (fixture.home.name, fixture.away.name) == ("Rapide Oued ZEM", "Wydad AC")
+        assert fixture.away.winner is True
+        assert fixture.league.round == "Regular Season - 14"
+        assert [lineup.formation for lineup in fixture.lineups] == ["4-3-3", "4-2-3-1"]
+        assert fixture.lineup_for(968).coach == "S. Desabre"
+        assert len(fixture.events) == 3
+
+    def test_bare_fixture_and_empty_response(self):
+        payload = create_sample_game_data()
+        assert Fixture.from_response(payload["response"][0]).id == 239625
+        with pytest.raises(ValueError):
+            Fixture.from_response({"response": []})
+
+    def test_indexes(self):
+        fixture = Fixture.from_response(create_sample_game_data())
+
+        jabrane = fixture.player(36544)
+        assert jabrane == LineupPlayer(
+            id=36544, name="Y. Jabrane", number=5, position="M", grid="3:1",
+            team_id=968, team_name="Wydad AC", starter=True,
+        )
+        assert fixture.player(36756).status == "substitute"
+        assert fixture.player(1) is None
+        assert [event.player_name for event in fixture.events_of("Goal")] == [
+            "Z. El-Moutaraji", "B. El Bahraoui", "Y. Jabrane",
+        ]
+        assert fixture.events_of("Card") == ()
+        assert [(event.minute, event.extra) for event in fixture.events_at(90)] == [(90, 3)]
+        assert fixture.player_events(36544)[0].detail == "Penalty"
+        assert fixture.player_events(36544)[0].to_dict() == {
+            "type": "Goal", "detail": "Penalty", "time": 90, "assist": None,
+        }
+
+    def test_records_are_frozen_and_slotted(self):
+        fixture = Fixture.from_response(create_sample_game_data())
+        player = fixture.player(36544)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            player.name = "Someone else"
+        assert not hasattr(player, "__dict__")
+        assert not hasattr(fixture, "__dict__")
+        # Lineups and the player index share the same records
+        assert fixture.lineup_for(968).start_xi[2] is player
+
+
+class TestPlayerSeasonStats:
+    def test_prefers_the_given_team(self):
+        payload = {"response": [{
+            "player": {"id": 36544, "age": 28, "nationality": "Morocco"},
+            "statistics": [
+                {"team": {"id": 1}, "league": {"name": "Cup"}, "games": {"appearences": 2}},
+                {"team": {"id": 968}, "league": {"name": "Botola Pro"},
+                 "games": {"appearences": 14, "minutes": 1180, "rating": "7.1"},
+                 "goals": {"total": 3, "assists": 2}, "cards": {"yellow": 4, "red": 0}},
+            ],
+        }]}
+
+        stats = PlayerSeasonStats.from_response(payload, team_id=968)
+
+        assert stats.league == "Botola Pro"
+        assert (stats.appearances, stats.goals, stats.assists) == (14, 3, 2)
+        assert PlayerSeasonStats.from_response(payload).league == "Cup"
+
+    def test_missing_payloads(self):
+        assert PlayerSeasonStats.from_response({"error": "boom"}) is None
+        assert PlayerSeasonStats.from_response({"response": []}) is None
+        assert PlayerSeasonStats.from_response(None) is None
+
+
+class TestPipelineExtraction:
+    def test_key_players_reference_event_index(self, pipeline):
+        player_info = pipeline.extract_player_info(create_sample_game_data())
+        team_info = pipeline.extract_team_info(create_sample_game_data())
+
+        assert [p["key_achievement"]["time"] for p in player_info["key_players"]] == [19, 60, 90]
+        assert player_info["all_players"][36549]["match_events"][0]["detail"] == "Normal Goal"
+        assert player_info["home_players"][36756]["status"] == "substitute"
+        assert team_info["away_lineup"]["startXI"][0] == {
+            "player": {"id": 2703, "name": "A. Tagnaouti", "number": 26, "pos": "G", "grid": "1:1"},
+        }
+        assert pipeline.extract_team_info({"response": []}) == {"error": "No response data available"}
@@ -0,0 +1,129 @@
+"""
+Tests for the in-process metrics registry and the pipeline metrics it renders.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.response_cache import ResponseCache
+from utils.metrics import (
+    CACHE_LOOKUPS,
+    LLM_REQUESTS,
+    LLM_TOKENS,
+    STAGE_DURATION,
+    STAGES_IN_FLIGHT,
+    MetricsRegistry,
+    record_token_usage,
+)
+from utils.stage_graph import StageError, StageGraph
+
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge_render(self):
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls made.", ["endpoint"])
+        in_flight = registry.gauge("in_flight", "Work in flight.")
+
+        calls.inc(endpoint="fixtures")
+        calls.inc(2, endpoint="teams")
+        with in_flight.track():
+            assert in_flight.value() == 1
+
+        assert registry.render().splitlines() == [
+            "# HELP calls_total Calls made.",
+            "# TYPE calls_total counter",
+            'calls_total{endpoint="fixtures"} 1',
+            'calls_total{endpoint="teams"} 2',
+            "# HELP in_flight Work in flight.",
+            "# TYPE in_flight gauge",
+            "in_flight 0",
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=[0.1, 1])
+
+        latency.observe(0.05, stage="a")
+        latency.observe(0.5, stage="a")
+        latency.observe(5, stage="a")
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{stage="a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{stage="a",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{stage="a"} 5.55' in lines
+        assert 'latency_seconds_count{stage="a"} 3' in lines
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("c_total", "C.", ["name"])
+        counter.inc(name='say "hi"\n')
+
+        assert 'c_total{name="say \\"hi\\"\\n"} 1' in registry.render()
+
+    def test_labels_must_match(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("c_total", "C.", ["name"])
+
+        with pytest.raises(ValueError):
+            counter.inc(other="x")
+        with pytest.raises(ValueError):
+            counter.inc(-1, name="x")
+        with pytest.raises(ValueError):
+            registry.counter("c_total", "Again.")
+
+
+class TestPipelineMetrics:
+    @pytest.mark.asyncio
+    async def test_stage_graph_records_stage_latency(self):
+        async def boom(a):
+            raise RuntimeError("boom")
+
+        graph = StageGraph().add("metrics_a", lambda: 1).add("metrics_b", boom, depends_on=["metrics_a"])
+        ok_before = STAGE_DURATION.count(stage="metrics_a", status="ok")
+        failed_before = STAGE_DURATION.count(stage="metrics_b", status="failed")
+
+        with pytest.raises(StageError):
+            await graph.run()
+
+        assert STAGE_DURATION.count(stage="metrics_a", status="ok") == ok_before + 1
+        assert STAGE_DURATION.count(stage="metrics_b", status="failed") == failed_before + 1
+        assert STAGES_IN_FLIGHT.value(stage="metrics_b") == 0
+
+    def test_record_token_usage(self):
+        usage = SimpleNamespace(requests=2, input_tokens=120, output_tokens=30)
+        before = LLM_TOKENS.value(agent="Metrics Test", type="input")
+
+        record_token_usage("Metrics Test", SimpleNamespace(context_wrapper=SimpleNamespace(usage=usage)))
+        record_token_usage("Metrics Test", object())  # no usage: ignored
+
+        assert LLM_TOKENS.value(agent="Metrics Test", type="input") == before + 120
+        assert LLM_TOKENS.value(agent="Metrics Test", type="output") >= 30
+        assert LLM_REQUESTS.value(agent="Metrics Test") >= 2
+
+    @pytest.mark.asyncio
+    async def test_cache_lookups_by_tier(self, tmp_path):
+        path = str(tmp_path / "api.sqlite3")
+        writer = ResponseCache(path)
+        await writer.set(("team", "33", None), "team", {"response": [{"team": {"id": 33}}]})
+        writer.close()
+        lookups = [("memory", "miss"), ("memory", "hit"), ("sqlite", "hit"), ("sqlite", "miss")]
+        before = {(tier, result): CACHE_LOOKUPS.value(tier=tier, result=result) for tier, result in lookups}
+
+        cache = ResponseCache(path, memory_limit_bytes=1024 * 1024)
+        await cache.get(("team", "33", None))
+        await cache.get(("team", "33", None))
+        await cache.get(("team", "34", None))
+
+        def delta(tier, result):
+            return CACHE_LOOKUPS.value(tier=tier, result=result) - before[(tier, result)]
+
+        assert delta("memory", "miss") == 2
+        assert delta("memory", "hit") == 1
+        assert delta("sqlite", "hit") == 1
+        assert delta("sqlite", "miss") == 1
@@ -0,0 +1,152 @@
+"""
+Tests for batch recap generation on AgentPipeline.
+"""
+
+import asyncio
+import copy
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+
+
+@pytest.fixture
+def pipeline_env(pipeline_env):
+    pipeline_env.setenv("RECAP_CONCURRENCY", "2")
+    return pipeline_env
+
+
+class RecapProbe:
+    """Stand-in for generate_game_recap with per-game delays."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, game_id, priority=None):
+        self.started.append(game_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(game_id, 0.01))
+            return {"success": True, "game_id": game_id}
+        except asyncio.CancelledError:
+            self.cancelled.append(game_id)
+            raise
+        finally:
+            self.active -= 1
+
+
+class TestBatchRecaps:
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order_under_cap(self, pipeline):
+        probe = RecapProbe({"1": 0.08, "2": 0.01, "3": 0.01, "4": 0.01})
+        pipeline.generate_game_recap = probe
+
+        order = [result["game_id"] async for result in pipeline.generate_game_recaps(["1", "2", "3", "2", "4"])]
+
+        assert order == ["2", "3", "4", "1"]
+        assert probe.peak == 2
+        assert sorted(probe.started) == ["1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_explicit_concurrency_overrides_default(self, pipeline):
+        probe = RecapProbe({})
+        pipeline.generate_game_recap = probe
+
+        results = [r async for r in pipeline.generate_game_recaps([str(i) for i in range(6)], concurrency=4)]
+
+        assert len(results) == 6
+        assert probe.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_closing_iterator_cancels_running_recaps(self, pipeline):
+        probe = RecapProbe({"slow": 1.0})
+        pipeline.generate_game_recap = probe
+
+        stream = pipeline.generate_game_recaps(["fast", "slow", "never"])
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first["game_id"] == "fast"
+        assert "slow" in probe.cancelled
+        assert probe.active == 0
+
+
+def matchday_fixture(fixture_id, home_id, away_id, status="FT"):
+    item = copy.deepcopy(create_sample_game_data()["response"][0])
+    item["fixture"]["id"] = fixture_id
+    item["fixture"]["status"]["short"] = status
+    item["teams"]["home"]["id"] = home_id
+    item["teams"]["away"]["id"] = away_id
+    return item
+
+
+class TestMatchdayRecaps:
+    @pytest.mark.asyncio
+    async def test_matchday_fetches_fixtures_and_teams_once(self, pipeline):
+        fixtures = [matchday_fixture(1, 10, 11), matchday_fixture(2, 12, 10),
+                    matchday_fixture(3, 13, 14, status="NS")]
+        calls = []
+
+        async def api(endpoint, params):
+            calls.append((endpoint, dict(params)))
+            if endpoint == "fixtures" and "ids" in params:
+                ids = params["ids"].split("-")
+                return {"errors": [], "response": [f for f in fixtures if str(f["fixture"]["id"]) in ids]}
+            if endpoint == "fixtures":
+                return {"errors": [], "response": fixtures}
+            if endpoint == "teams":
+                return {"errors": [], "response": [{"team": {"id": int(params["id"])}}]}
+            raise AssertionError(f"unexpected request {endpoint}")
+
+        async def no_players(player_info, season):
+            return {}
+
+        async def storylines(*args):
+            return ["storyline"]
+
+        team_details = {}
+
+        async def write(game_info, research):
+            return f"article {game_info['response'][0]['fixture']['id']}"
+
+        pipeline.collect_enhanced_player_data = no_players
+        pipeline.researcher.get_storyline_from_game_data = storylines
+        pipeline.researcher.get_performance_from_player_game_data = storylines
+
+        async def history(enhanced_teams):
+            team_details[enhanced_teams["home_team"]["id"]] = enhanced_teams["enhanced_data"]
+            return ["history"]
+
+        pipeline.researcher.get_history_from_team_data = history
+        pipeline.writer.generate_game_recap = write
+
+        with patch("tools.sports_apis.APIFootballClient.request", side_effect=api):
+            results = [r async for r in pipeline.generate_matchday_recaps(39, "2024-01-15")]
+
+        assert sorted(r["content"] for r in results) == ["article 1", "article 2"]
+        assert calls[0] == ("fixtures", {"league": 39, "season": 2024, "date": "2024-01-15"})
+        assert calls[1] == ("fixtures", {"ids": "1-2"})
+        team_calls = sorted(params["id"] for endpoint, params in calls if endpoint == "teams")
+        assert team_calls == ["10", "11", "12"]
+        assert team_details[12]["away_team_detailed"]["response"][0]["team"]["id"] == 10
+
+    @pytest.mark.asyncio
+    async def test_matchday_without_finished_fixtures_yields_nothing(self, pipeline):
+        async def api(endpoint, params):
+            return {"errors": [], "response": [matchday_fixture(1, 10, 11, status="NS")]}
+
+        with patch("tools.sports_apis.APIFootballClient.request", side_effect=api) as mock_request:
+            results = [r async for r in pipeline.generate_matchday_recaps(39, "2024-01-15")]
+
+        assert results == []
+        assert mock_request.call_count == 1
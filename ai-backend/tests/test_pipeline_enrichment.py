@@ -0,0 +1,113 @@
+"""
+Tests for the concurrent team/player enrichment stage of AgentPipeline.
+
+The collector is replaced with async mocks so the tests measure fan-out,
+deduplication and failure isolation without touching API-Football.
+"""
+
+import asyncio
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from tools.match_model import Fixture
+
+
+@pytest.fixture
+def pipeline_env(pipeline_env):
+    pipeline_env.setenv("ENRICHMENT_CONCURRENCY", "2")
+    return pipeline_env
+
+
+def sample_with_brace():
+    """Sample fixture where Z. El-Moutaraji scores twice."""
+    data = create_sample_game_data()
+    events = data["response"][0]["events"]
+    brace = copy.deepcopy(events[0])
+    brace["time"]["elapsed"] = 75
+    events.append(brace)
+    return data
+
+
+class ConcurrencyProbe:
+    """Async side effect that records peak concurrency and call arguments."""
+
+    def __init__(self, fail_ids=()):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.fail_ids = set(fail_ids)
+
+    async def __call__(self, resource_id, *args):
+        self.calls.append(resource_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if resource_id in self.fail_ids:
+                raise ValueError(f"boom {resource_id}")
+            return {"response": [{"id": resource_id}]}
+        finally:
+            self.active -= 1
+
+
+class TestEnhancedPlayerData:
+    @pytest.mark.asyncio
+    async def test_players_fetched_once_with_bounded_concurrency(self, pipeline):
+        probe = ConcurrencyProbe()
+        pipeline.collector.collect_player_data = probe
+        fixture = Fixture.from_response(sample_with_brace())
+
+        result = await pipeline.collect_enhanced_player_data(fixture, 2019)
+
+        assert len(probe.calls) == len(set(probe.calls))
+        assert probe.peak <= 2
+        key_ids = [p["id"] for p in result["enhanced_key_players"]]
+        assert key_ids == [36549, 36704, 36544]
+        brace_scorer = result["enhanced_key_players"][0]
+        assert [a["time"] for a in brace_scorer["key_achievements"]] == [19, 75]
+        assert brace_scorer["name"] == "Z. El-Moutaraji"
+        assert [e["time"] for e in brace_scorer["match_events"]] == [19, 75]
+        assert len(result["sample_players_detailed"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_player_failure_is_isolated(self, pipeline):
+        probe = ConcurrencyProbe(fail_ids={"36704", "152487"})
+        pipeline.collector.collect_player_data = probe
+        fixture = Fixture.from_response(create_sample_game_data())
+
+        result = await pipeline.collect_enhanced_player_data(fixture, 2019)
+
+        by_id = {p["id"]: p for p in result["enhanced_key_players"]}
+        assert by_id[36704]["detailed_data"] == {"error": "boom 36704"}
+        assert by_id[36549]["detailed_data"]["response"][0]["id"] == "36549"
+        sample_ids = [p["id"] for p in result["sample_players_detailed"]]
+        assert 152487 not in sample_ids
+        assert len(sample_ids) == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_season(self, pipeline):
+        fixture = Fixture.from_response(create_sample_game_data())
+        result = await pipeline.collect_enhanced_player_data(fixture, None)
+        assert "error" in result
+
+
+class TestEnhancedTeamData:
+    @pytest.mark.asyncio
+    async def test_teams_fetched_concurrently(self, pipeline):
+        probe = ConcurrencyProbe(fail_ids={"968"})
+        pipeline.collector.collect_team_data = probe
+        fixture = Fixture.from_response(create_sample_game_data())
+
+        result = await pipeline.collect_enhanced_team_data(fixture)
+
+        assert probe.peak == 2
+        assert result["away_lineup"] == pipeline.extract_team_info(create_sample_game_data())["away_lineup"]
+        enhanced = result["enhanced_data"]
+        assert enhanced["home_team_detailed"]["response"][0]["id"] == "967"
+        assert enhanced["away_team_detailed"] == {"error": "boom 968"}
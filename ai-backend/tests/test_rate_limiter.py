@@ -0,0 +1,145 @@
+"""
+Tests for the header-driven, priority-aware API rate limiter.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.http_transport import RapidAPITransport
+from tools.rate_limiter import (
+    QuotaExhaustedError,
+    RateLimitScheduler,
+    priority_scope,
+    request_priority,
+)
+
+
+class TestRateLimitScheduler:
+    @pytest.mark.asyncio
+    async def test_queued_requests_served_by_priority(self):
+        scheduler = RateLimitScheduler(requests_per_minute=6000)
+        scheduler.tokens = 0
+        order = []
+
+        async def request(priority):
+            await scheduler.acquire(priority)
+            order.append(priority)
+
+        tasks = [asyncio.create_task(request(p)) for p in ("backfill", "normal", "live")]
+        await asyncio.gather(*tasks)
+
+        assert order == ["live", "normal", "backfill"]
+        assert scheduler.stats()["queued"] == 3
+
+    @pytest.mark.asyncio
+    async def test_priority_comes_from_context(self):
+        scheduler = RateLimitScheduler(requests_per_minute=6000)
+        scheduler.tokens = 0
+        order = []
+
+        async def request(priority):
+            with priority_scope(priority):
+                await scheduler.acquire()
+                order.append(request_priority.get())
+
+        await asyncio.gather(request("low"), request("high"))
+
+        assert order == ["high", "low"]
+        assert request_priority.get() == "normal"
+
+    def test_headers_update_bucket(self):
+        scheduler = RateLimitScheduler(requests_per_minute=30)
+        scheduler.observe({
+            "X-RateLimit-Limit": "300",
+            "X-RateLimit-Remaining": "5",
+            "x-ratelimit-requests-limit": "7500",
+            "x-ratelimit-requests-remaining": "7000",
+        }, 200)
+
+        stats = scheduler.stats()
+        assert stats["requests_per_minute"] == 300
+        assert stats["tokens"] <= 5.1
+        assert stats["daily_limit"] == 7500
+        assert stats["daily_remaining"] == 7000
+
+    @pytest.mark.asyncio
+    async def test_exhausted_daily_quota_fails_fast(self):
+        scheduler = RateLimitScheduler()
+        scheduler.observe({"x-ratelimit-requests-remaining": "0"}, 200)
+
+        with pytest.raises(QuotaExhaustedError):
+            await scheduler.acquire()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_quota_expires_at_the_utc_reset(self):
+        now = {"time": 1_700_000_000.0 - 1_700_000_000 % 86400 + 23 * 3600}  # 23:00 UTC
+        scheduler = RateLimitScheduler(wall_clock=lambda: now["time"])
+        scheduler.observe({"x-ratelimit-requests-remaining": "0"}, 200)
+
+        now["time"] += 3599
+        with pytest.raises(QuotaExhaustedError):
+            await scheduler.acquire()
+
+        now["time"] += 1
+        await scheduler.acquire()
+        assert scheduler.stats()["daily_remaining"] is None
+
+    @pytest.mark.asyncio
+    async def test_reserve_is_kept_for_priority_work(self):
+        scheduler = RateLimitScheduler(reserve=50)
+        scheduler.observe({"x-ratelimit-requests-remaining": "40"}, 200)
+
+        with pytest.raises(QuotaExhaustedError):
+            await scheduler.acquire("backfill")
+        await scheduler.acquire("high")
+        assert scheduler.stats()["rejected"] == 1
+
+    def test_429_drains_bucket(self):
+        scheduler = RateLimitScheduler(requests_per_minute=30)
+        scheduler.observe({}, 429)
+        assert scheduler.tokens <= 0
+        assert scheduler.stats()["throttled"] == 1
+
+
+@pytest_asyncio.fixture
+async def throttling_server():
+    calls = {"count": 0}
+
+    async def teams(request):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return web.json_response({"message": "Too many requests"}, status=429,
+                                     headers={"X-RateLimit-Remaining": "0"})
+        return web.json_response({"response": []}, headers={
+            "X-RateLimit-Limit": "6000", "x-ratelimit-requests-remaining": "99"})
+
+    app = web.Application()
+    app.router.add_get("/v3/teams", teams)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+
+class TestTransportRateLimiting:
+    @pytest.mark.asyncio
+    async def test_transport_retries_after_429_and_reads_headers(self, throttling_server):
+        scheduler = RateLimitScheduler(requests_per_minute=6000)
+        transport = RapidAPITransport(api_key="test_key", base_url=str(throttling_server.make_url("/v3")),
+                                      scheduler=scheduler)
+        async with transport:
+            response = await transport.get("teams", {"id": 33})
+
+        assert response.ok
+        assert throttling_server.calls["count"] == 2
+        assert scheduler.stats()["daily_remaining"] == 99
+        assert scheduler.stats()["throttled"] == 1
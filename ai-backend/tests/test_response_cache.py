@@ -0,0 +1,215 @@
+"""
+Tests for the persistent API-Football response cache and its use by the collector.
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scriber_agents.data_collector import DataCollectorAgent
+from tools.response_cache import CacheEntry, CachePolicy, MemoryTier, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fixture_payload(status):
+    return {"get": "fixtures", "parameters": {"id": "1"}, "errors": [], "results": 1,
+            "paging": {"current": 1, "total": 1},
+            "response": [{"fixture": {"id": 1, "status": {"short": status}}}]}
+
+
+TEAM_PAYLOAD = {"get": "teams", "parameters": {"id": "33"}, "errors": [], "results": 1,
+                "paging": {"current": 1, "total": 1},
+                "response": [{"team": {"id": 33, "name": "Manchester United"}}]}
+
+
+class TestCachePolicy:
+    def test_fixture_ttls_follow_status(self):
+        policy = CachePolicy()
+        assert policy.ttl_for("fixture", fixture_payload("FT")) is None
+        assert policy.ttl_for("fixture", fixture_payload("2H")) == policy.fixture_live_ttl
+        assert policy.ttl_for("fixture", fixture_payload("NS")) == policy.fixture_scheduled_ttl
+
+    def test_resource_ttls(self):
+        policy = CachePolicy()
+        assert policy.ttl_for("team", TEAM_PAYLOAD) == policy.team_ttl
+        assert policy.ttl_for("player", {"response": [{}]}) == policy.player_ttl
+        assert policy.ttl_for("team", {"response": []}) == policy.negative_ttl
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_round_trip_and_stats(self):
+        cache = ResponseCache()
+        assert await cache.get(("team", "33", None)) is None
+
+        await cache.set(("team", "33", None), "team", TEAM_PAYLOAD)
+        entry = await cache.get(("team", "33", None))
+
+        assert entry.payload == TEAM_PAYLOAD
+        assert not entry.negative
+        stats = await cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["bytes_written"] == stats["bytes_read"] > 0
+        assert stats["by_resource"]["team"]["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_live_fixture_expires_finished_does_not(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        await cache.set(("fixture", "1", None), "fixture", fixture_payload("1H"))
+        await cache.set(("fixture", "2", None), "fixture", fixture_payload("FT"))
+
+        clock.now += 3600 * 24 * 365
+        assert await cache.get(("fixture", "1", None)) is None
+        assert await cache.get(("fixture", "2", None)) is not None
+        assert (await cache.stats())["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_negative_entries(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        await cache.set_negative(("player", "9", "2023"), "player", "status 404")
+
+        entry = await cache.get(("player", "9", "2023"))
+        assert entry.negative and entry.error == "status 404"
+        assert (await cache.stats())["negative_hits"] == 1
+
+        clock.now += cache.policy.negative_ttl + 1
+        assert await cache.get(("player", "9", "2023")) is None
+        assert await cache.purge_expired() == 0
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache" / "api.sqlite3")
+        first = ResponseCache(path)
+        await first.set(("team", "33", None), "team", TEAM_PAYLOAD)
+        first.close()
+
+        second = ResponseCache(path)
+        entry = await second.get(("team", "33", None))
+        assert entry.payload["response"][0]["team"]["name"] == "Manchester United"
+
+
+class TestMemoryTier:
+    def test_evicts_by_bytes_in_lru_order(self):
+        tier = MemoryTier(max_bytes=100)
+        tier.put("a", CacheEntry(payload={"a": 1}), 40, None)
+        tier.put("b", CacheEntry(payload={"b": 1}), 40, None)
+        assert tier.get("a") is not None  # "b" is now least recently used
+
+        tier.put("c", CacheEntry(payload={"c": 1}), 40, None)
+
+        assert tier.get("b") is None
+        assert tier.get("a") is not None and tier.get("c") is not None
+        stats = tier.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] == 80 <= stats["max_bytes"]
+
+    def test_oversized_entry_is_rejected(self):
+        tier = MemoryTier(max_bytes=100)
+        tier.put("small", CacheEntry(payload={}), 10, None)
+        tier.put("huge", CacheEntry(payload={}), 500, None)
+
+        assert tier.get("huge") is None
+        assert tier.get("small") is not None
+        assert tier.stats()["rejected"] == 1
+
+    def test_respects_expiry(self):
+        clock = FakeClock()
+        tier = MemoryTier(max_bytes=100, clock=clock)
+        tier.put("live", CacheEntry(payload={}), 10, clock.now + 15)
+        clock.now += 16
+        assert tier.get("live") is None
+        assert tier.stats()["bytes"] == 0
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_memory_tier_serves_a_copy(self):
+        cache = ResponseCache(memory_limit_bytes=1024 * 1024)
+        await cache.set(("team", "33", None), "team", TEAM_PAYLOAD)
+
+        entry = await cache.get(("team", "33", None))
+        entry.payload["response"].clear()
+
+        assert (await cache.get(("team", "33", None))).payload == TEAM_PAYLOAD
+        stats = await cache.stats()
+        assert stats["memory"]["hits"] == 2
+        assert stats["bytes_read"] == 0  # never touched SQLite
+
+    @pytest.mark.asyncio
+    async def test_sqlite_hit_is_promoted(self, tmp_path):
+        path = str(tmp_path / "api.sqlite3")
+        writer = ResponseCache(path)
+        await writer.set(("team", "33", None), "team", TEAM_PAYLOAD)
+        writer.close()
+
+        cache = ResponseCache(path, memory_limit_bytes=1024 * 1024)
+        first = await cache.get(("team", "33", None))
+        second = await cache.get(("team", "33", None))
+
+        assert second.payload == first.payload and second.payload is not first.payload
+        memory = (await cache.stats())["memory"]
+        assert memory == {**memory, "hits": 1, "misses": 1, "entries": 1}
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_only_touched_on_the_loop_thread(self, tmp_path):
+        path = str(tmp_path / "api.sqlite3")
+        writer = ResponseCache(path)
+        await writer.set(("team", "33", None), "team", TEAM_PAYLOAD)
+        writer.close()
+
+        cache = ResponseCache(path, memory_limit_bytes=1024 * 1024)
+        threads = []
+        put = cache.memory.put
+
+        def record_put(*args):
+            threads.append(threading.get_ident())
+            put(*args)
+
+        cache.memory.put = record_put
+        await cache.get(("team", "33", None))
+
+        assert threads == [threading.get_ident()]
+        stats = await cache.stats()
+        assert stats["hits"] == 1
+        assert stats["bytes_read"] > 0
+
+
+class TestCollectorCaching:
+    @pytest.mark.asyncio
+    async def test_second_collect_makes_no_api_call(self):
+        dc = DataCollectorAgent({}, cache=ResponseCache())
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   return_value=fixture_payload("FT")) as mock_request:
+            first = await dc.collect_game_data("1")
+            second = await dc.collect_game_data("1")
+
+        # One fixture fetch: the fixture plus its two sub-resources
+        assert mock_request.await_count == 3
+        assert first == second
+        assert (await dc.get_stats())["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_are_negatively_cached(self):
+        dc = DataCollectorAgent({}, cache=ResponseCache())
+        with patch("tools.sports_apis.APIFootballClient.request", new_callable=AsyncMock,
+                   side_effect=ValueError("API-Football request failed with status 404")) as mock_request:
+            with pytest.raises(ValueError):
+                await dc.collect_team_data("404")
+            with pytest.raises(ValueError, match="cached"):
+                await dc.collect_team_data("404")
+
+        assert mock_request.await_count == 1
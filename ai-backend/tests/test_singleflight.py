@@ -0,0 +1,95 @@
+"""
+Tests for SingleFlight request coalescing.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_execution(self):
+        flight = SingleFlight()
+        executions = 0
+
+        async def fetch():
+            nonlocal executions
+            executions += 1
+            await asyncio.sleep(0.01)
+            return {"team": 33}
+
+        results = await asyncio.gather(*(flight.do(("team", "33", None), fetch) for _ in range(5)))
+
+        assert executions == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"calls": 5, "executions": 1, "coalesced": 4, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_run_separately(self):
+        flight = SingleFlight()
+
+        async def fetch(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do(("player", "1", "2023"), lambda: fetch(1)),
+            flight.do(("player", "1", "2024"), lambda: fetch(2)),
+        )
+
+        assert results == [1, 2]
+        assert flight.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            return "ok"
+
+        await flight.do("key", fetch)
+        await flight.do("key", fetch)
+
+        assert flight.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared_and_not_cached(self):
+        flight = SingleFlight()
+        attempts = 0
+
+        async def fetch():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("quota exceeded")
+
+        results = await asyncio.gather(flight.do("key", fetch), flight.do("key", fetch),
+                                       return_exceptions=True)
+        assert attempts == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+        with pytest.raises(ValueError):
+            await flight.do("key", fetch)
+        assert attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", fetch))
+        follower = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
@@ -0,0 +1,125 @@
+"""
+Tests for the stage graph scheduler and the recap pipeline built on it.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.test_data_collection import create_sample_game_data
+from utils.stage_graph import StageError, StageGraph
+
+
+async def sleep_then(value, delay=0.05):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestStageGraph:
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        graph = (
+            StageGraph()
+            .add("a", lambda x: sleep_then(x + 1), depends_on=["x"])
+            .add("b", lambda a: sleep_then(a * 2), depends_on=["a"])
+            .add("c", lambda a: sleep_then(a * 3), depends_on=["a"])
+            .add("d", lambda b, c: b + c, depends_on=["b", "c"])
+        )
+
+        start = time.perf_counter()
+        run = await graph.run(x=1)
+        elapsed = time.perf_counter() - start
+
+        assert run.results == {"a": 2, "b": 4, "c": 6, "d": 10}
+        # Critical path is a -> b|c -> d: two sleeps, not three
+        assert elapsed < 0.14
+        assert run.timings["c"].started < run.timings["b"].started + run.timings["b"].duration
+        assert all(t["status"] == "ok" for t in run.timings_dict().values())
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_stages(self):
+        async def boom():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        graph = (
+            StageGraph()
+            .add("slow", lambda: sleep_then("never", delay=1))
+            .add("bad", boom)
+            .add("after", lambda bad: bad, depends_on=["bad"])
+        )
+
+        with pytest.raises(StageError) as exc_info:
+            await graph.run()
+
+        assert exc_info.value.stage == "bad"
+        assert isinstance(exc_info.value.__cause__, ValueError)
+        run = exc_info.value.run
+        assert run.failed_stage == "bad"
+        assert run.timings["slow"].status == "cancelled"
+        assert "after" not in run.timings
+
+    def test_validate_rejects_cycles_and_unknown_dependencies(self):
+        cyclic = StageGraph().add("a", lambda b: b, ["b"]).add("b", lambda a: a, ["a"])
+        with pytest.raises(ValueError, match="cycle"):
+            cyclic.validate()
+        with pytest.raises(ValueError, match="Unknown"):
+            StageGraph().add("a", lambda missing: 1, ["missing"]).validate()
+        assert StageGraph().add("b", lambda a: a, ["a"]).add("a", lambda: 1).validate() == ["a", "b"]
+
+    def test_without_drops_leaf_stages_only(self):
+        graph = StageGraph().add("a", lambda: 1).add("b", lambda a: a, ["a"])
+        assert list(graph.without("b").stages) == ["a"]
+        with pytest.raises(ValueError, match="depends on removed"):
+            graph.without("a")
+
+
+class TestRecapGraph:
+    @pytest.mark.asyncio
+    async def test_game_analysis_does_not_wait_for_enrichment(self, pipeline):
+        game_data = create_sample_game_data()
+        pipeline._collect_game_data = lambda game_id: sleep_then(game_data, 0)
+        pipeline.collect_enhanced_team_data = lambda team_info, team_data=None: sleep_then({"enhanced_data": {}}, 0.1)
+        pipeline.collect_enhanced_player_data = lambda player_info, season: sleep_then({}, 0.1)
+        pipeline.researcher.get_storyline_from_game_data = lambda data: sleep_then(["storyline"], 0.1)
+        pipeline.researcher.get_history_from_team_data = lambda data: sleep_then(["history"], 0.05)
+        pipeline.researcher.get_performance_from_player_game_data = lambda p, g: sleep_then(["performance"], 0.05)
+        received = {}
+
+        async def write(game_info, research):
+            received.update(research)
+            return "article"
+
+        pipeline.writer.generate_game_recap = write
+
+        start = time.perf_counter()
+        result = await pipeline.generate_game_recap("1")
+        elapsed = time.perf_counter() - start
+
+        assert result["success"] is True
+        assert result["content"] == "article"
+        assert received == {"game_analysis": ["storyline"], "historical_context": ["history"],
+                            "player_performance": ["performance"]}
+        timings = result["stage_timings"]
+        assert timings["game_analysis"]["started"] < timings["enhanced_teams"]["duration"]
+        # Critical path: enrichment (0.1) -> history/performance (0.05), not the 0.4 sum
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_is_reported(self, pipeline):
+        async def no_data(game_id):
+            return {"errors": ["Fixture 1 not found"], "results": 0, "response": []}
+
+        pipeline._collect_game_data = no_data
+
+        result = await pipeline.generate_game_recap("1")
+
+        assert result["success"] is False
+        assert "No data available" in result["error"]
+        assert result["metadata"]["error_step"] == "game_data"
+        assert result["metadata"]["stage_timings"]["game_data"]["status"] == "failed"
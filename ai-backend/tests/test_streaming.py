@@ -0,0 +1,170 @@
+"""
+Tests for the writer's structured article and streaming its tokens through the pipeline.
+"""
+
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from agents.stream_events import RawResponsesStreamEvent
+from openai.types.responses import ResponseTextDeltaEvent
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scriber_agents.writer import Article, WriterAgent
+from tests.test_data_collection import create_sample_game_data
+from utils.metrics import RECAPS_IN_FLIGHT
+
+
+def streamed_result(chunks):
+    """Fake RunResultStreaming emitting one text delta event per chunk."""
+    async def stream_events():
+        for index, chunk in enumerate(chunks):
+            yield RawResponsesStreamEvent(data=ResponseTextDeltaEvent(
+                content_index=0, delta=chunk, item_id="msg", logprobs=[], output_index=0,
+                sequence_number=index, type="response.output_text.delta"))
+        yield SimpleNamespace(type="run_item_stream_event")
+
+    return SimpleNamespace(stream_events=stream_events)
+
+
+def valid_article():
+    return ["Headline: A late winner\n", "Introduction: Wydad AC won.\n", "Body: " + "word " * 450 + "\n",
+            "Conclusion: Three points.\n"]
+
+
+class TestWriterStreaming:
+    @pytest.mark.asyncio
+    async def test_tokens_then_validation_verdict(self):
+        writer = WriterAgent({"model": "gpt-4o"})
+        with patch("scriber_agents.writer.Runner.run_streamed", return_value=streamed_result(valid_article())):
+            events = [e async for e in writer.stream_game_recap({}, {})]
+
+        assert [e["event"] for e in events] == ["token", "token", "token", "token", "validation"]
+        assert events[0]["data"] == "Headline: A late winner\n"
+        verdict = events[-1]["data"]
+        assert verdict["valid"] is True
+        assert verdict["word_count"] == 462
+        assert verdict["article"].startswith("Headline: A late winner")
+
+    @pytest.mark.asyncio
+    async def test_invalid_article_is_reported_not_raised(self):
+        writer = WriterAgent({"model": "gpt-4o"})
+        with patch("scriber_agents.writer.Runner.run_streamed", return_value=streamed_result(["Too short"])):
+            events = [e async for e in writer.stream_game_recap({}, {})]
+
+        assert events[-1]["event"] == "validation"
+        assert events[-1]["data"]["valid"] is False
+        assert "missing required sections" in events[-1]["data"]["error"]
+
+
+class TestPipelineStreaming:
+    @pytest.mark.asyncio
+    async def test_research_event_precedes_tokens(self, pipeline):
+        async def returns(value):
+            return value
+
+        pipeline._collect_game_data = lambda game_id: returns(create_sample_game_data())
+        pipeline.collect_enhanced_team_data = lambda team_info, team_data=None: returns({})
+        pipeline.collect_enhanced_player_data = lambda player_info, season: returns({})
+        pipeline.researcher.get_storyline_from_game_data = lambda data: returns(["s"])
+        pipeline.researcher.get_history_from_team_data = lambda data: returns(["h"])
+        pipeline.researcher.get_performance_from_player_game_data = lambda p, g: returns(["p"])
+
+        with patch("scriber_agents.writer.Runner.run_streamed", return_value=streamed_result(valid_article())):
+            events = [e async for e in pipeline.stream_game_recap("1")]
+
+        assert events[0]["event"] == "research"
+        assert "article" not in events[0]["data"]["stage_timings"]
+        assert events[-1]["event"] == "validation"
+        assert events[-1]["data"]["valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_stage_failure_yields_error_event(self, pipeline):
+        async def no_data(game_id):
+            return {"errors": ["Fixture 1 not found"], "results": 0, "response": []}
+
+        pipeline._collect_game_data = no_data
+
+        events = [e async for e in pipeline.stream_game_recap("1")]
+
+        assert events == [{"event": "error", "data": {
+            "stage": "game_data", "error": "No data available for game 1: ['Fixture 1 not found']"}}]
+
+
+    @pytest.mark.asyncio
+    async def test_writer_failure_ends_with_error_event(self, pipeline):
+        async def returns(value):
+            return value
+
+        def failing_stream():
+            async def stream_events():
+                yield RawResponsesStreamEvent(data=ResponseTextDeltaEvent(
+                    content_index=0, delta="Headline: ", item_id="msg", logprobs=[], output_index=0,
+                    sequence_number=0, type="response.output_text.delta"))
+                raise TimeoutError("model timed out")
+
+            return SimpleNamespace(stream_events=stream_events)
+
+        pipeline._collect_game_data = lambda game_id: returns(create_sample_game_data())
+        pipeline.collect_enhanced_team_data = lambda team_info, team_data=None: returns({})
+        pipeline.collect_enhanced_player_data = lambda player_info, season: returns({})
+        pipeline.researcher.get_storyline_from_game_data = lambda data: returns(["s"])
+        pipeline.researcher.get_history_from_team_data = lambda data: returns(["h"])
+        pipeline.researcher.get_performance_from_player_game_data = lambda p, g: returns(["p"])
+        in_flight = RECAPS_IN_FLIGHT.value()
+        seen_in_flight = []
+
+        with patch("scriber_agents.writer.Runner.run_streamed", return_value=failing_stream()):
+            events = []
+            async for event in pipeline.stream_game_recap("1"):
+                seen_in_flight.append(RECAPS_IN_FLIGHT.value())
+                events.append(event)
+
+        assert [e["event"] for e in events] == ["research", "token", "error"]
+        assert events[-1]["data"] == {"stage": "article", "error": "model timed out"}
+        assert seen_in_flight[0] == in_flight + 1
+        assert RECAPS_IN_FLIGHT.value() == in_flight
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_the_stores(self, pipeline_env):
+        from scriber_agents.pipeline import AgentPipeline
+
+        for name in ("API_CACHE_ENABLED", "PIPELINE_CHECKPOINTS_ENABLED", "FIXTURE_ARCHIVE_ENABLED"):
+            pipeline_env.setenv(name, "true")
+        pipeline = AgentPipeline()
+
+        await pipeline.aclose()
+
+        for store in (pipeline.cache, pipeline.checkpoints, pipeline.archive):
+            with pytest.raises(sqlite3.ProgrammingError):
+                store._conn.execute("SELECT 1")
+
+
+class TestArticle:
+    def test_parses_labelled_sections(self):
+        article = Article.from_text("**Headline:** A late winner\n\n[Introduction]\nWydad AC won.\n"
+                                    "Body:\n" + "word " * 420 + "\nConclusion: Three points.")
+
+        assert article.headline == "A late winner"
+        assert article.introduction == "Wydad AC won."
+        assert article.to_text().startswith("A late winner\n\nWydad AC won.\n\nword")
+
+    def test_structural_validation(self):
+        with pytest.raises(ValueError, match="missing required sections: conclusion"):
+            Article(headline="H", introduction="I", body="word " * 450, conclusion=" ")
+        with pytest.raises(ValueError, match="out of bounds"):
+            Article(headline="H", introduction="I", body="Too short", conclusion="C")
+
+    @pytest.mark.asyncio
+    async def test_generate_game_recap_renders_the_article(self):
+        writer = WriterAgent({"model": "gpt-4o"})
+        article = Article(headline="H", introduction="I", body="word " * 450, conclusion="C")
+        with patch("scriber_agents.writer.Runner.run", new=AsyncMock(return_value=Mock(final_output=article))) as run:
+            text = await writer.generate_game_recap(create_sample_game_data(), {})
+
+        assert run.await_args.args[0].output_type is Article
+        assert text == article.to_text()
@@ -5,75 +5,205 @@ This module contains test cases for all tools and utilities in the system.
 Focus: Football (Soccer) only using API-Football from RapidAPI.
 """
 
+import asyncio
+import json
+
 import pytest
 
 from tools.data_validation import DataCleaner, DataValidator
+from tools.http_transport import TransportResponse
 from tools.sports_apis import FOOTBALL_LEAGUES, APIFootballClient
 from tools.web_search import ContentExtractor, WebSearchTool
 
 
+class FakeTransport:
+    """In-memory stand-in for RapidAPITransport serving canned payloads."""
+
+    base_url = "https://api-football-v1.p.rapidapi.com/v3"
+
+    def __init__(self, payloads=None, delay=0.0):
+        self.payloads = payloads or {}
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, endpoint, params=None):
+        self.calls.append((endpoint, dict(params or {})))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        payload = self.payloads.get(endpoint, {"errors": [], "response": []})
+        if callable(payload):
+            payload = payload(params or {})
+        if isinstance(payload, int):
+            return TransportResponse(status=payload, headers={}, body=b"{}")
+        return TransportResponse(status=200, headers={}, body=json.dumps(payload).encode())
+
+
 class TestAPIFootballClient:
     """Test cases for APIFootballClient (RapidAPI)."""
 
     @pytest.fixture
-    def api_football_client(self):
+    def transport(self):
+        """Fixture for a canned API-Football transport."""
+        return FakeTransport()
+
+    @pytest.fixture
+    def api_football_client(self, transport):
         """Fixture for APIFootballClient instance."""
-        return APIFootballClient(api_key="test_rapidapi_key")
+        return APIFootballClient(api_key="test_rapidapi_key", transport=transport)
 
     @pytest.mark.asyncio
-    async def test_get_fixtures(self, api_football_client):
+    async def test_get_fixtures(self, api_football_client, transport):
         """Test collecting match data from API-Football."""
         league_id = FOOTBALL_LEAGUES["premier_league"]  # 39
         season = 2024
         date = "2024-01-15"
+        transport.payloads["fixtures"] = {"errors": [], "response": [{"fixture": {"id": 1}}]}
 
         result = await api_football_client.get_fixtures(league_id, season, date)
 
-        # TODO: Add actual assertions when implementation is complete
-        assert isinstance(result, list)
+        assert result == [{"fixture": {"id": 1}}]
+        assert transport.calls == [
+            ("fixtures", {"league": 39, "season": 2024, "date": "2024-01-15"})
+        ]
 
     @pytest.mark.asyncio
-    async def test_get_teams(self, api_football_client):
+    async def test_get_teams(self, api_football_client, transport):
         """Test getting teams from API-Football."""
         league_id = FOOTBALL_LEAGUES["premier_league"]
         season = 2024
 
         result = await api_football_client.get_teams(league_id, season)
 
-        # TODO: Add actual assertions when implementation is complete
         assert isinstance(result, list)
+        assert transport.calls == [("teams", {"league": 39, "season": 2024})]
 
     @pytest.mark.asyncio
-    async def test_get_league_standings(self, api_football_client):
+    async def test_get_league_standings(self, api_football_client, transport):
         """Test getting league standings from API-Football."""
         league_id = FOOTBALL_LEAGUES["premier_league"]
         season = 2024
+        transport.payloads["standings"] = {
+            "errors": [],
+            "response": [{"league": {"id": 39, "standings": [[{"rank": 1}]]}}],
+        }
 
         result = await api_football_client.get_league_standings(league_id, season)
 
-        # TODO: Add actual assertions when implementation is complete
-        assert isinstance(result, dict)
+        assert result["standings"][0][0]["rank"] == 1
 
     @pytest.mark.asyncio
-    async def test_get_match_statistics(self, api_football_client):
+    async def test_get_match_statistics(self, api_football_client, transport):
         """Test getting match statistics from API-Football."""
         fixture_id = 12345
+        transport.payloads["fixtures/statistics"] = {
+            "errors": [],
+            "response": [
+                {
+                    "team": {"id": 33, "name": "Manchester United"},
+                    "statistics": [
+                        {"type": "Ball Possession", "value": "55%"},
+                        {"type": "Total Shots", "value": 14},
+                    ],
+                }
+            ],
+        }
 
         result = await api_football_client.get_match_statistics(fixture_id)
 
-        # TODO: Add actual assertions when implementation is complete
-        assert isinstance(result, dict)
+        assert result == {
+            "Manchester United": {"Ball Possession": "55%", "Total Shots": 14}
+        }
 
     @pytest.mark.asyncio
-    async def test_get_players(self, api_football_client):
+    async def test_get_players(self, api_football_client, transport):
         """Test getting players from API-Football."""
         team_id = 50  # Manchester City
         season = 2024
+        transport.payloads["players"] = lambda params: {
+            "errors": [],
+            "paging": {"current": params.get("page", 1), "total": 2},
+            "response": [{"player": {"id": params.get("page", 1)}}],
+        }
 
         result = await api_football_client.get_players(team_id, season)
 
-        # TODO: Add actual assertions when implementation is complete
-        assert isinstance(result, list)
+        assert [p["player"]["id"] for p in result] == [1, 2]
+        assert transport.calls[0] == ("players", {"team": 50, "season": 2024})
+
+    @pytest.mark.asyncio
+    async def test_pages_are_prefetched_while_consumed(self, api_football_client, transport):
+        """Page N+1 is already requested while the caller processes page N."""
+        transport.payloads["fixtures"] = lambda params: {
+            "errors": [],
+            "paging": {"current": params.get("page", 1), "total": 3},
+            "response": [{"fixture": {"id": params.get("page", 1) * 10 + i}} for i in range(2)],
+        }
+        requested_while_consuming = []
+
+        ids = []
+        async for fixture in api_football_client.iter_fixtures(39, 2024):
+            await asyncio.sleep(0)
+            requested_while_consuming.append(len(transport.calls))
+            ids.append(fixture["fixture"]["id"])
+
+        assert ids == [10, 11, 20, 21, 30, 31]
+        assert requested_while_consuming[0] == 2
+        assert [params.get("page") for _, params in transport.calls] == [None, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_prefetch(self, api_football_client, transport):
+        transport.delay = 0.05
+        transport.payloads["players"] = lambda params: {
+            "errors": [],
+            "paging": {"current": params.get("page", 1), "total": 5},
+            "response": [{"player": {"id": params.get("page", 1)}}],
+        }
+
+        stream = api_football_client.iter_players(50, 2024)
+        first = await stream.__anext__()
+        await asyncio.sleep(0)  # let the page 2 prefetch start
+        await stream.aclose()
+
+        assert first["player"]["id"] == 1
+        assert len(transport.calls) == 2
+        assert transport.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_api_errors_raise(self, api_football_client, transport):
+        """API-Football reports failures in the errors field, not the status."""
+        transport.payloads["teams"] = {"errors": {"token": "Invalid key"}, "response": []}
+
+        with pytest.raises(ValueError, match="Invalid key"):
+            await api_football_client.get_teams(39, 2024)
+
+    @pytest.mark.asyncio
+    async def test_get_fixture_details_fans_out(self, transport):
+        """Sub-resources are fetched concurrently and merged into the fixture."""
+        transport.delay = 0.01
+        transport.payloads.update({
+            "fixtures": {"errors": [], "response": [{"fixture": {"id": 7}, "events": []}]},
+            "fixtures/statistics": 500,
+            "fixtures/events": {"errors": [], "response": [{"type": "Goal"}]},
+        })
+        client = APIFootballClient(transport=transport)
+
+        details = await client.get_fixture_details(7)
+
+        assert transport.max_in_flight == 3
+        assert details["fixture"]["id"] == 7
+        assert details["events"] == [{"type": "Goal"}]
+        assert details["statistics"] == []  # failed sub-resource degrades to empty
+        assert "players" not in details
+
+    @pytest.mark.asyncio
+    async def test_get_fixture_details_unknown_fixture(self, api_football_client):
+        assert await api_football_client.get_fixture_details(1) == {}
 
     def test_football_leagues_constants(self):
         """Test that football league constants are properly defined."""
@@ -0,0 +1,138 @@
+"""
+Checkpoint Store Module
+
+This module persists the output of individual pipeline stages in SQLite so a
+failed run can be retried from the first stage that did not complete instead
+of starting over. Checkpoints are keyed by run (e.g. "recap:<game_id>") and
+stage, and carry a version string; a checkpoint saved under a different
+version is ignored on load.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_key TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    version TEXT NOT NULL,
+    body BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (run_key, stage)
+)
+"""
+
+
+class CheckpointStore:
+    """
+    SQLite-backed store of JSON-serializable stage results.
+
+    SQLite calls run in a worker thread so the event loop is never blocked on
+    disk I/O; the counters are only updated on the event loop. Use ``":memory:"`` as the path for a process-local store.
+    Checkpoints older than ``ttl`` seconds are treated as missing.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        self._counters = {"restored": 0, "stale": 0, "saved": 0}
+
+    async def load(self, run_key: str, versions: Mapping[str, str]) -> dict[str, Any]:
+        """
+        Return the checkpointed results of a run whose version still matches.
+
+        Args:
+            run_key: Identity of the run (e.g. "recap:1035037")
+            versions: Current version of each stage
+
+        Returns:
+            Mapping of stage name to its saved result
+        """
+        restored, stale = await asyncio.to_thread(self._load, run_key, dict(versions))
+        self._counters["stale"] += stale
+        self._counters["restored"] += len(restored)
+        return restored
+
+    async def save(self, run_key: str, stage: str, version: str, result: Any) -> None:
+        """Persist one stage's result, replacing any earlier checkpoint."""
+        body = json.dumps(result, separators=(",", ":")).encode("utf-8")
+        await asyncio.to_thread(self._save, run_key, stage, version, body)
+        self._counters["saved"] += 1
+
+    async def clear(self, run_key: str) -> None:
+        """Forget every checkpoint of a run."""
+        await asyncio.to_thread(self._clear, run_key)
+
+    async def stats(self) -> dict[str, Any]:
+        runs, entries = await asyncio.to_thread(self._count)
+        return {**self._counters, "runs": runs, "entries": entries}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _count(self) -> tuple[int, int]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(DISTINCT run_key), COUNT(*) FROM checkpoints"
+            ).fetchone()
+
+    def _load(self, run_key: str, versions: dict[str, str]) -> tuple[dict[str, Any], int]:
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, version, body, expires_at FROM checkpoints WHERE run_key = ?",
+                (run_key,),
+            ).fetchall()
+        restored = {}
+        stale = 0
+        for stage, version, body, expires_at in rows:
+            if versions.get(stage) != version or (
+                expires_at is not None and expires_at <= now
+            ):
+                stale += 1
+                continue
+            restored[stage] = json.loads(body)
+        return restored, stale
+
+    def _save(self, run_key: str, stage: str, version: str, body: bytes) -> None:
+        now = self._clock()
+        expires_at = None if self.ttl is None else now + self.ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(run_key, stage, version, body, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_key, stage, version, body, now, expires_at),
+            )
+            self._conn.commit()
+
+    def _clear(self, run_key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_key = ?", (run_key,))
+            self._conn.commit()
@@ -0,0 +1,329 @@
+"""
+Fixture Archive Module
+
+This module keeps a local SQLite archive of fixture results, fed by every
+fixture the collector fetches and by bulk season imports. It is indexed by
+team and by team pair, so previous meetings and recent form are answered
+from disk in milliseconds instead of with extra API-Football calls per recap.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from tools.response_cache import FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+POINTS = {"W": 3, "D": 1, "L": 0}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS fixtures (
+        fixture_id INTEGER PRIMARY KEY,
+        kickoff TEXT,
+        kickoff_ts REAL NOT NULL,
+        league_id INTEGER,
+        league_name TEXT,
+        season INTEGER,
+        round TEXT,
+        home_id INTEGER NOT NULL,
+        home_name TEXT,
+        away_id INTEGER NOT NULL,
+        away_name TEXT,
+        home_goals INTEGER,
+        away_goals INTEGER,
+        status TEXT,
+        pair_low INTEGER NOT NULL,
+        pair_high INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS fixtures_by_home ON fixtures (home_id, kickoff_ts)",
+    "CREATE INDEX IF NOT EXISTS fixtures_by_away ON fixtures (away_id, kickoff_ts)",
+    "CREATE INDEX IF NOT EXISTS fixtures_by_pair ON fixtures (pair_low, pair_high, kickoff_ts)",
+)
+
+_COLUMNS = (
+    "fixture_id", "kickoff", "kickoff_ts", "league_id", "league_name", "season", "round",
+    "home_id", "home_name", "away_id", "away_name", "home_goals", "away_goals", "status",
+)
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM fixtures"
+# Only fixtures with a final result count as meetings or form
+_FINISHED_STATUSES = tuple(sorted(FINISHED_STATUSES))
+_FINISHED = f"status IN ({', '.join('?' for _ in _FINISHED_STATUSES)}) AND home_goals IS NOT NULL AND away_goals IS NOT NULL"
+
+
+def _kickoff_ts(fixture: Mapping[str, Any]) -> float | None:
+    if isinstance(fixture.get("timestamp"), (int, float)):
+        return float(fixture["timestamp"])
+    try:
+        return datetime.fromisoformat(fixture.get("date")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ArchivedFixture:
+    """One archived fixture and its result."""
+
+    fixture_id: int
+    kickoff: str | None
+    kickoff_ts: float
+    league_id: int | None
+    league_name: str | None
+    season: int | None
+    round: str | None
+    home_id: int
+    home_name: str | None
+    away_id: int
+    away_name: str | None
+    home_goals: int | None
+    away_goals: int | None
+    status: str | None
+
+    @classmethod
+    def from_item(cls, item: Mapping[str, Any]) -> "ArchivedFixture | None":
+        """Build from an API-Football fixture item; None if it lacks an id, teams or a date."""
+        fixture = item.get("fixture") or {}
+        league = item.get("league") or {}
+        teams = item.get("teams") or {}
+        home, away = teams.get("home") or {}, teams.get("away") or {}
+        goals = item.get("goals") or {}
+        kickoff_ts = _kickoff_ts(fixture)
+        if fixture.get("id") is None or home.get("id") is None or away.get("id") is None or kickoff_ts is None:
+            return None
+        return cls(
+            fixture_id=fixture["id"],
+            kickoff=fixture.get("date"),
+            kickoff_ts=kickoff_ts,
+            league_id=league.get("id"),
+            league_name=league.get("name"),
+            season=league.get("season"),
+            round=league.get("round"),
+            home_id=home["id"],
+            home_name=home.get("name"),
+            away_id=away["id"],
+            away_name=away.get("name"),
+            home_goals=goals.get("home"),
+            away_goals=goals.get("away"),
+            status=(fixture.get("status") or {}).get("short"),
+        )
+
+    def goals(self, team_id: int) -> tuple[int, int]:
+        """(scored, conceded) by the team."""
+        if team_id == self.home_id:
+            return (self.home_goals, self.away_goals)
+        return (self.away_goals, self.home_goals)
+
+    def result_for(self, team_id: int) -> str:
+        """The result from the team's point of view: "W", "D" or "L"."""
+        scored, conceded = self.goals(team_id)
+        return "W" if scored > conceded else "L" if scored < conceded else "D"
+
+    @property
+    def scoreline(self) -> str:
+        """E.g. ``"2020-02-06 Rapide Oued ZEM 1-2 Wydad AC (Botola Pro)"``."""
+        date = (self.kickoff or "")[:10]
+        text = f"{date} {self.home_name} {self.home_goals}-{self.away_goals} {self.away_name}".strip()
+        return f"{text} ({self.league_name})" if self.league_name else text
+
+    def to_dict(self) -> dict[str, Any]:
+        return {column: getattr(self, column) for column in _COLUMNS}
+
+
+@dataclass(frozen=True, slots=True)
+class FormGuide:
+    """A team's last results, newest first."""
+
+    team_id: int
+    team_name: str | None
+    fixtures: tuple[ArchivedFixture, ...]
+
+    @property
+    def results(self) -> str:
+        """E.g. ``"WWDLW"``, newest first."""
+        return "".join(fixture.result_for(self.team_id) for fixture in self.fixtures)
+
+    @property
+    def points(self) -> int:
+        return sum(POINTS[result] for result in self.results)
+
+    def to_dict(self) -> dict[str, Any]:
+        goals = [fixture.goals(self.team_id) for fixture in self.fixtures]
+        return {
+            "team_id": self.team_id,
+            "team": self.team_name,
+            "results": self.results,
+            "points": self.points,
+            "played": len(self.fixtures),
+            "goals_for": sum(scored for scored, _ in goals),
+            "goals_against": sum(conceded for _, conceded in goals),
+            "fixtures": [fixture.scoreline for fixture in self.fixtures],
+        }
+
+
+def _row(fixture: ArchivedFixture) -> tuple:
+    return (
+        *(getattr(fixture, column) for column in _COLUMNS),
+        min(fixture.home_id, fixture.away_id), max(fixture.home_id, fixture.away_id),
+    )
+
+
+def _items(payload: Any) -> list[Mapping[str, Any]]:
+    """Fixture items of a standardized response, a bare fixture or a list of either."""
+    if isinstance(payload, Mapping):
+        if "response" in payload:
+            return [item for item in payload.get("response") or [] if isinstance(item, Mapping)]
+        return [payload] if "fixture" in payload else []
+    if isinstance(payload, Iterable) and not isinstance(payload, (str, bytes)):
+        return [item for entry in payload for item in _items(entry)]
+    return []
+
+
+class FixtureArchive:
+    """
+    SQLite archive of fixture results with head-to-head and form queries.
+
+    Rows are upserted by fixture id, so re-archiving a fixture updates its
+    score and status. SQLite calls run in a worker thread so the event loop
+    is never blocked on disk I/O. Use ``":memory:"`` as the path for a
+    process-local archive.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+
+    async def add(self, payload: Any) -> int:
+        """
+        Archive the fixtures of a response (or a bare fixture, or a list of them).
+
+        Returns:
+            Number of fixtures stored; items without teams or a date are skipped
+        """
+        fixtures = (ArchivedFixture.from_item(item) for item in _items(payload))
+        rows = [_row(fixture) for fixture in fixtures if fixture is not None]
+        if rows:
+            await asyncio.to_thread(self._add_rows, rows)
+        return len(rows)
+
+    async def import_season(self, client: Any, league_id: int, season: int, batch_size: int = 200) -> int:
+        """
+        Bulk-import a league season through ``APIFootballClient.iter_fixtures``.
+
+        Fixtures are written in batches as the pages stream in.
+
+        Returns:
+            Number of fixtures stored
+        """
+        stored = 0
+        batch: list[Mapping[str, Any]] = []
+        async for item in client.iter_fixtures(league_id, season):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                stored += await self.add(batch)
+                batch = []
+        stored += await self.add(batch)
+        logger.info(f"Archived {stored} fixtures of league {league_id}, season {season}")
+        return stored
+
+    async def head_to_head(self, team_a: int, team_b: int, limit: int = 5, before: float | None = None) -> list[ArchivedFixture]:
+        """The last ``limit`` finished meetings of two teams (either venue), newest first."""
+        return await asyncio.to_thread(self._head_to_head, team_a, team_b, limit, before)
+
+    async def form(self, team_id: int, limit: int = 5, before: float | None = None) -> FormGuide:
+        """The team's last ``limit`` finished results, newest first."""
+        return await asyncio.to_thread(self._form, team_id, limit, before)
+
+    async def history(self, home_id: int, away_id: int, limit: int = 5, before: float | None = None) -> dict[str, Any]:
+        """
+        Previous meetings and both teams' form before a fixture, as plain dicts.
+
+        Args:
+            home_id: Home team id
+            away_id: Away team id
+            limit: Meetings and results to return per query
+            before: Only fixtures kicking off before this Unix time (e.g. the fixture's own kickoff)
+
+        Returns:
+            ``{"head_to_head": {...}, "home_form": {...}, "away_form": {...}}``; the
+            head-to-head lists the meetings and counts wins for each side and draws
+        """
+        return await asyncio.to_thread(self._history, home_id, away_id, limit, before)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            fixtures, teams = self._conn.execute(
+                "SELECT COUNT(*), (SELECT COUNT(*) FROM (SELECT home_id FROM fixtures UNION SELECT away_id FROM fixtures)) "
+                "FROM fixtures"
+            ).fetchone()
+        return {"fixtures": fixtures, "teams": teams}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _add_rows(self, rows: list[tuple]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO fixtures ({', '.join(_COLUMNS)}, pair_low, pair_high) "
+                f"VALUES ({', '.join('?' for _ in range(len(_COLUMNS) + 2))})",
+                rows,
+            )
+            self._conn.commit()
+
+    def _query(self, where: str, params: tuple, limit: int, before: float | None) -> list[ArchivedFixture]:
+        if before is not None:
+            where += " AND kickoff_ts < ?"
+            params += (before,)
+        with self._lock:
+            rows = self._conn.execute(
+                f"{_SELECT} WHERE {where} AND {_FINISHED} ORDER BY kickoff_ts DESC LIMIT ?",
+                (*params, *_FINISHED_STATUSES, limit),
+            ).fetchall()
+        return [ArchivedFixture(*row) for row in rows]
+
+    def _head_to_head(self, team_a: int, team_b: int, limit: int, before: float | None) -> list[ArchivedFixture]:
+        pair = (min(team_a, team_b), max(team_a, team_b))
+        return self._query("pair_low = ? AND pair_high = ?", pair, limit, before)
+
+    def _form(self, team_id: int, limit: int, before: float | None) -> FormGuide:
+        # Each side of the OR uses its own index; merge the two newest-first lists
+        fixtures = sorted(
+            self._query("home_id = ?", (team_id,), limit, before) + self._query("away_id = ?", (team_id,), limit, before),
+            key=lambda fixture: fixture.kickoff_ts, reverse=True,
+        )[:limit]
+        team_name = None
+        if fixtures:
+            latest = fixtures[0]
+            team_name = latest.home_name if latest.home_id == team_id else latest.away_name
+        return FormGuide(team_id, team_name, tuple(fixtures))
+
+    def _history(self, home_id: int, away_id: int, limit: int, before: float | None) -> dict[str, Any]:
+        meetings = self._head_to_head(home_id, away_id, limit, before)
+        results = [meeting.result_for(home_id) for meeting in meetings]
+        return {
+            "head_to_head": {
+                "meetings": [meeting.scoreline for meeting in meetings],
+                "home_wins": results.count("W"),
+                "away_wins": results.count("L"),
+                "draws": results.count("D"),
+            },
+            "home_form": self._form(home_id, limit, before).to_dict(),
+            "away_form": self._form(away_id, limit, before).to_dict(),
+        }
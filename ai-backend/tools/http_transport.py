@@ -0,0 +1,226 @@
+"""
+HTTP Transport Module
+
+This module provides a shared, long-lived async HTTP transport for API-Football
+requests made through RapidAPI. A single pooled aiohttp session is reused across
+requests so connections stay alive between calls instead of paying a new TLS
+handshake every time. Requests can be paced by a RateLimitScheduler that
+tracks RapidAPI's rate-limit headers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+import aiohttp
+
+from tools.rate_limiter import RateLimitScheduler
+from utils.metrics import EXTERNAL_CALL_DURATION, EXTERNAL_CALLS, EXTERNAL_CALLS_IN_FLIGHT
+from utils.security import sanitize_log_input
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api-football-v1.p.rapidapi.com/v3"
+
+
+@dataclass
+class TransportResponse:
+    """Response returned by RapidAPITransport."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class RapidAPITransport:
+    """
+    Pooled async HTTP transport for RapidAPI-hosted endpoints.
+
+    The underlying aiohttp session is created lazily on first use and bound to the
+    running event loop. It keeps connections alive, requests gzip-compressed
+    responses and caps concurrent connections per host. When a scheduler is
+    given, every request waits for a rate-limit slot, feeds the response
+    headers back to it and is retried after HTTP 429.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        *,
+        total_timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        scheduler: RateLimitScheduler | None = None,
+        max_retries: int = 2,
+    ):
+        self._api_key = api_key
+        self.base_url = (
+            base_url or os.getenv("API_FOOTBALL_BASE_URL") or DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.host = urlparse(self.base_url).hostname or ""
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, sock_connect=connect_timeout
+        )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_env(cls) -> "RapidAPITransport":
+        """Build a transport using the API_FOOTBALL_* environment settings."""
+        return cls(
+            total_timeout=float(os.getenv("API_FOOTBALL_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("API_FOOTBALL_CONNECT_TIMEOUT", "10")),
+            limit=int(os.getenv("API_FOOTBALL_MAX_CONNECTIONS", "100")),
+            limit_per_host=int(os.getenv("API_FOOTBALL_MAX_CONNECTIONS_PER_HOST", "10")),
+            scheduler=RateLimitScheduler(
+                requests_per_minute=float(os.getenv("API_FOOTBALL_REQUESTS_PER_MINUTE", "30")),
+                reserve=int(os.getenv("API_FOOTBALL_PRIORITY_RESERVE", "0")),
+            ),
+        )
+
+    @property
+    def api_key(self) -> str:
+        api_key = self._api_key or os.getenv("RAPIDAPI_KEY")
+        if not api_key:
+            raise ValueError("RAPIDAPI_KEY not found.")
+        return api_key
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def __aenter__(self) -> "RapidAPITransport":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: Any,
+    ) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is loop:
+                return self._session
+            # Sessions cannot cross event loops (e.g. repeated asyncio.run calls);
+            # the old loop owns the sockets, so just drop our reference to it.
+            logger.debug("Event loop changed, recreating RapidAPI session")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={"Accept-Encoding": "gzip, deflate"},
+            auto_decompress=True,
+        )
+        self._session_loop = loop
+        return self._session
+
+    async def get(
+        self, endpoint: str, params: Mapping[str, Any] | None = None
+    ) -> TransportResponse:
+        """
+        Perform a GET request against the API.
+
+        Args:
+            endpoint: Endpoint path relative to the base URL (e.g. "fixtures")
+            params: Query string parameters
+
+        Returns:
+            TransportResponse with status, headers and the decoded body
+        """
+        headers = {"x-rapidapi-key": self.api_key, "x-rapidapi-host": self.host}
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        query = {key: str(value) for key, value in (params or {}).items()}
+
+        attempt = 0
+        while True:
+            if self.scheduler is not None:
+                await self.scheduler.acquire()
+            session = self._get_session()
+            logger.debug("GET %s %s", sanitize_log_input(endpoint), sanitize_log_input(query))
+            started = time.perf_counter()
+            status = "error"
+            try:
+                with EXTERNAL_CALLS_IN_FLIGHT.track():
+                    async with session.get(url, params=query, headers=headers) as response:
+                        result = TransportResponse(
+                            status=response.status,
+                            headers=dict(response.headers),
+                            body=await response.read(),
+                        )
+                status = str(result.status)
+            finally:
+                EXTERNAL_CALLS.inc(endpoint=endpoint, status=status)
+                EXTERNAL_CALL_DURATION.observe(time.perf_counter() - started, endpoint=endpoint)
+            if self.scheduler is not None:
+                self.scheduler.observe(result.headers, result.status)
+            if result.status == 429 and attempt < self.max_retries:
+                attempt += 1
+                logger.warning(
+                    "Rate limited on %s, retrying (%s/%s)",
+                    sanitize_log_input(endpoint), attempt, self.max_retries,
+                )
+                continue
+            return result
+
+    async def close(self) -> None:
+        """Close the pooled session, if one is open on the current loop."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is self._session_loop:
+                await session.close()
+        self._session_loop = None
+
+
+_shared_transport: RapidAPITransport | None = None
+
+
+def get_shared_transport() -> RapidAPITransport:
+    """Return the process-wide transport, creating it from the environment if needed."""
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = RapidAPITransport.from_env()
+    return _shared_transport
+
+
+async def close_shared_transport() -> None:
+    """Close the process-wide transport's session (it reopens lazily on next use)."""
+    if _shared_transport is not None:
+        await _shared_transport.close()
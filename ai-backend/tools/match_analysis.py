@@ -0,0 +1,362 @@
+"""
+Match Analysis Module
+
+This module computes the researcher's match analyses (turning points, event
+timeline, missed chances, best and worst moments, statistics summary and
+formations) directly from the structured fixture data. The goal sequence is
+replayed to find equalisers, winners, late goals and comebacks; statistics
+are compared side by side; formations are read from the lineups. A model is
+only needed when these rules find nothing to say.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from tools.match_model import RED_CARD_DETAILS, Event, Fixture
+from utils.match_digest import format_event
+
+# Goals from this minute on count as late
+LATE_GOAL_MINUTE = 80
+VAR_CANCELLED_DETAILS = frozenset({"Goal cancelled", "Goal Disallowed", "Goal Disallowed - offside"})
+
+ScoreLine = tuple[int, int]
+
+
+def _fixture(game_data: Any) -> Fixture | None:
+    if not isinstance(game_data, Mapping) or "error" in game_data:
+        return None
+    try:
+        return Fixture.from_response(game_data)
+    except ValueError:
+        return None
+
+
+def _order(event: Event) -> tuple[int, int]:
+    return (event.minute or 0, event.extra or 0)
+
+
+def _counts_as_goal(event: Event) -> bool:
+    return (
+        event.type == "Goal"
+        and event.detail != "Missed Penalty"
+        and not event.in_shootout
+    )
+
+
+def _sign(score: ScoreLine) -> int:
+    return (score[0] > score[1]) - (score[0] < score[1])
+
+
+def _team_name(fixture: Fixture, side: int) -> str | None:
+    return fixture.home.name if side == 0 else fixture.away.name
+
+
+def scoring_sequence(fixture: Fixture) -> list[tuple[Event, int, ScoreLine]]:
+    """
+    Replay the goals in match order.
+
+    Returns:
+        ``(goal, side, score_after)`` for each goal, where side 0 is the home
+        team and 1 the away team. Own goals are credited so that the replay
+        ends on the final score; empty if the goals cannot be reconciled with it.
+    """
+    goals = sorted((event for event in fixture.events_of("Goal") if _counts_as_goal(event)), key=_order)
+    # Providers differ on which team an own goal is filed under; try both readings
+    for flip_own_goals in (False, True):
+        home = away = 0
+        sequence = []
+        for event in goals:
+            if event.team_id == fixture.home.id:
+                side = 0
+            elif event.team_id == fixture.away.id:
+                side = 1
+            else:
+                return []
+            if flip_own_goals and event.detail == "Own Goal":
+                side = 1 - side
+            home, away = (home + 1, away) if side == 0 else (home, away + 1)
+            sequence.append((event, side, (home, away)))
+        if fixture.score.goals is None or (home, away) == fixture.score.goals:
+            return sequence
+    return []
+
+
+def _score_at(sequence: list[tuple[Event, int, ScoreLine]], event: Event) -> ScoreLine:
+    score = (0, 0)
+    for goal, _, after in sequence:
+        if _order(goal) > _order(event):
+            break
+        score = after
+    return score
+
+
+def _winning_goal(sequence: list[tuple[Event, int, ScoreLine]]) -> int | None:
+    """Index of the goal after which the eventual winner led for good."""
+    if not sequence or _sign(sequence[-1][2]) == 0:
+        return None
+    final = _sign(sequence[-1][2])
+    index = len(sequence) - 1
+    while index > 0 and _sign(sequence[index - 1][2]) == final:
+        index -= 1
+    return index
+
+
+def _goal_sentence(fixture: Fixture, event: Event, side: int, score: ScoreLine, what: str) -> str:
+    team = _team_name(fixture, side)
+    if event.detail == "Own Goal":
+        text = f"An own goal by {event.player_name} gave {team} {what}"
+    else:
+        text = f"{event.player_name} scored {what} for {team}"
+        if event.detail == "Penalty":
+            text += " from the penalty spot"
+    return f"{text} ({event.clock}), making it {score[0]}-{score[1]}."
+
+
+def _key_goals(fixture: Fixture, sequence: list[tuple[Event, int, ScoreLine]]) -> list[tuple[Event, str]]:
+    """Goals that changed the state of the match: equalisers, go-ahead goals and the winner."""
+    winner = _winning_goal(sequence)
+    key_goals = []
+    before = (0, 0)
+    for index, (event, side, after) in enumerate(sequence):
+        late = (event.minute or 0) >= LATE_GOAL_MINUTE
+        if index == winner:
+            what = "the only goal" if len(sequence) == 1 else "a late winner" if late else "the winning goal"
+        elif _sign(after) == 0:
+            what = "a late equaliser" if late else "the equaliser"
+        elif _sign(before) == 0 and (late or index > 0):
+            what = "a late go-ahead goal" if late else "the go-ahead goal"
+        else:
+            what = None
+        if what:
+            key_goals.append((event, _goal_sentence(fixture, event, side, after, what)))
+        before = after
+    return key_goals
+
+
+def _red_card_sentences(fixture: Fixture, sequence: list[tuple[Event, int, ScoreLine]]) -> list[tuple[Event, str]]:
+    sentences = []
+    players_left: dict[int | None, int] = {}
+    for event in sorted(fixture.events_of("Card"), key=_order):
+        if event.detail not in RED_CARD_DETAILS or not event.player_name:
+            continue
+        players_left[event.team_id] = players_left.get(event.team_id, 11) - 1
+        reason = " after a second yellow card" if event.detail != "Red Card" else ""
+        home, away = _score_at(sequence, event)
+        team = event.team_name or "their side"
+        sentences.append((event, (
+            f"{event.player_name} was sent off{reason} ({event.clock}) with the score at {home}-{away}, "
+            f"leaving {team} with {players_left[event.team_id]} players."
+        )))
+    return sentences
+
+
+def _comeback_sentence(fixture: Fixture, sequence: list[tuple[Event, int, ScoreLine]]) -> str | None:
+    if not sequence or _sign(sequence[-1][2]) == 0:
+        return None
+    final = sequence[-1][2]
+    winner_side = 0 if _sign(final) > 0 else 1
+    # The winner's largest deficit during the match
+    worst = max(sequence, key=lambda goal: goal[2][1 - winner_side] - goal[2][winner_side])[2]
+    if worst[1 - winner_side] <= worst[winner_side]:
+        return None
+    winner_goals, loser_goals = final[winner_side], final[1 - winner_side]
+    return (
+        f"{_team_name(fixture, winner_side)} came from behind to win {winner_goals}-{loser_goals}, "
+        f"having trailed {worst[0]}-{worst[1]}."
+    )
+
+
+def turning_points(game_data: Any) -> list[str]:
+    """
+    Game-changing moments: equalisers, go-ahead goals, the winner (flagging
+    late goals), sending-offs, a comeback and a penalty shootout.
+
+    Args:
+        game_data: Fixture response (``{"response": [fixture]}``) or a bare fixture
+
+    Returns:
+        Turning points in match order, then the comeback and shootout summary
+    """
+    fixture = _fixture(game_data)
+    if fixture is None:
+        return []
+    sequence = scoring_sequence(fixture)
+    moments = sorted(_key_goals(fixture, sequence) + _red_card_sentences(fixture, sequence),
+                     key=lambda moment: _order(moment[0]))
+    points = [sentence for _, sentence in moments]
+
+    comeback = _comeback_sentence(fixture, sequence)
+    if comeback:
+        points.append(comeback)
+    if fixture.score.penalty:
+        home_pens, away_pens = fixture.score.penalty
+        winner = fixture.home.name if home_pens > away_pens else fixture.away.name
+        points.append(f"{winner} won the penalty shootout {max(home_pens, away_pens)}-{min(home_pens, away_pens)}.")
+    return points
+
+
+def event_timeline(game_data: Any) -> list[str]:
+    """All match events sorted by match clock, e.g. ``"90+3' Goal (Penalty) Y. Jabrane [Wydad AC]"``."""
+    if not isinstance(game_data, Mapping) or "error" in game_data:
+        return []
+    if "response" in game_data:
+        response = game_data.get("response") or []
+        fixture_data = response[0] if response and isinstance(response[0], Mapping) else {}
+    else:
+        fixture_data = game_data
+    events = [event for event in fixture_data.get("events") or [] if isinstance(event, Mapping)]
+
+    def clock(event: Mapping[str, Any]) -> tuple[int, int]:
+        time = event.get("time") or {}
+        return (time.get("elapsed") or 0, time.get("extra") or 0)
+
+    return [format_event(event) for event in sorted(events, key=clock)]
+
+
+def missed_chances(game_data: Any) -> list[str]:
+    """Missed penalties and goals ruled out by VAR, in match order."""
+    fixture = _fixture(game_data)
+    if fixture is None:
+        return []
+    chances = []
+    for event in sorted(fixture.events_of("Goal", "Var"), key=_order):
+        if not event.player_name or event.in_shootout:
+            continue
+        team = f" ({event.team_name})" if event.team_name else ""
+        if event.type == "Goal" and event.detail == "Missed Penalty":
+            chances.append(f"{event.player_name}{team} missed a penalty ({event.clock}).")
+        elif event.type == "Var" and event.detail in VAR_CANCELLED_DETAILS:
+            chances.append(f"{event.player_name}{team} had a goal ruled out by VAR ({event.clock}).")
+    return chances
+
+
+def best_and_worst_moments(game_data: Any) -> dict[str, str | None]:
+    """
+    The match's best moment (the winning goal, or the last equaliser of a
+    draw) and worst moment (a missed penalty, else a sending-off, else an
+    own goal). Either is None when the data shows no such moment.
+    """
+    fixture = _fixture(game_data)
+    if fixture is None:
+        return {"best_moment": None, "worst_moment": None}
+    sequence = scoring_sequence(fixture)
+
+    best = None
+    key_goals = _key_goals(fixture, sequence)
+    winner = _winning_goal(sequence)
+    if winner is not None:
+        best = next(sentence for event, sentence in key_goals if event is sequence[winner][0])
+    elif key_goals:
+        best = key_goals[-1][1]
+
+    worst = None
+    candidates = (
+        missed_chances(game_data)
+        or [sentence for _, sentence in _red_card_sentences(fixture, sequence)]
+        or [_goal_sentence(fixture, event, side, after, "a goal")
+            for event, side, after in sequence if event.detail == "Own Goal"]
+    )
+    if candidates:
+        worst = candidates[0]
+    return {"best_moment": best, "worst_moment": worst}
+
+
+def _team_statistics(stat_data: Any) -> list[tuple[str, dict[str, Any]]]:
+    """``(team name, {stat type: value})`` from a statistics response, a fixture or a bare list."""
+    if isinstance(stat_data, Mapping):
+        if "error" in stat_data:
+            return []
+        entries = stat_data.get("response") if "response" in stat_data else stat_data.get("statistics")
+        if isinstance(entries, list) and entries and isinstance(entries[0], Mapping) and "fixture" in entries[0]:
+            entries = entries[0].get("statistics")
+    else:
+        entries = stat_data
+    teams = []
+    for entry in entries or []:
+        if not isinstance(entry, Mapping):
+            continue
+        name = (entry.get("team") or {}).get("name")
+        stats = {
+            stat.get("type"): stat.get("value")
+            for stat in entry.get("statistics") or []
+            if isinstance(stat, Mapping) and stat.get("type")
+        }
+        if name and stats:
+            teams.append((name, stats))
+    return teams
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.rstrip("%"))
+        except ValueError:
+            return None
+    return None
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+def stat_summary(stat_data: Any) -> list[str]:
+    """
+    Side-by-side match statistics with the difference between the teams,
+    e.g. ``"Ball Possession: Rapide Oued ZEM 42% - 58% Wydad AC (Wydad AC +16%)"``.
+    Statistics missing for either team are left out.
+    """
+    teams = _team_statistics(stat_data)
+    if len(teams) < 2:
+        return []
+    (home, home_stats), (away, away_stats) = teams[0], teams[1]
+    summary = []
+    for stat_type, home_value in home_stats.items():
+        away_value = away_stats.get(stat_type)
+        home_number, away_number = _number(home_value), _number(away_value)
+        if home_number is None or away_number is None:
+            continue
+        unit = "%" if isinstance(home_value, str) and home_value.endswith("%") else ""
+        text = f"{stat_type}: {home} {home_value} - {away_value} {away}"
+        if home_number == away_number:
+            text += " (level)"
+        else:
+            leader = home if home_number > away_number else away
+            text += f" ({leader} +{_format_number(abs(home_number - away_number))}{unit})"
+        summary.append(text)
+    return summary
+
+
+def _lineups(lineup_data: Any) -> list[Mapping[str, Any]]:
+    """Lineup entries from a lineups response, a fixture (response) or a bare list."""
+    if isinstance(lineup_data, Mapping):
+        if "error" in lineup_data:
+            return []
+        if "response" in lineup_data:
+            entries = lineup_data.get("response") or []
+            if entries and isinstance(entries[0], Mapping) and "lineups" in entries[0]:
+                entries = entries[0].get("lineups")
+        else:
+            entries = lineup_data.get("lineups")
+    else:
+        entries = lineup_data
+    return [entry for entry in entries or [] if isinstance(entry, Mapping)]
+
+
+def formations(lineup_data: Any) -> list[str]:
+    """Each team's formation and coach as listed in the lineups."""
+    lines = []
+    for lineup in _lineups(lineup_data):
+        team = (lineup.get("team") or {}).get("name")
+        formation = lineup.get("formation")
+        if not (team and formation):
+            continue
+        text = f"{team} lined up in a {formation}"
+        coach = (lineup.get("coach") or {}).get("name")
+        if coach:
+            text += f" under {coach}"
+        lines.append(text + ".")
+    return lines
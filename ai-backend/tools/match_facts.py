@@ -0,0 +1,191 @@
+"""
+Match Facts Module
+
+This module turns a fixture payload into short factual storylines (result,
+scorers, sending-offs, missed penalties, venue and date, bookings,
+substitutions) with fixed rules instead of a model call. Every name, minute
+and score is copied from the payload, so the facts cannot mix up players,
+teams or times.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from tools.match_model import RED_CARD_DETAILS, Event, Fixture
+from tools.response_cache import FINISHED_STATUSES
+
+GOAL_COUNT_WORDS = {1: "", 2: " twice", 3: " a hat-trick"}
+# Finished without being played out; there is no half-time score to report
+_FORFEIT_STATUSES = {"AWD": "awarded", "WO": "walkover"}
+
+
+def _join(items: list[str]) -> str:
+    if len(items) <= 1:
+        return "".join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def _score(pair: tuple[int, int]) -> str:
+    return f"{pair[0]}-{pair[1]}"
+
+
+def _match_date(date: str | None) -> str | None:
+    if not date:
+        return None
+    try:
+        parsed = datetime.fromisoformat(date)
+    except ValueError:
+        return None
+    return f"{parsed.day} {parsed:%B %Y}"
+
+
+def result_fact(fixture: Fixture) -> str | None:
+    """The final (or current) score, e.g. "Wydad AC won 2-1 away at Rapide Oued ZEM"."""
+    home, away = fixture.home.name, fixture.away.name
+    goals = fixture.score.goals or fixture.score.fulltime
+    if not (home and away and goals):
+        return None
+    home_goals, away_goals = goals
+    if fixture.status is not None and fixture.status not in FINISHED_STATUSES:
+        return f"The score was {home} {home_goals}-{away_goals} {away} (status: {fixture.status})."
+
+    if home_goals > away_goals:
+        text = f"{home} beat {away} {home_goals}-{away_goals} at home"
+    elif away_goals > home_goals:
+        text = f"{away} won {away_goals}-{home_goals} away at {home}"
+    else:
+        text = f"{home} and {away} drew {home_goals}-{away_goals}"
+    if fixture.score.extratime:
+        text += " after extra time"
+    if fixture.score.penalty:
+        home_pens, away_pens = fixture.score.penalty
+        winner, pens = (home, (home_pens, away_pens)) if home_pens > away_pens else (away, (away_pens, home_pens))
+        text += f", with {winner} winning {_score(pens)} on penalties"
+    if fixture.status in _FORFEIT_STATUSES:
+        text += f" ({_FORFEIT_STATUSES[fixture.status]})"
+    elif fixture.score.halftime:
+        text += f" (half-time: {_score(fixture.score.halftime)})"
+    return text + "."
+
+
+def scorer_facts(fixture: Fixture) -> list[str]:
+    """One fact per scorer, in order of their first goal; own goals separately."""
+    # Keyed by scorer, or by the event itself for own goals; dicts keep first-goal order
+    scorers: dict[Any, list[Event]] = {}
+    for position, event in enumerate(fixture.events_of("Goal")):
+        # Shootout kicks are not goals of the match
+        if not event.player_name or event.detail == "Missed Penalty" or event.in_shootout:
+            continue
+        key = ("own goal", position) if event.detail == "Own Goal" else (event.player_id or event.player_name, event.team_id)
+        scorers.setdefault(key, []).append(event)
+
+    facts = []
+    for key, goals in scorers.items():
+        first = goals[0]
+        if key[0] == "own goal":
+            facts.append(f"{first.player_name} scored an own goal ({first.clock}).")
+            continue
+        count_word = GOAL_COUNT_WORDS.get(len(goals), f" {len(goals)} goals")
+        text = f"{first.player_name} scored{count_word}"
+        penalties = sum(1 for goal in goals if goal.detail == "Penalty")
+        if penalties and len(goals) == 1:
+            text = f"{first.player_name} scored a penalty"
+        elif penalties:
+            text += f", including {'a penalty' if penalties == 1 else f'{penalties} penalties'},"
+        if first.team_name:
+            text += f" for {first.team_name}"
+        text += f" ({', '.join(goal.clock for goal in goals)})"
+        if len(goals) == 1 and first.assist_name:
+            text += f", assisted by {first.assist_name}"
+        facts.append(text + ".")
+    return facts
+
+
+def incident_facts(fixture: Fixture) -> list[str]:
+    """Sending-offs and missed penalties, in match order (shootout kicks excluded)."""
+    facts = []
+    for event in fixture.events:
+        if not event.player_name or event.in_shootout:
+            continue
+        team = f" ({event.team_name})" if event.team_name else ""
+        if event.type == "Card" and event.detail in RED_CARD_DETAILS:
+            reason = " after a second yellow card" if event.detail != "Red Card" else ""
+            facts.append(f"{event.player_name}{team} was sent off{reason} ({event.clock}).")
+        elif event.type == "Goal" and event.detail == "Missed Penalty":
+            facts.append(f"{event.player_name}{team} missed a penalty ({event.clock}).")
+    return facts
+
+
+def setting_fact(fixture: Fixture) -> str | None:
+    """Venue, date, competition and referee."""
+    venue = ", ".join(part for part in (fixture.venue, fixture.city) if part)
+    date = _match_date(fixture.date)
+    if not (venue or date):
+        return None
+    text = "The match was played"
+    if venue:
+        text += f" at {venue}"
+    if date:
+        text += f" on {date}"
+    competition = ", ".join(part for part in (fixture.league.name, fixture.league.round) if part)
+    if competition:
+        text += f" ({competition})"
+    if fixture.referee:
+        text += f", with {fixture.referee} as referee"
+    return text + "."
+
+
+def booking_fact(fixture: Fixture) -> str | None:
+    """All yellow cards in one fact."""
+    bookings = [
+        f"{event.player_name} ({event.team_name}, {event.clock})" if event.team_name
+        else f"{event.player_name} ({event.clock})"
+        for event in fixture.events_of("Card")
+        if event.player_name and event.detail == "Yellow Card"
+    ]
+    if not bookings:
+        return None
+    return f"Booked: {_join(bookings)}."
+
+
+def substitution_fact(fixture: Fixture) -> str | None:
+    """Number of substitutions made by each side."""
+    counts: dict[str, int] = {}
+    for event in fixture.events_of("subst"):
+        if event.team_name:
+            counts[event.team_name] = counts.get(event.team_name, 0) + 1
+    if not counts:
+        return None
+    parts = [f"{team} made {count} substitution{'s' if count != 1 else ''}" for team, count in counts.items()]
+    return f"{_join(parts)}."
+
+
+def extract_match_facts(game_data: Mapping[str, Any]) -> list[str]:
+    """
+    Build factual storylines for a fixture without a model call.
+
+    Args:
+        game_data: Fixture response (``{"response": [fixture]}``) or a bare fixture
+
+    Returns:
+        Facts in priority order: result, scorers, sending-offs and missed
+        penalties, setting, bookings, substitutions. Empty if the payload
+        holds no fixture.
+    """
+    if not isinstance(game_data, Mapping) or "error" in game_data:
+        return []
+    try:
+        fixture = Fixture.from_response(game_data)
+    except ValueError:
+        return []
+
+    facts = [
+        result_fact(fixture),
+        *scorer_facts(fixture),
+        *incident_facts(fixture),
+        setting_fact(fixture),
+        booking_fact(fixture),
+        substitution_fact(fixture),
+    ]
+    return [fact for fact in facts if fact]
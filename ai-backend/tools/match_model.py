@@ -0,0 +1,447 @@
+"""
+Match Model Module
+
+This module provides typed records for an API-Football fixture: the
+league, both teams, the score, match events, lineups and the players in
+them, plus a player's season statistics. Records are frozen slotted
+dataclasses built once from the API payload; the fixture keeps O(1) indexes
+of its players by id and of its events by type, minute and player.
+
+The pipeline parses a fixture once and passes the records through its
+team and player enrichment stages. They are rendered to JSON-compatible
+dicts by the ``to_dict`` helpers only in those stages' outputs, which are
+checkpointed and digested for prompts.
+"""
+
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+# Events that make a player a "key player" of the match
+KEY_EVENT_TYPES = frozenset({"Goal", "Card"})
+# Card details that send a player off
+RED_CARD_DETAILS = frozenset({"Red Card", "Second Yellow card", "Second Yellow Card"})
+# Event comment API-Football puts on penalty shootout kicks
+SHOOTOUT_COMMENT = "Penalty Shootout"
+
+
+def _get(data: Any, key: str) -> Any:
+    return data.get(key) if isinstance(data, Mapping) else None
+
+
+def _fixture_payload(payload: Mapping[str, Any]) -> Mapping[str, Any]:
+    if "response" not in payload:
+        return payload
+    response = payload.get("response") or []
+    if not response:
+        raise ValueError("No response data available")
+    return response[0]
+
+
+@dataclass(frozen=True, slots=True)
+class League:
+    """Competition and round a fixture belongs to."""
+
+    id: int | None
+    name: str | None
+    country: str | None = None
+    season: int | None = None
+    round: str | None = None
+    logo: str | None = None
+    flag: str | None = None
+
+    @classmethod
+    def from_payload(cls, league: Mapping[str, Any]) -> "League":
+        return cls(
+            id=league.get("id"),
+            name=league.get("name"),
+            country=league.get("country"),
+            season=league.get("season"),
+            round=league.get("round"),
+            logo=league.get("logo"),
+            flag=league.get("flag"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "country": self.country,
+            "logo": self.logo,
+            "flag": self.flag,
+            "season": self.season,
+            "round": self.round,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Team:
+    """One side of a fixture."""
+
+    id: int | None
+    name: str | None
+    logo: str | None = None
+    winner: bool | None = None
+
+    @classmethod
+    def from_payload(cls, team: Mapping[str, Any]) -> "Team":
+        return cls(
+            id=team.get("id"),
+            name=team.get("name"),
+            logo=team.get("logo"),
+            winner=team.get("winner"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "name": self.name, "logo": self.logo, "winner": self.winner}
+
+
+def _pair(score: Any) -> tuple[int, int] | None:
+    home, away = _get(score, "home"), _get(score, "away")
+    if home is None or away is None:
+        return None
+    return (home, away)
+
+
+@dataclass(frozen=True, slots=True)
+class Score:
+    """Scores as (home, away) pairs; ``goals`` is the total including extra time."""
+
+    goals: tuple[int, int] | None = None
+    halftime: tuple[int, int] | None = None
+    fulltime: tuple[int, int] | None = None
+    extratime: tuple[int, int] | None = None
+    penalty: tuple[int, int] | None = None
+
+    @classmethod
+    def from_payload(cls, goals: Any, score: Any) -> "Score":
+        return cls(
+            goals=_pair(goals),
+            halftime=_pair(_get(score, "halftime")),
+            fulltime=_pair(_get(score, "fulltime")),
+            extratime=_pair(_get(score, "extratime")),
+            penalty=_pair(_get(score, "penalty")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """A match event (goal, card, substitution, VAR decision)."""
+
+    type: str | None
+    detail: str | None
+    minute: int | None
+    extra: int | None = None
+    team_id: int | None = None
+    team_name: str | None = None
+    player_id: int | None = None
+    player_name: str | None = None
+    assist_id: int | None = None
+    assist_name: str | None = None
+    comments: str | None = None
+
+    @classmethod
+    def from_payload(cls, event: Mapping[str, Any]) -> "Event":
+        time = event.get("time") or {}
+        team = event.get("team") or {}
+        player = event.get("player") or {}
+        assist = event.get("assist") or {}
+        return cls(
+            type=event.get("type"),
+            detail=event.get("detail"),
+            minute=time.get("elapsed"),
+            extra=time.get("extra"),
+            team_id=team.get("id"),
+            team_name=team.get("name"),
+            player_id=player.get("id"),
+            player_name=player.get("name"),
+            assist_id=assist.get("id"),
+            assist_name=assist.get("name"),
+            comments=event.get("comments"),
+        )
+
+    @property
+    def in_shootout(self) -> bool:
+        """Whether the event is a penalty shootout kick rather than a match event."""
+        return self.comments == SHOOTOUT_COMMENT
+
+    @property
+    def clock(self) -> str:
+        """Match clock of the event, e.g. ``"90+3'"``."""
+        if self.minute is None:
+            return "?'"
+        return f"{self.minute}+{self.extra}'" if self.extra else f"{self.minute}'"
+
+    def to_dict(self) -> dict[str, Any]:
+        """The event as one of a player's ``match_events``."""
+        return {"type": self.type, "detail": self.detail, "time": self.minute, "assist": self.assist_name}
+
+    def achievement(self) -> dict[str, Any]:
+        """The event as a key player's ``key_achievement``."""
+        return {"type": self.type, "detail": self.detail, "time": self.minute}
+
+
+@dataclass(frozen=True, slots=True)
+class LineupPlayer:
+    """A player named in a lineup, as a starter or a substitute."""
+
+    id: int
+    name: str | None
+    number: int | None
+    position: str | None
+    grid: str | None
+    team_id: int | None
+    team_name: str | None
+    starter: bool
+
+    @classmethod
+    def from_payload(cls, entry: Mapping[str, Any], team: Mapping[str, Any], starter: bool) -> "LineupPlayer | None":
+        player = entry.get("player") or {}
+        if not player.get("id"):
+            return None
+        return cls(
+            id=player["id"],
+            name=player.get("name"),
+            number=player.get("number"),
+            position=player.get("pos"),
+            grid=player.get("grid"),
+            team_id=team.get("id"),
+            team_name=team.get("name"),
+            starter=starter,
+        )
+
+    @property
+    def status(self) -> str:
+        return "started" if self.starter else "substitute"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "number": self.number,
+            "position": self.position,
+            "team": self.team_name,
+            "team_id": self.team_id,
+            "status": self.status,
+            "formation_position": self.grid if self.starter else None,
+        }
+
+    def to_payload(self) -> dict[str, Any]:
+        """The player as an API-Football lineup entry."""
+        return {
+            "player": {
+                "id": self.id,
+                "name": self.name,
+                "number": self.number,
+                "pos": self.position,
+                "grid": self.grid,
+            }
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Lineup:
+    """A team's formation, coach, starting XI and bench."""
+
+    team_id: int | None
+    team_name: str | None
+    formation: str | None
+    coach: str | None
+    start_xi: tuple[LineupPlayer, ...]
+    substitutes: tuple[LineupPlayer, ...]
+
+    @classmethod
+    def from_payload(cls, lineup: Mapping[str, Any]) -> "Lineup":
+        team = lineup.get("team") or {}
+        start_xi = (LineupPlayer.from_payload(entry, team, True) for entry in lineup.get("startXI") or [])
+        substitutes = (LineupPlayer.from_payload(entry, team, False) for entry in lineup.get("substitutes") or [])
+        return cls(
+            team_id=team.get("id"),
+            team_name=team.get("name"),
+            formation=lineup.get("formation"),
+            coach=(lineup.get("coach") or {}).get("name"),
+            start_xi=tuple(player for player in start_xi if player is not None),
+            substitutes=tuple(player for player in substitutes if player is not None),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "formation": self.formation,
+            "coach": self.coach,
+            "startXI": [player.to_payload() for player in self.start_xi],
+            "substitutes": [player.to_payload() for player in self.substitutes],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerSeasonStats:
+    """A player's season totals for one team, from the ``players`` endpoint."""
+
+    player_id: int | None
+    team_id: int | None = None
+    league: str | None = None
+    age: int | None = None
+    nationality: str | None = None
+    appearances: int | None = None
+    minutes: int | None = None
+    rating: str | None = None
+    goals: int | None = None
+    assists: int | None = None
+    yellow_cards: int | None = None
+    red_cards: int | None = None
+
+    @classmethod
+    def from_response(cls, payload: Any, team_id: int | None = None) -> "PlayerSeasonStats | None":
+        """
+        Parse a ``players?id=&season=`` response.
+
+        Args:
+            payload: Standardized API response (or an error dict)
+            team_id: Prefer the statistics entry for this team
+
+        Returns:
+            The season stats, or None if the payload has no player
+        """
+        response = _get(payload, "response")
+        if not response or not isinstance(response, list):
+            return None
+        entry = response[0]
+        statistics = entry.get("statistics") or []
+        stats = next(
+            (s for s in statistics if (s.get("team") or {}).get("id") == team_id),
+            statistics[0] if statistics else {},
+        )
+        player = entry.get("player") or {}
+        games = stats.get("games") or {}
+        goals = stats.get("goals") or {}
+        cards = stats.get("cards") or {}
+        return cls(
+            player_id=player.get("id"),
+            team_id=(stats.get("team") or {}).get("id"),
+            league=(stats.get("league") or {}).get("name"),
+            age=player.get("age"),
+            nationality=player.get("nationality"),
+            appearances=games.get("appearences"),
+            minutes=games.get("minutes"),
+            rating=games.get("rating"),
+            goals=goals.get("total"),
+            assists=goals.get("assists"),
+            yellow_cards=cards.get("yellow"),
+            red_cards=cards.get("red"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "age": self.age,
+            "nationality": self.nationality,
+            "league": self.league,
+            "appearances": self.appearances,
+            "minutes": self.minutes,
+            "rating": self.rating,
+            "goals": self.goals,
+            "assists": self.assists,
+            "yellow_cards": self.yellow_cards,
+            "red_cards": self.red_cards,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Fixture:
+    """A fixture with its events and lineups, indexed for O(1) lookups."""
+
+    id: int | None
+    date: str | None
+    referee: str | None
+    venue: str | None
+    city: str | None
+    status: str | None
+    league: League
+    home: Team
+    away: Team
+    events: tuple[Event, ...]
+    lineups: tuple[Lineup, ...]
+    score: Score = Score()
+    players: dict[int, LineupPlayer] = field(default_factory=dict, compare=False, repr=False)
+    events_by_type: dict[str | None, tuple[Event, ...]] = field(default_factory=dict, compare=False, repr=False)
+    events_by_minute: dict[int | None, tuple[Event, ...]] = field(default_factory=dict, compare=False, repr=False)
+    events_by_player: dict[int, tuple[Event, ...]] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_response(cls, payload: Mapping[str, Any]) -> "Fixture":
+        """
+        Build a fixture from a ``fixtures?id=`` response or a bare fixture object.
+
+        Raises:
+            ValueError: If the response holds no fixture
+        """
+        data = _fixture_payload(payload)
+        fixture = data.get("fixture") or {}
+        venue = fixture.get("venue") or {}
+        teams = data.get("teams") or {}
+        events = tuple(Event.from_payload(event) for event in data.get("events") or [])
+        lineups = tuple(Lineup.from_payload(lineup) for lineup in data.get("lineups") or [])
+
+        # Later lineups win on duplicate ids, like a dict update
+        players: dict[int, LineupPlayer] = {}
+        for lineup in lineups:
+            for player in lineup.start_xi + lineup.substitutes:
+                players[player.id] = player
+
+        by_type: defaultdict[str | None, list[Event]] = defaultdict(list)
+        by_minute: defaultdict[int | None, list[Event]] = defaultdict(list)
+        by_player: defaultdict[int, list[Event]] = defaultdict(list)
+        for event in events:
+            by_type[event.type].append(event)
+            by_minute[event.minute].append(event)
+            if event.player_id and event.player_name:
+                by_player[event.player_id].append(event)
+
+        return cls(
+            id=fixture.get("id"),
+            date=fixture.get("date"),
+            referee=fixture.get("referee"),
+            venue=venue.get("name"),
+            city=venue.get("city"),
+            status=(fixture.get("status") or {}).get("short"),
+            league=League.from_payload(data.get("league") or {}),
+            home=Team.from_payload(teams.get("home") or {}),
+            away=Team.from_payload(teams.get("away") or {}),
+            events=events,
+            lineups=lineups,
+            score=Score.from_payload(data.get("goals"), data.get("score")),
+            players=players,
+            events_by_type={key: tuple(value) for key, value in by_type.items()},
+            events_by_minute={key: tuple(value) for key, value in by_minute.items()},
+            events_by_player={key: tuple(value) for key, value in by_player.items()},
+        )
+
+    def player(self, player_id: int) -> LineupPlayer | None:
+        return self.players.get(player_id)
+
+    def events_of(self, *types: str) -> tuple[Event, ...]:
+        """Events of the given types, in match order."""
+        if len(types) == 1:
+            return self.events_by_type.get(types[0], ())
+        return tuple(event for event in self.events if event.type in types)
+
+    def events_at(self, minute: int) -> tuple[Event, ...]:
+        return self.events_by_minute.get(minute, ())
+
+    def player_events(self, player_id: int) -> tuple[Event, ...]:
+        return self.events_by_player.get(player_id, ())
+
+    def lineup_for(self, team_id: int | None) -> Lineup | None:
+        """The team's lineup (the last one listed, if the payload repeats it)."""
+        found = None
+        for lineup in self.lineups:
+            if lineup.team_id == team_id:
+                found = lineup
+        return found
+
+    def key_events(self) -> tuple[Event, ...]:
+        """Goals and cards of players named in a lineup, in match order."""
+        return tuple(
+            event for event in self.events
+            if event.type in KEY_EVENT_TYPES and event.player_id in self.players
+        )
@@ -0,0 +1,215 @@
+"""
+Rate Limiter Module
+
+This module paces outbound API-Football requests with a token bucket driven by
+the rate-limit headers RapidAPI returns on every response, and releases queued
+requests in priority order so live recaps go before backfill work.
+
+Priority is taken from the ``request_priority`` context variable, which callers
+set with :func:`priority_scope` (e.g. from ``ArticleRequest.priority``). Tasks
+spawned inside the scope inherit it.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first. Unknown priorities are treated as "normal".
+PRIORITY_LEVELS = {
+    "urgent": 0,
+    "live": 1,
+    "high": 1,
+    "normal": 2,
+    "low": 3,
+    "backfill": 4,
+}
+DEFAULT_PRIORITY = "normal"
+
+request_priority: ContextVar[str] = ContextVar("request_priority", default=DEFAULT_PRIORITY)
+
+# Per-minute window (RapidAPI) and daily quota (API-Football plan) headers
+MINUTE_LIMIT_HEADER = "x-ratelimit-limit"
+MINUTE_REMAINING_HEADER = "x-ratelimit-remaining"
+DAILY_LIMIT_HEADER = "x-ratelimit-requests-limit"
+DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+# The daily quota resets at 00:00 UTC
+DAY_SECONDS = 86400
+
+
+class QuotaExhaustedError(RuntimeError):
+    """Raised when the daily API quota cannot serve a request."""
+
+
+@contextlib.contextmanager
+def priority_scope(priority: str | None) -> Iterator[None]:
+    """Run the enclosed block (and tasks it spawns) at the given request priority."""
+    token = request_priority.set(priority or DEFAULT_PRIORITY)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+def _priority_level(priority: str) -> int:
+    return PRIORITY_LEVELS.get(priority.lower(), PRIORITY_LEVELS[DEFAULT_PRIORITY])
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitScheduler:
+    """
+    Token-bucket scheduler for outbound API calls.
+
+    The bucket starts from the configured requests-per-minute and is corrected
+    by every response's rate-limit headers. When no token is available,
+    requests wait in a priority queue. Once the remaining daily quota drops to
+    ``reserve``, only requests at ``normal`` priority or better are admitted.
+    The observed daily quota is forgotten at the next 00:00 UTC reset, so an
+    exhausted quota stops blocking requests once it has been renewed.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        reserve: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.reserve = reserve
+        self.tokens = self.capacity
+        self.daily_limit: int | None = None
+        self.daily_remaining: int | None = None
+        self._daily_resets_at: float | None = None
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._updated = clock()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self.granted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    async def acquire(self, priority: str | None = None) -> None:
+        """Wait for a request slot at the given (or context) priority."""
+        priority = priority or request_priority.get()
+        level = _priority_level(priority)
+        self._check_quota(level, priority)
+        self._refill()
+
+        if not self._waiters and self.tokens >= 1:
+            self.tokens -= 1
+            self.granted += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (level, next(self._sequence), future))
+        self.queued += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    def observe(self, headers: Mapping[str, str], status: int) -> None:
+        """Update the bucket from a response's rate-limit headers."""
+        headers = {key.lower(): value for key, value in headers.items()}
+
+        minute_limit = _int_header(headers, MINUTE_LIMIT_HEADER)
+        if minute_limit and minute_limit != self.capacity:
+            logger.info("API rate limit updated to %s requests/minute", minute_limit)
+            self.capacity = float(minute_limit)
+            self.rate = minute_limit / 60.0
+        minute_remaining = _int_header(headers, MINUTE_REMAINING_HEADER)
+        if minute_remaining is not None:
+            self._refill()
+            self.tokens = min(self.tokens, float(minute_remaining))
+
+        daily_limit = _int_header(headers, DAILY_LIMIT_HEADER)
+        if daily_limit is not None:
+            self.daily_limit = daily_limit
+        daily_remaining = _int_header(headers, DAILY_REMAINING_HEADER)
+        if daily_remaining is not None:
+            self.daily_remaining = daily_remaining
+            self._daily_resets_at = (self._wall_clock() // DAY_SECONDS + 1) * DAY_SECONDS
+
+        if status == 429:
+            self.throttled += 1
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+    def stats(self) -> dict[str, Any]:
+        self._refill()
+        self._expire_daily_quota()
+        return {
+            "tokens": round(self.tokens, 2),
+            "requests_per_minute": self.capacity,
+            "daily_limit": self.daily_limit,
+            "daily_remaining": self.daily_remaining,
+            "waiting": sum(1 for *_, future in self._waiters if not future.done()),
+            "granted": self.granted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+        }
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _expire_daily_quota(self) -> None:
+        if self._daily_resets_at is not None and self._wall_clock() >= self._daily_resets_at:
+            logger.info("Daily API quota reset; admitting requests until the next response reports it")
+            self.daily_remaining = None
+            self._daily_resets_at = None
+
+    def _check_quota(self, level: int, priority: str) -> None:
+        self._expire_daily_quota()
+        if self.daily_remaining is None:
+            return
+        if self.daily_remaining <= 0:
+            self.rejected += 1
+            raise QuotaExhaustedError("Daily API-Football quota exhausted")
+        if self.daily_remaining <= self.reserve and level > PRIORITY_LEVELS[DEFAULT_PRIORITY]:
+            self.rejected += 1
+            raise QuotaExhaustedError(
+                f"Remaining daily quota ({self.daily_remaining}) is reserved; "
+                f"'{priority}' request refused"
+            )
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            level, _sequence, future = self._waiters[0]
+            if future.done():  # caller was cancelled
+                heapq.heappop(self._waiters)
+                continue
+            try:
+                self._check_quota(level, "queued")
+            except QuotaExhaustedError as exc:
+                heapq.heappop(self._waiters)
+                future.set_exception(exc)
+                continue
+            self._refill()
+            if self.tokens >= 1:
+                heapq.heappop(self._waiters)
+                self.tokens -= 1
+                self.granted += 1
+                future.set_result(None)
+            else:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
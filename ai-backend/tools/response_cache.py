@@ -0,0 +1,333 @@
+"""
+Response Cache Module
+
+This module provides a persistent, SQLite-backed cache for API-Football
+responses. Entries expire according to per-resource freshness policies: a
+finished fixture never changes, team metadata changes rarely, and live
+fixtures go stale within seconds. Failed fetches are cached negatively for a
+short time so a broken id is not re-requested on every run.
+
+An optional in-memory tier keeps already-parsed payloads hot in front of the
+SQLite store, bounded by total payload size rather than entry count.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from utils.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# API-Football fixture status codes (fixture.status.short)
+FINISHED_STATUSES = frozenset({"FT", "AET", "PEN", "AWD", "WO"})
+LIVE_STATUSES = frozenset({"1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    resource TEXT NOT NULL,
+    body BLOB NOT NULL,
+    negative INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+@dataclass
+class CachePolicy:
+    """Time-to-live in seconds per resource type. ``None`` means never expires."""
+
+    fixture_finished_ttl: float | None = None
+    fixture_live_ttl: float = 15
+    fixture_scheduled_ttl: float = 300
+    team_ttl: float = 30 * 24 * 3600
+    player_ttl: float = 24 * 3600
+    default_ttl: float = 3600
+    negative_ttl: float = 60
+
+    def ttl_for(self, resource: str, payload: dict[str, Any]) -> float | None:
+        """Return the TTL for a successful response of the given resource type."""
+        response = payload.get("response") or []
+        if not response:
+            # API-Football answers unknown ids with an empty response (its 404)
+            return self.negative_ttl
+        if resource == "fixture":
+            statuses = {
+                (item.get("fixture") or {}).get("status", {}).get("short")
+                for item in response
+            }
+            if statuses <= FINISHED_STATUSES:
+                return self.fixture_finished_ttl
+            if statuses & LIVE_STATUSES:
+                return self.fixture_live_ttl
+            return self.fixture_scheduled_ttl
+        if resource == "team":
+            return self.team_ttl
+        if resource == "player":
+            return self.player_ttl
+        return self.default_ttl
+
+
+@dataclass
+class CacheEntry:
+    """Result of a cache lookup."""
+
+    payload: Any
+    negative: bool = False
+
+    @property
+    def error(self) -> str:
+        return str(self.payload) if self.negative else ""
+
+
+class MemoryTier:
+    """
+    Byte-bounded LRU of parsed cache entries.
+
+    Each entry is charged the size of its JSON encoding, so a 300KB fixture
+    costs as much as a hundred small team payloads. The least recently used
+    entries are evicted until the total fits within ``max_bytes``. Payloads
+    are copied on the way in and out, so callers that mutate what they were
+    given cannot corrupt the cached entry.
+    """
+
+    def __init__(self, max_bytes: int, clock: Callable[[], float] = time.time):
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[CacheEntry, int, float | None]] = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def get(self, key: str) -> CacheEntry | None:
+        item = self._entries.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        entry, _size, expires_at = item
+        if expires_at is not None and expires_at <= self._clock():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return CacheEntry(payload=copy.deepcopy(entry.payload), negative=entry.negative)
+
+    def put(self, key: str, entry: CacheEntry, size: int, expires_at: float | None) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            # Never let one oversized payload flush the whole tier
+            self.rejected += 1
+            return
+        stored = CacheEntry(payload=copy.deepcopy(entry.payload), negative=entry.negative)
+        self._entries[key] = (stored, size, expires_at)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _entry, size, _expires_at = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def cache_key(key: Hashable) -> str:
+    """Render a (resource, id, season) tuple as a stable string key."""
+    if isinstance(key, tuple):
+        return ":".join("" if part is None else str(part) for part in key)
+    return str(key)
+
+
+class ResponseCache:
+    """
+    Persistent TTL cache for parsed API responses.
+
+    SQLite calls run in a worker thread so the event loop is never blocked on
+    disk I/O. Use ``":memory:"`` as the path for a process-local cache. When
+    ``memory_limit_bytes`` is set, parsed entries are also kept in a
+    :class:`MemoryTier` that is consulted before SQLite. The memory tier and
+    the counters are only touched on the event loop thread; worker threads
+    only read and write SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        policy: CachePolicy | None = None,
+        clock: Callable[[], float] = time.time,
+        memory_limit_bytes: int = 0,
+    ):
+        self.path = path
+        self.policy = policy or CachePolicy()
+        self._clock = clock
+        self.memory = MemoryTier(memory_limit_bytes, clock) if memory_limit_bytes > 0 else None
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "expired": 0,
+            "stores": 0,
+            "negative_stores": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        }
+
+    async def get(self, key: Hashable) -> CacheEntry | None:
+        """Return the cached entry for ``key``, or ``None`` on a miss or expiry."""
+        rendered = cache_key(key)
+        if self.memory is not None:
+            entry = self.memory.get(rendered)
+            if entry is not None:
+                self._counters["hits"] += 1
+                if entry.negative:
+                    self._counters["negative_hits"] += 1
+                CACHE_LOOKUPS.inc(tier="memory", result="negative_hit" if entry.negative else "hit")
+                return entry
+            CACHE_LOOKUPS.inc(tier="memory", result="miss")
+        result, entry, size, expires_at = await asyncio.to_thread(self._get, rendered)
+        CACHE_LOOKUPS.inc(tier="sqlite", result=result)
+        if entry is None:
+            self._counters["misses"] += 1
+            if result == "expired":
+                self._counters["expired"] += 1
+            return None
+        self._counters["hits"] += 1
+        self._counters["bytes_read"] += size
+        if entry.negative:
+            self._counters["negative_hits"] += 1
+        if self.memory is not None:
+            self.memory.put(rendered, entry, size, expires_at)
+        return entry
+
+    async def set(self, key: Hashable, resource: str, payload: dict[str, Any]) -> None:
+        """Store a successful response using the resource's freshness policy."""
+        ttl = self.policy.ttl_for(resource, payload)
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        rendered = cache_key(key)
+        self._remember(rendered, CacheEntry(payload=payload), len(body), ttl)
+        await asyncio.to_thread(self._put, rendered, resource, body, False, ttl)
+        self._counters["stores"] += 1
+        self._counters["bytes_written"] += len(body)
+
+    async def set_negative(self, key: Hashable, resource: str, error: str) -> None:
+        """Remember a failed fetch for the policy's negative TTL."""
+        body = json.dumps(error).encode("utf-8")
+        rendered = cache_key(key)
+        ttl = self.policy.negative_ttl
+        self._remember(rendered, CacheEntry(payload=error, negative=True), len(body), ttl)
+        await asyncio.to_thread(self._put, rendered, resource, body, True, ttl)
+        self._counters["negative_stores"] += 1
+        self._counters["bytes_written"] += len(body)
+
+    async def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        return await asyncio.to_thread(self._purge_expired)
+
+    async def stats(self) -> dict[str, Any]:
+        """Return hit/miss/byte counters and the stored footprint per resource."""
+        rows = await asyncio.to_thread(self._footprint)
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            **self._counters,
+            "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            "entries": sum(row[1] for row in rows),
+            "stored_bytes": sum(row[2] for row in rows),
+            "by_resource": {
+                row[0]: {"entries": row[1], "bytes": row[2]} for row in rows
+            },
+            "memory": self.memory.stats() if self.memory is not None else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _remember(
+        self, key: str, entry: CacheEntry, size: int, ttl: float | None
+    ) -> None:
+        if self.memory is not None:
+            expires_at = None if ttl is None else self._clock() + ttl
+            self.memory.put(key, entry, size, expires_at)
+
+    def _footprint(self) -> list[tuple[str, int, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT resource, COUNT(*), COALESCE(SUM(LENGTH(body)), 0) "
+                "FROM responses GROUP BY resource"
+            ).fetchall()
+
+    def _get(self, key: str) -> tuple[str, CacheEntry | None, int, float | None]:
+        """Read one row in a worker thread: (lookup result, entry, body size, expiry)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, negative, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return "miss", None, 0, None
+            body, negative, expires_at = row
+            if expires_at is not None and expires_at <= self._clock():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return "expired", None, 0, None
+        entry = CacheEntry(payload=json.loads(body), negative=bool(negative))
+        return ("negative_hit" if negative else "hit"), entry, len(body), expires_at
+
+    def _put(
+        self, key: str, resource: str, body: bytes, negative: bool, ttl: float | None
+    ) -> None:
+        now = self._clock()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, resource, body, negative, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, resource, body, int(negative), now, expires_at),
+            )
+            self._conn.commit()
+
+    def _purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (self._clock(),),
+            )
+            self._conn.commit()
+            return cursor.rowcount
@@ -5,16 +5,21 @@ This module provides interface for API-Football from RapidAPI.
 Focus: Football (Soccer) only for MVP.
 """
 
+import asyncio
+import contextlib
 import logging
-import os
+from collections.abc import AsyncIterator
 from typing import Any
 
-import aiohttp
-
+from tools.http_transport import RapidAPITransport, get_shared_transport
 from utils.security import sanitize_log_input, sanitize_multiple_log_inputs
 
 logger = logging.getLogger(__name__)
 
+# Per-fixture sub-resources fetched alongside the fixture itself. fixtures/players
+# is left out: nothing downstream reads per-fixture player ratings.
+FIXTURE_SUB_RESOURCES = ("statistics", "events")
+
 
 class APIFootballClient:
     """
@@ -22,19 +27,25 @@ class APIFootballClient:
 
     Documentation: https://rapidapi.com/api-sports/api/api-football
     Focus: Football (Soccer) data only for MVP
+
+    Requests go over the process-wide pooled transport (and its rate limiter)
+    unless a transport is passed in. Giving an explicit ``api_key`` creates a
+    dedicated transport that is closed with the client.
     """
 
-    def __init__(self, api_key: str | None = None):
-        self.api_key = api_key or os.getenv("RAPIDAPI_KEY")
-        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
-        self.headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": "api-football-v1.p.rapidapi.com",
-        }
-        self.session: aiohttp.ClientSession | None = None
+    def __init__(
+        self, api_key: str | None = None, transport: RapidAPITransport | None = None
+    ):
+        if transport is None and api_key:
+            transport = RapidAPITransport(api_key=api_key)
+            self._owns_transport = True
+        else:
+            self._owns_transport = False
+        self.transport = transport or get_shared_transport()
+        self.api_key = api_key
+        self.base_url = self.transport.base_url
 
     async def __aenter__(self) -> "APIFootballClient":
-        self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(
@@ -43,8 +54,45 @@ class APIFootballClient:
         exc_val: BaseException | None,
         exc_tb: Any,
     ) -> None:
-        if self.session:
-            await self.session.close()
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def request(
+        self, endpoint: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        GET an endpoint and return the parsed API-Football payload.
+
+        Args:
+            endpoint: Endpoint path (e.g. "fixtures/statistics")
+            params: Query string parameters
+
+        Returns:
+            The decoded JSON payload, including its ``errors`` field
+
+        Raises:
+            ValueError: If the HTTP request fails or the body is not a JSON object
+        """
+        response = await self.transport.get(endpoint, params)
+        if not response.ok:
+            raise ValueError(
+                f"API-Football request failed with status {response.status}"
+            )
+        payload = response.json()
+        if not isinstance(payload, dict):
+            raise ValueError(
+                f"Unexpected API-Football payload type: {type(payload).__name__}"
+            )
+        return payload
+
+    async def _get_response(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Return the ``response`` list of an endpoint, raising on API errors."""
+        payload = await self.request(endpoint, params)
+        if payload.get("errors"):
+            raise ValueError(f"API-Football error on {endpoint}: {payload['errors']}")
+        return payload.get("response") or []
 
     async def get_fixtures(
         self,
@@ -63,12 +111,14 @@ class APIFootballClient:
         Returns:
             List of fixture data dictionaries
         """
-        # TODO: Implement API-Football fixtures endpoint
         league_safe, season_safe = sanitize_multiple_log_inputs(league_id, season)
         logger.info(
             "Fetching fixtures for league %s, season %s", league_safe, season_safe
         )
-        return []
+        params = {"league": league_id, "season": season, "date": date}
+        return await self._get_response(
+            "fixtures", {key: value for key, value in params.items() if value is not None}
+        )
 
     async def get_teams(self, league_id: int, season: int) -> list[dict[str, Any]]:
         """
@@ -81,10 +131,9 @@ class APIFootballClient:
         Returns:
             List of team data dictionaries
         """
-        # TODO: Implement API-Football teams endpoint
         league_safe, season_safe = sanitize_multiple_log_inputs(league_id, season)
         logger.info("Fetching teams for league %s, season %s", league_safe, season_safe)
-        return []
+        return await self._get_response("teams", {"league": league_id, "season": season})
 
     async def get_league_standings(self, league_id: int, season: int) -> dict[str, Any]:
         """
@@ -97,12 +146,14 @@ class APIFootballClient:
         Returns:
             Dictionary containing league standings
         """
-        # TODO: Implement API-Football standings endpoint
         league_safe, season_safe = sanitize_multiple_log_inputs(league_id, season)
         logger.info(
             "Fetching standings for league %s, season %s", league_safe, season_safe
         )
-        return {}
+        response = await self._get_response(
+            "standings", {"league": league_id, "season": season}
+        )
+        return response[0].get("league", {}) if response else {}
 
     async def get_match_statistics(self, fixture_id: int) -> dict[str, Any]:
         """
@@ -112,13 +163,22 @@ class APIFootballClient:
             fixture_id: Fixture/match ID
 
         Returns:
-            Dictionary containing match statistics
+            Dictionary mapping team name to ``{statistic type: value}``
+            (e.g. ``{"Ball Possession": "55%", "Total Shots": 14}``)
         """
-        # TODO: Implement API-Football match statistics endpoint
         logger.info(
             "Fetching match statistics for fixture %s", sanitize_log_input(fixture_id)
         )
-        return {}
+        response = await self._get_response(
+            "fixtures/statistics", {"fixture": fixture_id}
+        )
+        return {
+            (entry.get("team") or {}).get("name", "Unknown"): {
+                stat.get("type"): stat.get("value")
+                for stat in entry.get("statistics") or []
+            }
+            for entry in response
+        }
 
     async def get_players(self, team_id: int, season: int) -> list[dict[str, Any]]:
         """
@@ -131,10 +191,146 @@ class APIFootballClient:
         Returns:
             List of player data dictionaries
         """
-        # TODO: Implement API-Football players endpoint
         team_safe, season_safe = sanitize_multiple_log_inputs(team_id, season)
         logger.info("Fetching players for team %s, season %s", team_safe, season_safe)
-        return []
+        return [player async for player in self.iter_players(team_id, season)]
+
+    async def iter_pages(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream the pages of a paginated endpoint.
+
+        Page N+1 is requested as soon as page N arrives, so the next page is
+        in flight while the caller processes the current one. Only those two
+        pages are held in memory. Closing the generator early cancels the
+        pending prefetch.
+
+        Args:
+            endpoint: Paginated endpoint (e.g. "players")
+            params: Query parameters, without ``page``
+
+        Yields:
+            Each page's decoded payload, in order
+        """
+        next_page: asyncio.Task[dict[str, Any]] | None = asyncio.create_task(
+            self._get_page(endpoint, params, 1)
+        )
+        try:
+            while next_page is not None:
+                payload = await next_page
+                paging = payload.get("paging") or {}
+                current = paging.get("current", 1)
+                next_page = None
+                if current < paging.get("total", 1):
+                    next_page = asyncio.create_task(
+                        self._get_page(endpoint, params, current + 1)
+                    )
+                yield payload
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await next_page
+
+    async def iter_records(
+        self, endpoint: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the individual ``response`` records of a paginated endpoint."""
+        async with contextlib.aclosing(self.iter_pages(endpoint, params)) as pages:
+            async for page in pages:
+                for record in page.get("response") or []:
+                    yield record
+
+    def iter_players(self, team_id: int, season: int) -> AsyncIterator[dict[str, Any]]:
+        """Stream a team's players for a season, page by page."""
+        return self.iter_records("players", {"team": team_id, "season": season})
+
+    def iter_fixtures(self, league_id: int, season: int) -> AsyncIterator[dict[str, Any]]:
+        """Stream a league's fixtures for a season, page by page."""
+        return self.iter_records("fixtures", {"league": league_id, "season": season})
+
+    async def _get_page(
+        self, endpoint: str, params: dict[str, Any], page: int
+    ) -> dict[str, Any]:
+        # API-Football rejects page=1 on endpoints that are not paginated
+        query = {**params, "page": page} if page > 1 else dict(params)
+        payload = await self.request(endpoint, query)
+        if payload.get("errors"):
+            raise ValueError(f"API-Football error on {endpoint}: {payload['errors']}")
+        return payload
+
+    async def get_fixture_details(self, fixture_id: int | str) -> dict[str, Any]:
+        """
+        Get a fixture together with its statistics and events.
+
+        The fixture and its ``fixtures/statistics`` and ``fixtures/events``
+        sub-resources are requested concurrently. A failed
+        sub-resource is logged and left as whatever the fixture itself carried.
+
+        Args:
+            fixture_id: Fixture/match ID
+
+        Returns:
+            The fixture item with ``statistics`` and ``events`` filled in, or an empty dict if the fixture does not exist
+
+        Raises:
+            ValueError: If the fixture request itself fails
+        """
+        logger.info("Fetching fixture details for %s", sanitize_log_input(fixture_id))
+        fixture, *sub_resources = await asyncio.gather(
+            self._get_response("fixtures", {"id": fixture_id}),
+            *(
+                self._get_response(f"fixtures/{name}", {"fixture": fixture_id})
+                for name in FIXTURE_SUB_RESOURCES
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(fixture, BaseException):
+            raise fixture
+        if not fixture:
+            return {}
+
+        fetched = {}
+        for name, result in zip(FIXTURE_SUB_RESOURCES, sub_resources, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Could not fetch %s for fixture %s: %s",
+                    name,
+                    sanitize_log_input(fixture_id),
+                    sanitize_log_input(result),
+                )
+            else:
+                fetched[name] = result
+        return normalize_fixture(fixture[0], fetched)
+
+
+def normalize_fixture(
+    item: dict[str, Any], sub_resources: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """
+    Return a copy of a fixture item with every sub-resource list present.
+
+    Single fixtures (``get_fixture_details``) and fixtures from an ``ids=``
+    batch both go through this, so callers see one shape either way.
+
+    Args:
+        item: Fixture item from a ``fixtures`` response
+        sub_resources: Separately fetched sub-resources by name; a non-empty
+            one replaces what the item carried
+
+    Returns:
+        The fixture item with each of ``FIXTURE_SUB_RESOURCES`` set, falling
+        back to what the item carried or an empty list
+    """
+    details = dict(item)
+    for name in FIXTURE_SUB_RESOURCES:
+        result = (sub_resources or {}).get(name)
+        if result:
+            details[name] = result
+        else:
+            details.setdefault(name, [])
+    return details
 
 
 # Football League IDs for common leagues (API-Football)
@@ -0,0 +1,295 @@
+"""Match Digest.
+
+Compact, deterministic views of the fixture, team and player data that go
+into LLM prompts. The raw API-Football responses are mostly logo/photo URLs,
+timestamps, null fields and lineup grid positions; the digests keep only the
+fields the research and writer prompts use and render them as minified JSON,
+with events, scores and lineup entries flattened into short strings.
+"""
+
+import json
+from typing import Any
+
+from tools.match_model import PlayerSeasonStats
+
+# Rough characters-per-token ratio for English/JSON text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def _first(items: Any) -> dict[str, Any]:
+    if isinstance(items, list) and items and isinstance(items[0], dict):
+        return items[0]
+    return {}
+
+
+def _prune(value: Any) -> Any:
+    """Drop None, empty strings and empty containers, recursively."""
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        pruned = [_prune(item) for item in value]
+        return [item for item in pruned if item not in (None, "", [], {})]
+    return value
+
+
+def _score(pair: Any) -> str | None:
+    if not isinstance(pair, dict) or pair.get("home") is None or pair.get("away") is None:
+        return None
+    return f"{pair['home']}-{pair['away']}"
+
+
+def _minute(time: dict[str, Any]) -> str:
+    elapsed, extra = time.get("elapsed"), time.get("extra")
+    if elapsed is None:
+        return "?'"
+    return f"{elapsed}+{extra}'" if extra else f"{elapsed}'"
+
+
+def format_event(event: dict[str, Any]) -> str:
+    """One match event as e.g. ``"90+3' Goal (Penalty) Y. Jabrane [Wydad AC]"``."""
+    kind = event.get("type") or "Event"
+    detail = event.get("detail")
+    text = f"{_minute(event.get('time') or {})} {kind}"
+    if detail and detail != kind:
+        text += f" ({detail})"
+    player = (event.get("player") or {}).get("name")
+    if player:
+        text += f" {player}"
+    team = (event.get("team") or {}).get("name")
+    if team:
+        text += f" [{team}]"
+    assist = (event.get("assist") or {}).get("name")
+    if assist:
+        text += f"; assist: {assist}"
+    if event.get("comments"):
+        text += f"; {event['comments']}"
+    return text
+
+
+def _lineup_player(entry: dict[str, Any]) -> str | None:
+    player = entry.get("player") or {}
+    name = player.get("name")
+    if not name:
+        return None
+    number = f"{player['number']} " if player.get("number") is not None else ""
+    position = f" ({player['pos']})" if player.get("pos") else ""
+    return f"{number}{name}{position}"
+
+
+def _lineup(lineup: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "team": (lineup.get("team") or {}).get("name"),
+        "formation": lineup.get("formation"),
+        "coach": (lineup.get("coach") or {}).get("name"),
+        "startXI": [_lineup_player(entry) for entry in lineup.get("startXI") or []],
+        "substitutes": [_lineup_player(entry) for entry in lineup.get("substitutes") or []],
+    }
+
+
+def digest_fixture(game_data: Any) -> dict[str, Any]:
+    """Digest a fixture response (``{"response": [fixture]}`` or a bare fixture).
+
+    Keeps the date, venue, referee, status, league and round, teams, scores,
+    events, lineups and team statistics. Returns ``{"error": ...}`` for an
+    error payload and ``{}`` when there is no fixture.
+    """
+    if not isinstance(game_data, dict):
+        return {}
+    if "error" in game_data:
+        return {"error": game_data["error"]}
+    fixture_data = _first(game_data["response"]) if "response" in game_data else game_data
+
+    fixture = fixture_data.get("fixture") or {}
+    venue = fixture.get("venue") or {}
+    league = fixture_data.get("league") or {}
+    teams = fixture_data.get("teams") or {}
+    home, away = teams.get("home") or {}, teams.get("away") or {}
+    score = fixture_data.get("score") or {}
+    date = fixture.get("date")
+
+    winner = None
+    if home.get("winner") is True:
+        winner = home.get("name")
+    elif away.get("winner") is True:
+        winner = away.get("name")
+
+    digest = {
+        "fixture": {
+            "id": fixture.get("id"),
+            "date": f"{date[:10]} {date[11:16]}" if isinstance(date, str) and len(date) >= 16 else date,
+            "venue": ", ".join(part for part in (venue.get("name"), venue.get("city")) if part),
+            "referee": fixture.get("referee"),
+            "status": (fixture.get("status") or {}).get("long"),
+        },
+        "league": {
+            "name": league.get("name"),
+            "country": league.get("country"),
+            "season": league.get("season"),
+            "round": league.get("round"),
+        },
+        "teams": {"home": home.get("name"), "away": away.get("name"), "winner": winner},
+        "score": {
+            "halftime": _score(score.get("halftime")),
+            "fulltime": _score(score.get("fulltime")) or _score(fixture_data.get("goals")),
+            "extratime": _score(score.get("extratime")),
+            "penalty": _score(score.get("penalty")),
+        },
+        "events": [format_event(event) for event in fixture_data.get("events") or []],
+        "lineups": [_lineup(lineup) for lineup in fixture_data.get("lineups") or []],
+        "statistics": {
+            (entry.get("team") or {}).get("name", "?"): {
+                stat.get("type"): stat.get("value")
+                for stat in entry.get("statistics") or []
+                if stat.get("value") is not None
+            }
+            for entry in fixture_data.get("statistics") or []
+        },
+    }
+    return _prune(digest)
+
+
+def _team_details(detailed: Any) -> dict[str, Any]:
+    entry = _first(detailed.get("response")) if isinstance(detailed, dict) else {}
+    team = entry.get("team") or {}
+    venue = entry.get("venue") or {}
+    return {
+        "code": team.get("code"),
+        "country": team.get("country"),
+        "founded": team.get("founded"),
+        "venue": {
+            "name": venue.get("name"),
+            "city": venue.get("city"),
+            "capacity": venue.get("capacity"),
+            "surface": venue.get("surface"),
+        },
+    }
+
+
+def _form(form: Any) -> dict[str, Any]:
+    if not isinstance(form, dict) or not form.get("played"):
+        return {}
+    return {
+        "results": f"{form.get('results')} (newest first), {form.get('points')} pts from {form.get('played')}",
+        "goals": f"{form.get('goals_for')}-{form.get('goals_against')}",
+        "fixtures": form.get("fixtures"),
+    }
+
+
+def _head_to_head(history: Any, home: str | None, away: str | None) -> dict[str, Any]:
+    head_to_head = (history or {}).get("head_to_head") or {}
+    if not head_to_head.get("meetings"):
+        return {}
+    return {
+        "meetings": head_to_head["meetings"],
+        f"{home or 'home'} wins": head_to_head.get("home_wins"),
+        f"{away or 'away'} wins": head_to_head.get("away_wins"),
+        "draws": head_to_head.get("draws"),
+    }
+
+
+def digest_teams(team_data: Any) -> dict[str, Any]:
+    """Digest the enhanced team data built by the pipeline.
+
+    Keeps each team's name, code, country, founding year and stadium, the
+    league, and each side's formation and coach, plus previous meetings and
+    recent form when the pipeline attached ``archive_history``.
+    """
+    if not isinstance(team_data, dict):
+        return {}
+    if "error" in team_data:
+        return {"error": team_data["error"]}
+    league = team_data.get("league") or {}
+    enhanced = team_data.get("enhanced_data") or {}
+    digest: dict[str, Any] = {
+        "league": {
+            "name": league.get("name"),
+            "country": league.get("country"),
+            "season": league.get("season"),
+            "round": league.get("round"),
+        },
+    }
+    for side in ("home", "away"):
+        team = team_data.get(f"{side}_team") or {}
+        lineup = team_data.get(f"{side}_lineup") or {}
+        digest[f"{side}_team"] = {
+            "name": team.get("name"),
+            **_team_details(enhanced.get(f"{side}_team_detailed")),
+            "formation": lineup.get("formation"),
+            "coach": lineup.get("coach"),
+            "recent_form": _form((team_data.get("archive_history") or {}).get(f"{side}_form")),
+        }
+    digest["head_to_head"] = _head_to_head(
+        team_data.get("archive_history"), digest["home_team"]["name"], digest["away_team"]["name"]
+    )
+    return _prune(digest)
+
+
+def _season_stats(player: dict[str, Any]) -> dict[str, Any]:
+    stats = PlayerSeasonStats.from_response(player.get("detailed_data"), player.get("team_id"))
+    return stats.to_dict() if stats else {}
+
+
+def _match_event(event: dict[str, Any]) -> str:
+    text = f"{event.get('time')}' {event.get('type')}"
+    if event.get("detail") and event.get("detail") != event.get("type"):
+        text += f" ({event['detail']})"
+    if event.get("assist"):
+        text += f"; assist: {event['assist']}"
+    return text
+
+
+def _player(player: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "name": player.get("name"),
+        "team": player.get("team"),
+        "position": player.get("position"),
+        "status": player.get("status"),
+        "match_events": [_match_event(event) for event in player.get("match_events") or []],
+        "season": _season_stats(player),
+    }
+
+
+def digest_players(player_data: Any) -> dict[str, Any]:
+    """Digest the enhanced player data built by the pipeline.
+
+    Keeps the key and sample players with their match events and a short
+    season summary. Full squads are left out: the fixture digest already
+    carries both lineups.
+    """
+    if not isinstance(player_data, dict):
+        return {}
+    if "error" in player_data:
+        return {"error": player_data["error"]}
+    key_players = player_data.get("enhanced_key_players")
+    if key_players is None:
+        key_players = player_data.get("key_players") or []
+    return _prune({
+        "key_players": [_player(player) for player in key_players],
+        "sample_players": [_player(player) for player in player_data.get("sample_players_detailed") or []],
+    })
+
+
+def render(digest: dict[str, Any]) -> str:
+    """Render a digest as minified JSON (non-ASCII names are kept as-is)."""
+    return json.dumps(digest, ensure_ascii=False, separators=(",", ":"))
+
+
+def size_report(raw: Any, digest_text: str) -> dict[str, Any]:
+    """Compare the size of raw prompt data with its rendered digest.
+
+    The raw size is that of the data as it was interpolated, i.e. its ``str()``.
+
+    Returns:
+        Raw and digest sizes in characters and estimated tokens, and the
+        percentage saved.
+    """
+    raw_chars = len(str(raw))
+    digest_chars = len(digest_text)
+    return {
+        "raw_chars": raw_chars,
+        "digest_chars": digest_chars,
+        "raw_tokens_est": raw_chars // CHARS_PER_TOKEN,
+        "digest_tokens_est": digest_chars // CHARS_PER_TOKEN,
+        "saved_pct": round(100 * (1 - digest_chars / raw_chars), 1) if raw_chars else 0.0,
+    }
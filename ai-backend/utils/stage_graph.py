@@ -0,0 +1,238 @@
+"""Stage Graph Scheduler.
+
+Runs a set of named stages as a dependency graph: every stage starts as soon
+as the stages it depends on have finished, so independent work overlaps and
+the total latency approaches the graph's critical path. Each stage's result
+and timing are recorded, and results saved by an earlier run can be restored
+so a retry resumes where the previous attempt stopped.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from utils.metrics import STAGE_DURATION, STAGES_IN_FLIGHT
+
+logger = logging.getLogger(__name__)
+
+
+class StageError(RuntimeError):
+    """Raised when a stage fails; the original exception is chained as ``__cause__``."""
+
+    def __init__(self, stage: str, error: BaseException, run: "StageRun | None" = None):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.run = run
+
+
+@dataclass
+class Stage:
+    """A unit of work and the stages (or run inputs) whose results it needs."""
+
+    name: str
+    fn: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+    version: str = "1"
+
+
+@dataclass
+class StageTiming:
+    """When a stage started (relative to the run) and how long it took."""
+
+    started: float
+    duration: float
+    status: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "started": round(self.started, 4),
+            "duration": round(self.duration, 4),
+            "status": self.status,
+        }
+
+
+@dataclass
+class StageRun:
+    """Results and timings of one graph run."""
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    duration: float = 0.0
+    failed_stage: str | None = None
+
+    def timings_dict(self) -> dict[str, dict[str, Any]]:
+        return {name: timing.to_dict() for name, timing in self.timings.items()}
+
+
+class StageGraph:
+    """Dependency graph of async (or plain) stage functions.
+
+    A stage function receives the results of its dependencies as keyword
+    arguments named after them. Dependencies may also name inputs passed to
+    :meth:`run`. The first failing stage cancels everything still running
+    and :meth:`run` raises :class:`StageError`; the partial ``StageRun`` is
+    available on the error as ``error.run``.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        depends_on: Iterable[str] = (),
+        version: str = "1",
+    ) -> "StageGraph":
+        """Register a stage. Returns the graph so calls can be chained.
+
+        Bump ``version`` whenever the stage's logic or output changes, so
+        results saved by an older version are not restored.
+        """
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, fn, tuple(depends_on), version)
+        return self
+
+    def without(self, *names: str) -> "StageGraph":
+        """Return a copy of the graph minus the named stages (which nothing else may need)."""
+        graph = StageGraph()
+        for name, stage in self.stages.items():
+            if name in names:
+                continue
+            needed = set(stage.depends_on) & set(names)
+            if needed:
+                raise ValueError(f"Stage '{name}' depends on removed stages: {sorted(needed)}")
+            graph.stages[name] = stage
+        return graph
+
+    def validate(self, inputs: Iterable[str] = ()) -> list[str]:
+        """Check every dependency exists and the graph is acyclic.
+
+        Returns:
+            Stage names in a valid execution order
+        """
+        available = set(inputs)
+        order: list[str] = []
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [
+                name for name, stage in remaining.items()
+                if all(dep in available for dep in stage.depends_on)
+            ]
+            if not ready:
+                known = available | set(remaining)
+                missing = {
+                    dep for stage in remaining.values()
+                    for dep in stage.depends_on if dep not in known
+                }
+                if missing:
+                    raise ValueError(f"Unknown stage dependencies: {sorted(missing)}")
+                raise ValueError(f"Stage dependency cycle among: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                available.add(name)
+                del remaining[name]
+        return order
+
+    async def run(
+        self,
+        completed: Mapping[str, Any] | None = None,
+        on_complete: Callable[[Stage, Any], Awaitable[None]] | None = None,
+        **inputs: Any,
+    ) -> StageRun:
+        """Run all stages, each as soon as its dependencies are done.
+
+        Args:
+            completed: Results of stages finished by an earlier run. A stage is
+                restored from here only if every stage it depends on was
+                restored too; otherwise it runs again.
+            on_complete: Awaited with each stage and its result after it runs
+                (not for restored stages), e.g. to checkpoint it
+            **inputs: Values stages can depend on by name
+        """
+        order = self.validate(inputs)
+        run = StageRun()
+        values: dict[str, Any] = dict(inputs)
+        start = time.perf_counter()
+        pending = dict(self.stages)
+        running: dict[asyncio.Task[Any], str] = {}
+
+        completed = completed or {}
+        for name in order:
+            stage = self.stages[name]
+            if name in completed and all(
+                dep in inputs or dep in run.results for dep in stage.depends_on
+            ):
+                del pending[name]
+                values[name] = run.results[name] = completed[name]
+                run.timings[name] = StageTiming(started=0.0, duration=0.0, status="restored")
+        if run.results:
+            logger.debug("Restored stages: %s", ", ".join(run.results))
+
+        try:
+            while pending or running:
+                for name in [
+                    name for name, stage in pending.items()
+                    if all(dep in values for dep in stage.depends_on)
+                ]:
+                    stage = pending.pop(name)
+                    kwargs = {dep: values[dep] for dep in stage.depends_on}
+                    task = asyncio.create_task(
+                        self._run_stage(stage, kwargs, start, run, on_complete)
+                    )
+                    running[task] = name
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        run.failed_stage = name
+                        run.duration = time.perf_counter() - start
+                        raise StageError(name, error, run) from error
+                    values[name] = run.results[name] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        run.duration = time.perf_counter() - start
+        return run
+
+    @staticmethod
+    async def _run_stage(
+        stage: Stage,
+        kwargs: dict[str, Any],
+        start: float,
+        run: StageRun,
+        on_complete: Callable[[Stage, Any], Awaitable[None]] | None,
+    ) -> Any:
+        began = time.perf_counter()
+        status = "failed"
+        STAGES_IN_FLIGHT.inc(stage=stage.name)
+        try:
+            result = stage.fn(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            status = "ok"
+            if on_complete is not None:
+                await on_complete(stage, result)
+            return result
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            duration = time.perf_counter() - began
+            STAGES_IN_FLIGHT.dec(stage=stage.name)
+            STAGE_DURATION.observe(duration, stage=stage.name, status=status)
+            run.timings[stage.name] = StageTiming(
+                started=began - start, duration=duration, status=status
+            )
+            logger.debug("Stage %s %s in %.3fs", stage.name, status, duration)